@@ -0,0 +1,124 @@
+"""
+Benchmarks for entity conversion and output rendering.
+
+Each benchmark consists of a setup function which prepares the inputs from a
+decoded timeline, and a function which processes them. Only the latter is
+measured. Run using `python -m tests.benchmarks`.
+"""
+
+import gc
+import json
+import time
+import tracemalloc
+
+from typing import Any, Callable, Dict, List, NamedTuple
+
+from toot.cache import render_cache
+from toot.entities import Status, from_dict, interning
+from toot.output import status_lines
+from toot.utils import html_to_paragraphs
+from toot.utils.datetime import parse_datetime
+from toot.wcstring import wc_wrap
+
+Timeline = List[Dict[str, Any]]
+
+WIDTH = 80
+
+
+class Benchmark(NamedTuple):
+    setup: Callable[[Timeline], List[Any]]
+    run: Callable[[List[Any]], Any]
+
+
+def _statuses(timeline: Timeline) -> List[Any]:
+    return timeline
+
+
+def _converted(timeline: Timeline) -> List[Status]:
+    return [from_dict(Status, s) for s in timeline]
+
+
+def _datetimes(timeline: Timeline) -> List[str]:
+    return [s["created_at"] for s in timeline] + [s["account"]["created_at"] for s in timeline]
+
+
+def _contents(timeline: Timeline) -> List[str]:
+    return [(s["reblog"] or s)["content"] for s in timeline]
+
+
+def _lines(timeline: Timeline) -> List[str]:
+    return [line for html in _contents(timeline) for paragraph in html_to_paragraphs(html) for line in paragraph]
+
+
+def _convert(statuses: Timeline):
+    return [from_dict(Status, s) for s in statuses]
+
+
+def _convert_lazy(statuses: Timeline):
+    return [from_dict(Status, s, lazy=True) for s in statuses]
+
+
+def _convert_interned(statuses: Timeline):
+    with interning():
+        return [from_dict(Status, s) for s in statuses]
+
+
+def _parse_datetimes(values: List[str]):
+    return [parse_datetime(v) for v in values]
+
+
+def _html_to_paragraphs(values: List[str]):
+    return [html_to_paragraphs(v) for v in values]
+
+
+def _wc_wrap(lines: List[str]):
+    return [list(wc_wrap(line, WIDTH)) for line in lines]
+
+
+def _status_lines(statuses: List[Status]):
+    return [list(status_lines(s, WIDTH)) for s in statuses]
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    "from_dict": Benchmark(_statuses, _convert),
+    "from_dict_lazy": Benchmark(_statuses, _convert_lazy),
+    "from_dict_interned": Benchmark(_statuses, _convert_interned),
+    "parse_datetime": Benchmark(_datetimes, _parse_datetimes),
+    "html_to_paragraphs": Benchmark(_contents, _html_to_paragraphs),
+    "wc_wrap": Benchmark(_lines, _wc_wrap),
+    "status_lines": Benchmark(_converted, _status_lines),
+}
+
+
+def run_benchmark(name: str, corpus: bytes, repeat: int) -> Dict[str, float]:
+    """
+    Run the named benchmark on a timeline encoded as JSON. Returns the best
+    throughput in items per second, and the peak memory allocated per item.
+    """
+    benchmark = BENCHMARKS[name]
+    best = float("inf")
+
+    for _ in range(repeat):
+        # Decode for each run since conversion may modify the data
+        items = benchmark.setup(json.loads(corpus))
+        render_cache.clear()
+        gc.collect()
+
+        start = time.perf_counter()
+        benchmark.run(items)
+        best = min(best, time.perf_counter() - start)
+
+    items = benchmark.setup(json.loads(corpus))
+    render_cache.clear()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        benchmark.run(items)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ops": len(items) / best,
+        "bytes": peak / len(items),
+    }
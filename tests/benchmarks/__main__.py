@@ -0,0 +1,84 @@
+"""
+Micro-benchmarks for entity conversion and output rendering.
+
+Runs offline against synthetic timelines, see `fixtures.py`. Reports throughput
+and memory allocated per item for each benchmark, and compares them to a
+baseline stored locally, since throughput depends on the machine.
+
+Usage:
+
+    python -m tests.benchmarks                   # run and compare to baseline
+    python -m tests.benchmarks --size 10000      # use a larger timeline
+    python -m tests.benchmarks -k datetime       # run matching benchmarks
+    python -m tests.benchmarks --save-baseline   # store results as baseline
+    python -m tests.benchmarks --check 20        # fail on >20% slowdown
+"""
+
+import argparse
+import json
+import sys
+
+from pathlib import Path
+
+from tests.benchmarks import BENCHMARKS, run_benchmark
+from tests.benchmarks.fixtures import make_timeline
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks", description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=1000, help="number of statuses in the timeline [default: 1000]")
+    parser.add_argument("--repeat", type=int, default=5, help="number of timed runs, best is taken [default: 5]")
+    parser.add_argument("-k", dest="filter", help="only run benchmarks whose name contains this string")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="path to the baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="store results as the new baseline")
+    parser.add_argument("--check", type=float, metavar="PERCENT",
+                        help="exit with an error if throughput drops by more than PERCENT compared to baseline")
+    args = parser.parse_args()
+
+    timeline = make_timeline(args.size)
+    corpus = json.dumps(timeline).encode()
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text()).get(str(args.size), {})
+
+    print(f"Benchmarking on {args.size} statuses ({len(corpus) // 1024} KiB of JSON)\n")
+    print(f"{'benchmark':<22} {'items/s':>12} {'baseline':>12} {'change':>8} {'bytes/item':>11}")
+
+    results = {}
+    regressions = []
+
+    for name in BENCHMARKS:
+        if args.filter and args.filter not in name:
+            continue
+
+        result = run_benchmark(name, corpus, args.repeat)
+        results[name] = result
+
+        base = baseline.get(name)
+        if base:
+            change = 100 * (result["ops"] / base["ops"] - 1)
+            base_ops = f"{base['ops']:,.0f}"
+            change_str = f"{change:+.1f}%"
+            if args.check is not None and change < -args.check:
+                regressions.append(name)
+        else:
+            base_ops = change_str = "-"
+
+        print(f"{name:<22} {result['ops']:>12,.0f} {base_ops:>12} {change_str:>8} {result['bytes']:>11,.0f}")
+
+    if args.save_baseline:
+        stored = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        stored.setdefault(str(args.size), {}).update(results)
+        args.baseline.write_text(json.dumps(stored, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline saved to {args.baseline}")
+
+    if regressions:
+        print(f"\nThroughput dropped by more than {args.check}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
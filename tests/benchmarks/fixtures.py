@@ -0,0 +1,209 @@
+"""
+Synthetic timeline data used for benchmarking.
+
+Generated data is deterministic for a given seed, so results are comparable
+between runs. Statuses include a mix of features found on real timelines:
+media, polls, cards, reblogs, mentions, custom emoji, CJK text and emoji.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+Data = Dict[str, Any]
+
+WORDS = [
+    "toot", "mastodon", "fediverse", "timeline", "the", "a", "of", "and", "is",
+    "benchmark", "performance", "python", "terminal", "federation", "instance",
+    "日本語", "テキスト", "中文", "한국어", "👍", "🎸", "🐘", "👩‍💻", "Ünïcödé", "naïve",
+    "https://example.com/some/really/long/path/which/does/not/wrap/nicely",
+]
+
+EMOJI_SHORTCODES = ["blobcat", "blobfox", "ablobcatrainbow", "mastodon", "verified"]
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _datetime(rnd: random.Random) -> str:
+    dttm = START + timedelta(seconds=rnd.randint(0, 365 * 86400), milliseconds=rnd.randint(0, 999))
+    return dttm.strftime("%Y-%m-%dT%H:%M:%S.") + f"{dttm.microsecond // 1000:03}Z"
+
+
+def _text(rnd: random.Random, min_words: int, max_words: int) -> str:
+    return " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(min_words, max_words)))
+
+
+def _emoji(shortcode: str) -> Data:
+    return {
+        "shortcode": shortcode,
+        "url": f"https://files.example.com/emoji/{shortcode}.png",
+        "static_url": f"https://files.example.com/emoji/{shortcode}_static.png",
+        "visible_in_picker": True,
+        "category": None,
+    }
+
+
+def make_account(rnd: random.Random, id: int) -> Data:
+    username = f"user{id}"
+    domain = rnd.choice(["example.com", "mastodon.social", "chaos.social", "ｆｕｌｌｗｉｄｔｈ.jp"])
+    emojis = rnd.sample(EMOJI_SHORTCODES, rnd.randint(0, 2))
+
+    return {
+        "id": str(100000 + id),
+        "username": username,
+        "acct": f"{username}@{domain}",
+        "url": f"https://{domain}/@{username}",
+        "display_name": _text(rnd, 1, 3) + "".join(f" :{e}:" for e in emojis),
+        "note": f"<p>{_text(rnd, 5, 30)}</p>",
+        "avatar": f"https://files.example.com/avatars/{id}.png",
+        "avatar_static": f"https://files.example.com/avatars/{id}.png",
+        "header": f"https://files.example.com/headers/{id}.png",
+        "header_static": f"https://files.example.com/headers/{id}.png",
+        "locked": rnd.random() < 0.1,
+        "fields": [
+            {
+                "name": "Website",
+                "value": f'<a href="https://{domain}/" rel="me">{domain}</a>',
+                "verified_at": _datetime(rnd) if rnd.random() < 0.5 else None,
+            }
+        ],
+        "emojis": [_emoji(e) for e in emojis],
+        "bot": rnd.random() < 0.05,
+        "group": False,
+        "discoverable": True,
+        "noindex": False,
+        "moved": None,
+        "suspended": None,
+        "limited": None,
+        "created_at": _datetime(rnd),
+        "last_status_at": _datetime(rnd)[:10],
+        "statuses_count": rnd.randint(0, 100000),
+        "followers_count": rnd.randint(0, 10000),
+        "following_count": rnd.randint(0, 1000),
+    }
+
+
+def _content(rnd: random.Random, account: Data) -> str:
+    paragraphs = []
+    for _ in range(rnd.randint(1, 4)):
+        text = _text(rnd, 3, 60)
+        if rnd.random() < 0.3:
+            text = text.replace(" ", "<br />", 2)
+        if rnd.random() < 0.3:
+            text = (
+                '<span class="h-card"><a href="https://example.com/@foo" class="u-url mention">'
+                f"@<span>foo</span></a></span> {text}"
+            )
+        if rnd.random() < 0.3:
+            text += ' <a href="https://example.com/tags/toot" class="mention hashtag" rel="tag">#<span>toot</span></a>'
+        paragraphs.append(f"<p>{text}</p>")
+    return "".join(paragraphs)
+
+
+def _media(rnd: random.Random, id: int) -> Data:
+    return {
+        "id": str(id),
+        "type": rnd.choice(["image", "video", "gifv"]),
+        "url": f"https://files.example.com/media/{id}.png",
+        "preview_url": f"https://files.example.com/media/{id}_small.png",
+        "remote_url": None,
+        "meta": {"original": {"width": 1920, "height": 1080}, "small": {"width": 400, "height": 225}},
+        "description": _text(rnd, 3, 20) if rnd.random() < 0.7 else None,
+        "blurhash": "UeKUpFxuo~R%0nW;WCnhF6RjaJt757oJodS$",
+    }
+
+
+def _poll(rnd: random.Random, id: int) -> Data:
+    options = [{"title": _text(rnd, 1, 4), "votes_count": rnd.randint(0, 500)} for _ in range(rnd.randint(2, 4))]
+    votes_count = sum(o["votes_count"] for o in options)
+    return {
+        "id": str(id),
+        "expires_at": _datetime(rnd),
+        "expired": rnd.random() < 0.5,
+        "multiple": rnd.random() < 0.3,
+        "votes_count": votes_count,
+        "voters_count": votes_count,
+        "options": options,
+        "emojis": [],
+        "voted": False,
+        "own_votes": [],
+    }
+
+
+def _card(rnd: random.Random) -> Data:
+    return {
+        "url": "https://example.com/article",
+        "title": _text(rnd, 2, 8),
+        "description": _text(rnd, 5, 30),
+        "type": "link",
+        "author_name": "",
+        "author_url": "",
+        "provider_name": "Example",
+        "provider_url": "",
+        "html": "",
+        "width": 400,
+        "height": 200,
+        "image": "https://files.example.com/cards/1.png",
+        "embed_url": "",
+        "blurhash": None,
+    }
+
+
+def make_status(rnd: random.Random, id: int, accounts: List[Data], allow_reblog: bool = True) -> Data:
+    account = rnd.choice(accounts)
+    emojis = rnd.sample(EMOJI_SHORTCODES, rnd.randint(0, 3))
+
+    status = {
+        "id": str(10**15 + id),
+        "uri": f"https://example.com/users/{account['username']}/statuses/{id}",
+        "created_at": _datetime(rnd),
+        "account": account,
+        "content": _content(rnd, account),
+        "visibility": rnd.choice(["public", "unlisted", "private"]),
+        "sensitive": False,
+        "spoiler_text": "",
+        "media_attachments": [_media(rnd, id * 10 + n) for n in range(rnd.choice([0, 0, 0, 1, 4]))],
+        "application": {"name": "toot", "website": "https://toot.bezdomni.net"},
+        "mentions": [{"id": "1", "username": "foo", "url": "https://example.com/@foo", "acct": "foo"}],
+        "tags": [{"name": "toot", "url": "https://example.com/tags/toot"}],
+        "emojis": [_emoji(e) for e in emojis],
+        "reblogs_count": rnd.randint(0, 100),
+        "favourites_count": rnd.randint(0, 500),
+        "replies_count": rnd.randint(0, 50),
+        "url": f"https://example.com/@{account['username']}/{id}",
+        "in_reply_to_id": str(10**15 + id - 1) if rnd.random() < 0.2 else None,
+        "in_reply_to_account_id": None,
+        "reblog": None,
+        "poll": _poll(rnd, id) if rnd.random() < 0.1 else None,
+        "card": _card(rnd) if rnd.random() < 0.3 else None,
+        "language": "en",
+        "text": None,
+        "edited_at": _datetime(rnd) if rnd.random() < 0.1 else None,
+        "favourited": False,
+        "reblogged": False,
+        "muted": False,
+        "bookmarked": False,
+        "pinned": False,
+        "filtered": [],
+    }
+
+    if rnd.random() < 0.1:
+        status["sensitive"] = True
+        status["spoiler_text"] = _text(rnd, 1, 5)
+
+    if allow_reblog and rnd.random() < 0.2:
+        reblogged = make_status(rnd, id + 10**9, accounts, allow_reblog=False)
+        status["reblog"] = reblogged
+        status["content"] = ""
+        status["media_attachments"] = []
+        status["poll"] = None
+        status["card"] = None
+
+    return status
+
+
+def make_timeline(count: int, seed: int = 0) -> List[Data]:
+    """Returns `count` statuses as decoded from a timeline API response."""
+    rnd = random.Random(seed)
+    accounts = [make_account(rnd, id) for id in range(max(count // 20, 5))]
+    return [make_status(rnd, id, accounts) for id in range(count)]
@@ -0,0 +1,95 @@
+from tests.integration.conftest import assert_ok, register_account
+
+from toot import App, User, api, cli
+from toot.exceptions import ApiError
+
+
+def test_import_follows(app: App, user: User, friend: User, run, tmp_path):
+    other = register_account(app)
+
+    path = tmp_path / "following_accounts.csv"
+    path.write_text(
+        "Account address,Show boosts,Notify on new posts,Languages\n"
+        f"{friend.username}@{app.instance},true,false,\n"
+        f"{other.username}@{app.instance},false,true,en\n"
+    )
+
+    result = run(cli.imports.follows, str(path))
+    assert_ok(result)
+    assert "✓ Follows imported" in result.stdout
+
+    friend_id = api.find_account(app, user, friend.username)["id"]
+    other_id = api.find_account(app, user, other.username)["id"]
+    [friend_rel, other_rel] = api.get_relationships(app, user, [friend_id, other_id])
+    assert friend_rel["following"]
+    assert friend_rel["showing_reblogs"]
+    assert other_rel["following"]
+    assert not other_rel["showing_reblogs"]
+
+    # Both accounts are logged as processed, running again does nothing
+    progress = (tmp_path / "following_accounts.csv.progress").read_text()
+    assert f"{friend.username}@{app.instance}" in progress
+    assert f"{other.username}@{app.instance}" in progress
+
+    result = run(cli.imports.follows, str(path))
+    assert_ok(result)
+    assert "2 accounts already processed" in result.stdout
+
+
+def test_import_blocks(app: App, user: User, friend: User, run, tmp_path):
+    path = tmp_path / "blocked_accounts.csv"
+    path.write_text(f"{friend.username}@{app.instance}\nnonexistent-account@{app.instance}\n")
+
+    result = run(cli.imports.blocks, str(path))
+    assert_ok(result)
+    assert "Account not found" in result.stderr
+
+    friend_id = api.find_account(app, user, friend.username)["id"]
+    assert api.get_relationship(app, user, friend_id)["blocking"]
+
+    # Accounts which are already blocked are skipped
+    (tmp_path / "blocked_accounts.csv.progress").unlink()
+    result = run(cli.imports.blocks, str(path))
+    assert_ok(result)
+    assert "1 skipped" in result.stdout
+
+
+def test_import_mutes(app: App, user: User, friend: User, run, tmp_path):
+    path = tmp_path / "mutes.csv"
+    path.write_text(f"Account address,Hide notifications\n{friend.username}@{app.instance},true\n")
+
+    result = run(cli.imports.mutes, str(path))
+    assert_ok(result)
+
+    friend_id = api.find_account(app, user, friend.username)["id"]
+    relationship = api.get_relationship(app, user, friend_id)
+    assert relationship["muting"]
+    assert relationship["muting_notifications"]
+
+
+def test_import_continues_on_api_error(app: App, user: User, friend: User, run, tmp_path, monkeypatch):
+    other = register_account(app)
+    failing = f"{other.username}@{app.instance}"
+    lookup = api.lookup
+
+    def _lookup(app, user, acct):
+        if acct == failing:
+            raise ApiError("Too many requests")
+        return lookup(app, user, acct)
+
+    monkeypatch.setattr(api, "lookup", _lookup)
+
+    path = tmp_path / "blocked_accounts.csv"
+    path.write_text(f"{failing}\n{friend.username}@{app.instance}\n")
+
+    result = run(cli.imports.blocks, str(path))
+    assert_ok(result)
+    assert f"Failed importing {failing}: Too many requests" in result.stderr
+
+    friend_id = api.find_account(app, user, friend.username)["id"]
+    assert api.get_relationship(app, user, friend_id)["blocking"]
+
+    # The failed account is not logged so it is retried on the next run
+    progress = (tmp_path / "blocked_accounts.csv.progress").read_text()
+    assert failing not in progress
+    assert f"{friend.username}@{app.instance}" in progress
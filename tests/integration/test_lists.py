@@ -1,5 +1,7 @@
+import json
+
 from uuid import uuid4
-from toot import cli
+from toot import api, cli
 
 from tests.integration.conftest import assert_ok, register_account
 
@@ -160,3 +162,119 @@ def test_list_add_remove_json(run, run_json, app):
 
     result = run_json(cli.lists.accounts, list_name, "--json")
     assert result == []
+
+
+def test_list_add_remove_multiple(run, app):
+    list_name = str(uuid4())
+    acc1 = register_account(app)
+    acc2 = register_account(app)
+    acc3 = register_account(app)
+    run(cli.lists.create, list_name)
+
+    for acc in [acc1, acc2, acc3]:
+        run(cli.accounts.follow, acc.username)
+
+    result = run(cli.lists.add, list_name, acc1.username, acc2.username)
+    assert_ok(result)
+    assert result.stdout.strip() == "✓ Added 2 accounts"
+
+    # Accounts can be passed via stdin
+    result = run(cli.lists.add, list_name, input=f"{acc3.username}\n")
+    assert_ok(result)
+    assert result.stdout.strip() == f'✓ Added account "{acc3.username}"'
+
+    result = run(cli.lists.accounts, list_name)
+    assert_ok(result)
+    assert acc1.username in result.stdout
+    assert acc2.username in result.stdout
+    assert acc3.username in result.stdout
+
+    result = run(cli.lists.remove, list_name, "-", input=f"{acc1.username}\n{acc2.username}\n")
+    assert_ok(result)
+    assert result.stdout.strip() == "✓ Removed 2 accounts"
+
+    result = run(cli.lists.accounts, list_name)
+    assert_ok(result)
+    assert acc1.username not in result.stdout
+    assert acc2.username not in result.stdout
+    assert acc3.username in result.stdout
+
+
+def test_list_add_multiple_not_following(run, app):
+    list_name = str(uuid4())
+    acc1 = register_account(app)
+    acc2 = register_account(app)
+    run(cli.lists.create, list_name)
+    run(cli.accounts.follow, acc1.username)
+
+    result = run(cli.lists.add, list_name, acc1.username, acc2.username)
+    assert result.exit_code == 1
+    assert result.stderr.strip() == f"Error: You must follow @{acc2.username} before adding this account to a list."
+
+
+def test_list_sync(run, app):
+    list_name = str(uuid4())
+    acc1 = register_account(app)
+    acc2 = register_account(app)
+    acc3 = register_account(app)
+    run(cli.lists.create, list_name)
+
+    for acc in [acc1, acc2, acc3]:
+        run(cli.accounts.follow, acc.username)
+
+    run(cli.lists.add, list_name, acc1.username, acc2.username)
+
+    result = run(cli.lists.sync, list_name, acc2.username, acc3.username, "--dry-run")
+    assert_ok(result)
+    assert f"+ @{acc3.username}" in result.stdout
+    assert f"- @{acc1.username}" in result.stdout
+    assert "Would add 1 and remove 1 accounts" in result.stdout
+
+    result = run(cli.lists.sync, list_name, acc2.username, acc3.username)
+    assert_ok(result)
+    assert "✓ Added 1 and removed 1 accounts" in result.stdout
+
+    result = run(cli.lists.accounts, list_name)
+    assert_ok(result)
+    assert acc1.username not in result.stdout
+    assert acc2.username in result.stdout
+    assert acc3.username in result.stdout
+
+    # Clearing the list must be explicit
+    for args in [(), ("--dry-run",)]:
+        result = run(cli.lists.sync, list_name, *args, input="")
+        assert result.exit_code == 1
+        assert result.stderr.strip() == "Error: Please specify at least one account"
+
+    result = run(cli.lists.sync, list_name, "--allow-empty", "--dry-run", input="")
+    assert_ok(result)
+    assert "Would add 0 and remove 2 accounts" in result.stdout
+
+    result = run(cli.lists.sync, list_name, "-", input="")
+    assert_ok(result)
+    assert "✓ Added 0 and removed 2 accounts" in result.stdout
+
+
+def test_list_add_batches(run, run_json, app, monkeypatch):
+    list_name = str(uuid4())
+    accounts = [register_account(app) for _ in range(3)]
+    run(cli.lists.create, list_name)
+    for acc in accounts[:2]:
+        run(cli.accounts.follow, acc.username)
+
+    # The third account is not followed, so the second batch fails
+    monkeypatch.setattr(api, "LIST_ACCOUNTS_BATCH_SIZE", 2)
+    names = [acc.username for acc in accounts]
+
+    result = run(cli.lists.add, list_name, *names)
+    assert result.exit_code == 1
+    assert "Batch 1/2: 2 accounts added" in result.stdout
+    assert "Batch 2/2 failed, 1 accounts not added" in result.stderr
+
+    result = run(cli.lists.add, list_name, *names, "--json")
+    assert result.exit_code == 1
+    [ok, failed] = json.loads(result.stdout)
+    assert len(ok["account_ids"]) == 2
+    assert ok["response"] == {}
+    assert len(failed["account_ids"]) == 1
+    assert "error" in failed
@@ -131,6 +131,14 @@ def test_timelines_v2(app, user, other_user, friend_user, friend_list, run):
     assert status2.id in result.stdout
     assert status3.id in result.stdout
 
+    # Public timeline streamed into an external pager, which writes straight
+    # to stdout when not attached to a terminal
+    result = run(cli.timelines_v2.public, "--external-pager")
+    assert_ok(result)
+    assert status1.id in result.stdout
+    assert status2.id in result.stdout
+    assert status3.id in result.stdout
+
     # Anon public timeline
     result = run(cli.timelines_v2.public, "--no-pager", "--instance", TOOT_TEST_BASE_URL)
     assert_ok(result)
@@ -229,6 +237,19 @@ def test_timeline_instance_needs_public_or_tag(run):
     assert result.stderr.strip() == "Error: The --instance option is only valid alongside --public or --tag."
 
 
+def test_timeline_external_pager_conflicts(run):
+    for option in ["--json", "--template={id}", "--format=ndjson"]:
+        result = run(cli.timelines_v2.home, "--external-pager", option)
+        assert result.exit_code == 2
+        assert "--external-pager cannot be used with --json, --fields, --format or --template" in result.stderr
+
+
+def test_timeline_workers_need_streamed_output(run):
+    result = run(cli.timelines_v2.home, "--workers", "2")
+    assert result.exit_code == 2
+    assert "--workers requires --no-pager or --external-pager" in result.stderr
+
+
 def test_bookmarks(app, user, run):
     status1 = _post_status(app, user)
     status2 = _post_status(app, user)
@@ -285,6 +306,19 @@ def test_notifications_follow(app, user, friend_user, run_as):
     assert "now follows you" not in result.stdout
 
 
+def test_notifications_grouped(app, user, other_user, run):
+    text = f"Paging doctor @{user.username}"
+    status = _post_status(app, other_user, text)
+
+    def test_notifications():
+        result = run(cli.timelines.notifications, "--grouped")
+        assert_ok(result)
+        assert f"@{other_user.username} mentioned you" in result.stdout
+        assert status.id in result.stdout
+        assert text in result.stdout
+    run_with_retries(test_notifications)
+
+
 def _post_status(app, user, text=None) -> Status:
     text = text or str(uuid4())
     response = api.post_status(app, user, text)
@@ -0,0 +1,67 @@
+from toot import api
+from toot.exceptions import NotFoundError
+from toot.api import home_timeline_around_generator, merge_grouped_notifications
+
+
+def test_merge_grouped_notifications_deduplicates():
+    page1 = {
+        "accounts": [{"id": "1"}, {"id": "2"}],
+        "statuses": [{"id": "100"}],
+        "notification_groups": [
+            {"group_key": "favourite-100", "sample_account_ids": ["1", "2"]},
+            {"group_key": "ungrouped-5", "sample_account_ids": ["2"]},
+        ],
+    }
+    page2 = {
+        "accounts": [{"id": "2"}, {"id": "3"}],
+        "statuses": [{"id": "100"}, {"id": "101"}],
+        "notification_groups": [
+            {"group_key": "favourite-100", "sample_account_ids": ["3"]},
+            {"group_key": "reblog-101", "sample_account_ids": ["3"]},
+        ],
+    }
+
+    merged = merge_grouped_notifications([page1, page2])
+
+    assert [a["id"] for a in merged["accounts"]] == ["1", "2", "3"]
+    assert [s["id"] for s in merged["statuses"]] == ["100", "101"]
+    assert [g["group_key"] for g in merged["notification_groups"]] == [
+        "favourite-100",
+        "ungrouped-5",
+        "reblog-101",
+    ]
+
+    # The first (newest) occurrence of a group is kept
+    assert merged["notification_groups"][0]["sample_account_ids"] == ["1", "2"]
+
+
+def test_merge_grouped_notifications_empty():
+    assert merge_grouped_notifications([]) == {
+        "accounts": [],
+        "statuses": [],
+        "notification_groups": [],
+    }
+
+
+def test_home_timeline_around_generator(monkeypatch):
+    def fetch_status(app, user, id):
+        if id == "8":
+            raise NotFoundError("Record not found")
+        return {"id": id}
+
+    def home_timeline_generator(app, user, limit, max_id):
+        pages = [["7", "6"], ["5", "4"], ["3"]]
+        for page in pages:
+            yield [{"id": id} for id in page if id < max_id]
+
+    monkeypatch.setattr(api, "fetch_status", fetch_status)
+    monkeypatch.setattr(api.http, "decode_json", lambda response: response)
+    monkeypatch.setattr(api, "home_timeline_generator", home_timeline_generator)
+
+    # Starts at the given status followed by older ones
+    batches = home_timeline_around_generator(None, None, "7")
+    assert [[s["id"] for s in b] for b in batches] == [["7", "6"], ["5", "4"], ["3"]]
+
+    # Starts at the next older status if the given one was deleted
+    batches = home_timeline_around_generator(None, None, "8")
+    assert [[s["id"] for s in b] for b in batches] == [["7", "6"], ["5", "4"], ["3"]]
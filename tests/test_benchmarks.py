@@ -0,0 +1,22 @@
+"""
+Make sure the benchmarks keep working, see tests/benchmarks.
+"""
+
+import json
+import pytest
+
+from tests.benchmarks import BENCHMARKS, run_benchmark
+from tests.benchmarks.fixtures import make_timeline
+
+
+def test_make_timeline_is_deterministic():
+    assert make_timeline(20, seed=1) == make_timeline(20, seed=1)
+    assert make_timeline(20, seed=1) != make_timeline(20, seed=2)
+
+
+@pytest.mark.parametrize("name", BENCHMARKS)
+def test_benchmark(name):
+    corpus = json.dumps(make_timeline(20)).encode()
+    result = run_benchmark(name, corpus, repeat=1)
+    assert result["ops"] > 0
+    assert result["bytes"] > 0
@@ -0,0 +1,35 @@
+from toot.cache import RenderCache, render_cache
+from toot.output import html_lines
+
+
+def test_render_cache():
+    cache = RenderCache(max_size=2)
+    calls = []
+
+    def render(value):
+        calls.append(value)
+        return value.upper()
+
+    assert cache.get("upper", "foo", lambda: render("foo"), 80) == "FOO"
+    assert cache.get("upper", "foo", lambda: render("foo"), 80) == "FOO"
+    assert calls == ["foo"]
+
+    # Different options and renderers are cached separately
+    cache.get("upper", "foo", lambda: render("foo"), 40)
+    cache.get("lower", "foo", lambda: render("foo"), 80)
+    assert calls == ["foo", "foo", "foo"]
+
+    # Least recently used items are evicted
+    assert len(cache) == 2
+    cache.get("upper", "foo", lambda: render("foo"), 80)
+    assert calls == ["foo", "foo", "foo", "foo"]
+
+
+def test_html_lines_cached():
+    render_cache.clear()
+    html = "<p>foo bar baz</p><p>qux</p>"
+
+    assert html_lines(html, 8) == ("foo bar", "baz", "", "qux")
+    assert html_lines(html, 8) == ("foo bar", "baz", "", "qux")
+    assert html_lines(html, 80) == ("foo bar baz", "", "qux")
+    assert len(render_cache) == 2
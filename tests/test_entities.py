@@ -0,0 +1,290 @@
+import dataclasses
+import pytest
+
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from toot.entities import Account, ConversionError, CustomEmoji, InternPool, entity, from_dict, get_field, interning
+from toot.entities import get_field_type, validate_fields
+
+
+@entity
+class Node:
+    name: str
+    count: int
+    created_at: datetime
+    day: Optional[date]
+    tags: List[str]
+    children: List["Node"]
+    parent: Optional["Node"] = None
+
+
+def test_from_dict():
+    node = from_dict(Node, {
+        "name": "foo",
+        "count": 3,
+        "created_at": "2023-01-02T03:04:05.000Z",
+        "day": "2023-01-02",
+        "tags": ["a", "b"],
+        "children": [{
+            "name": "bar",
+            "count": 0,
+            "created_at": "2023-01-02T03:04:05Z",
+            "day": None,
+            "tags": [],
+            "children": [],
+        }],
+    })
+
+    assert node.name == "foo"
+    assert node.count == 3
+    assert node.created_at == datetime(2023, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert node.day == date(2023, 1, 2)
+    assert node.tags == ["a", "b"]
+    assert node.parent is None
+
+    [child] = node.children
+    assert child.name == "bar"
+    assert child.day is None
+    assert child.children == []
+
+
+def test_from_dict_conversion_error():
+    data = {
+        "name": "foo",
+        "count": 3,
+        "created_at": "2023-01-02T03:04:05Z",
+        "day": "not a date",
+        "tags": [],
+        "children": [],
+    }
+
+    with pytest.raises(ConversionError) as exc:
+        from_dict(Node, data)
+
+    assert "`Node.day`" in str(exc.value)
+    assert "'not a date'" in str(exc.value)
+
+
+def test_from_dict_nested_conversion_error():
+    data = {
+        "name": "foo",
+        "count": 3,
+        "created_at": "2023-01-02T03:04:05Z",
+        "day": None,
+        "tags": [],
+        "children": [],
+        "parent": {"name": "bar", "created_at": "yesterday"},
+    }
+
+    # Errors are reported for the innermost field which failed to convert
+    with pytest.raises(ConversionError) as exc:
+        from_dict(Node, data)
+
+    assert "`Node.created_at`" in str(exc.value)
+    assert "'yesterday'" in str(exc.value)
+
+
+def test_entities_are_slotted():
+    emoji = from_dict(CustomEmoji, {
+        "shortcode": "blobcat",
+        "url": "https://example.com/blobcat.png",
+        "static_url": "https://example.com/blobcat.png",
+        "visible_in_picker": True,
+    })
+
+    assert emoji.shortcode == "blobcat"
+    assert emoji.category is None
+    assert not hasattr(emoji, "__dict__")
+    assert emoji == CustomEmoji(**{f.name: getattr(emoji, f.name) for f in dataclasses.fields(CustomEmoji)})
+
+    with pytest.raises(AttributeError):
+        emoji.foo = "bar"
+
+
+def test_from_dict_lazy():
+    data = {
+        "name": "foo",
+        "count": 3,
+        "created_at": "2023-01-02T03:04:05Z",
+        "day": None,
+        "tags": ["a"],
+        "children": [],
+        "parent": {
+            "name": "bar",
+            "count": 1,
+            "created_at": "2023-01-02T03:04:05Z",
+            "day": "2023-01-01",
+            "tags": [],
+            "children": [],
+        },
+    }
+
+    node = from_dict(Node, data, lazy=True)
+    assert isinstance(node, Node)
+
+    # Nested data classes are not converted until accessed
+    assert node.name == "foo"
+    assert node.tags == ["a"]
+    with pytest.raises(AttributeError):
+        Node.__dict__["parent"].__get__(node)
+
+    assert node.parent.name == "bar"
+    assert node.parent.day == date(2023, 1, 1)
+    assert node.parent is node.parent
+
+    # The source dict is released once all nested fields are converted
+    assert node._toot_data is data
+    assert node.children == []
+    assert node._toot_data is None
+
+    assert node == from_dict(Node, data)
+    assert from_dict(Node, data) == node
+
+
+def test_from_dict_lazy_conversion_error():
+    data = {
+        "name": "foo",
+        "count": 3,
+        "created_at": "2023-01-02T03:04:05Z",
+        "day": None,
+        "tags": [],
+        "children": [],
+        "parent": {"name": "bar", "created_at": "yesterday"},
+    }
+
+    # Errors in nested data classes are raised on access
+    node = from_dict(Node, data, lazy=True)
+    with pytest.raises(ConversionError) as exc:
+        node.parent
+
+    assert "`Node.created_at`" in str(exc.value)
+
+
+def make_account(id: str, display_name: str = "Foo"):
+    return {
+        "id": id,
+        "username": "foo",
+        "acct": "foo@example.com",
+        "url": "https://example.com/@foo",
+        "display_name": display_name,
+        "note": "",
+        "avatar": "",
+        "avatar_static": "",
+        "header": "",
+        "header_static": "",
+        "locked": False,
+        "fields": [],
+        "emojis": [],
+        "bot": False,
+        "group": False,
+        "created_at": "2023-01-02T03:04:05Z",
+        "statuses_count": 1,
+        "followers_count": 2,
+        "following_count": 3,
+    }
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_interning(lazy):
+    with interning() as pool:
+        account1 = from_dict(Account, make_account("1"), lazy)
+        account2 = from_dict(Account, make_account("1"), lazy)
+        account3 = from_dict(Account, make_account("2"), lazy)
+        account4 = from_dict(Account, make_account("1", display_name="Bar"), lazy)
+
+    assert account1 is account2
+    assert account1 is not account3
+    assert account1 is not account4
+    assert account4.display_name == "Bar"
+    assert pool.hits == 1
+    assert pool.misses == 3
+
+    # Not interned outside the block
+    assert from_dict(Account, make_account("1"), lazy) is not from_dict(Account, make_account("1"), lazy)
+
+
+def test_interning_lazy_nested():
+    pool = InternPool()
+    emoji_data = {"shortcode": "blob", "url": "", "static_url": "", "visible_in_picker": True}
+
+    with interning(pool):
+        account = from_dict(Account, {**make_account("1"), "emojis": [emoji_data]}, lazy=True)
+        emoji = from_dict(CustomEmoji, dict(emoji_data))
+
+    # Nested fields of lazy entities are converted using the pool which was
+    # active when the entity was created
+    assert account.emojis[0] is emoji
+
+
+def test_interning_evicts_least_recently_used():
+    with interning(InternPool(max_size=2)) as pool:
+        account1 = from_dict(Account, make_account("1"))
+        from_dict(Account, make_account("2"))
+        assert from_dict(Account, make_account("1")) is account1
+        from_dict(Account, make_account("3"))
+        assert len(pool) == 2
+
+        # Account 2 was evicted, account 1 was used more recently
+        assert from_dict(Account, make_account("1")) is account1
+        assert pool.misses == 3
+        from_dict(Account, make_account("2"))
+        assert pool.misses == 4
+
+
+def test_from_dict_fields():
+    data = {
+        "name": "foo",
+        "count": 3,
+        "created_at": "2023-01-02T03:04:05Z",
+        "day": "not a date",
+        "tags": ["a"],
+        "children": [
+            {"name": "bar", "count": 1, "created_at": "invalid", "children": []},
+            {"name": "baz", "count": 2, "created_at": "invalid", "children": []},
+        ],
+        "parent": {"name": "qux", "count": 0, "created_at": "invalid"},
+    }
+
+    # Fields which are not projected are not converted, so invalid values
+    # don't raise
+    node = from_dict(Node, data, fields=["name", "created_at", "children.name", "parent.name"])
+
+    assert node.name == "foo"
+    assert node.created_at == datetime(2023, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert node.count is None
+    assert node.day is None
+    assert node.tags is None
+    assert node.parent.name == "qux"
+    assert node.parent.created_at is None
+    assert [child.name for child in node.children] == ["bar", "baz"]
+    assert [child.count for child in node.children] == [None, None]
+
+    assert get_field(node, "parent.name") == "qux"
+    assert get_field(node, "children.name") == ["bar", "baz"]
+    assert get_field(node, "parent.parent.name") is None
+
+
+def test_validate_fields():
+    validate_fields(Node, ["name", "children.parent.name"])
+
+    with pytest.raises(ValueError, match="Unknown field `Node.foo`"):
+        validate_fields(Node, ["name", "foo"])
+
+    with pytest.raises(ValueError, match="Unknown field `Node.foo`"):
+        validate_fields(Node, ["parent.foo"])
+
+    with pytest.raises(ValueError, match="Field `Node.name` has no subfields"):
+        validate_fields(Node, ["name.foo"])
+
+
+def test_get_field_type():
+    assert get_field_type(Node, "name") is str
+    assert get_field_type(Node, "created_at") is datetime
+    assert get_field_type(Node, "parent") is Node
+    assert get_field_type(Node, "parent.count") is int
+    assert get_field_type(Node, "tags") == List[str]
+    assert get_field_type(Node, "children.name") == List[str]
+
+    with pytest.raises(ValueError, match="Unknown field `Node.foo`"):
+        get_field_type(Node, "parent.foo")
@@ -0,0 +1,53 @@
+import json
+import pytest
+
+from requests import Response
+
+from toot import http
+
+
+def make_response(content: bytes) -> Response:
+    response = Response()
+    response._content = content
+    return response
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_decode_json(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(http, "orjson", None)
+
+    response = make_response('{"foo": ["bar", 1, null, "ž"]}'.encode())
+    assert http.decode_json(response) == {"foo": ["bar", 1, None, "ž"]}
+
+    with pytest.raises(ValueError):
+        http.decode_json(make_response(b"<html>"))
+
+
+class StreamedResponse(Response):
+    def __init__(self, content: bytes, chunk_size: int):
+        super().__init__()
+        self._chunks = [content[i:i + chunk_size] for i in range(0, len(content), chunk_size)]
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        return iter(self._chunks)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1000])
+def test_iter_json_array(chunk_size):
+    data = [{"foo": "žćč 日本語", "bar": [1, 2.5, None]}, 12345, "baz", True, None, [], {}]
+    content = json.dumps(data, indent=2, ensure_ascii=False).encode()
+
+    response = StreamedResponse(content, chunk_size)
+    assert list(http.iter_json_array(response)) == data
+
+    response = StreamedResponse(b" [ ] ", chunk_size)
+    assert list(http.iter_json_array(response)) == []
+
+
+@pytest.mark.parametrize("content", [b"", b"{}", b"[1,", b"[1 2]", b"[1,]"])
+def test_iter_json_array_invalid(content):
+    with pytest.raises(ValueError):
+        list(http.iter_json_array(StreamedResponse(content, 1)))
@@ -0,0 +1,76 @@
+from toot import api, http
+from toot.cli import Context
+from toot.cli.imports import _follow, _import, _read_csv
+
+
+def test_read_csv_with_header(tmp_path):
+    path = tmp_path / "following_accounts.csv"
+    path.write_text(
+        "Account address,Show boosts,Notify on new posts,Languages\n"
+        "alice@example.com,true,false,\"en, de\"\n"
+        "\n"
+        " bob@example.com ,false,true,\n"
+    )
+
+    assert _read_csv(str(path)) == [
+        {
+            "Account address": "alice@example.com",
+            "Show boosts": "true",
+            "Notify on new posts": "false",
+            "Languages": "en, de",
+        },
+        {
+            "Account address": "bob@example.com",
+            "Show boosts": "false",
+            "Notify on new posts": "true",
+            "Languages": "",
+        },
+    ]
+
+
+def test_read_csv_without_header(tmp_path):
+    path = tmp_path / "blocked_accounts.csv"
+    path.write_text("alice@example.com\nbob@example.com\n")
+
+    assert _read_csv(str(path)) == [
+        {"Account address": "alice@example.com"},
+        {"Account address": "bob@example.com"},
+    ]
+
+
+def test_follow_languages(monkeypatch):
+    calls = []
+    monkeypatch.setattr(api, "follow", lambda *args, **kwargs: calls.append(kwargs["languages"]))
+
+    ctx = Context(app=None)
+    _follow(ctx, "1", {"Languages": "en, de,,"})
+    _follow(ctx, "2", {"Languages": ""})
+
+    assert calls == [["en", "de"], None]
+
+
+def test_import_resumes_from_progress_file(tmp_path, monkeypatch):
+    path = tmp_path / "blocked_accounts.csv"
+    path.write_text("alice@example.com\nbob@example.com\ncarol@example.com\n")
+    progress_path = tmp_path / "progress"
+    progress_path.write_text("alice@example.com\n")
+
+    ids = {"alice@example.com": "1", "bob@example.com": "2", "carol@example.com": "3"}
+    monkeypatch.setattr(api, "lookup", lambda app, user, acct: {"id": ids[acct]})
+    monkeypatch.setattr(http, "decode_json", lambda response: response)
+    monkeypatch.setattr(api, "get_relationships", lambda app, user, ids: [
+        {"id": "2", "blocking": False},
+        {"id": "3", "blocking": True},
+    ])
+
+    blocked = []
+    _import(Context(app=None), str(path), str(progress_path), 1, ["blocking"],
+            lambda ctx, account_id, row: blocked.append(account_id))
+
+    # Alice was already processed, Carol is already blocked
+    assert blocked == ["2"]
+    assert progress_path.read_text().splitlines() == [
+        "alice@example.com",
+        "carol@example.com",
+        "bob@example.com",
+    ]
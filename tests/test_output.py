@@ -1,6 +1,16 @@
+import click
+import json
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
 from wcwidth import wcswidth
 
-from toot.output import print_table
+from tests.utils import make_timeline
+from toot import output
+from toot.entities import Status, Tag, from_dict
+from toot.output import buffered_output, echo, format_field_value, print_fields, print_records, print_table
+from toot.output import print_timeline, print_timeline_parallel, render_timeline_parallel
 
 
 def test_print_table_aligns_wide_characters(capsys):
@@ -20,3 +30,154 @@ def test_print_table_aligns_wide_characters(capsys):
     display_widths = {wcswidth(line) for line in lines}
 
     assert len(display_widths) == 1
+
+
+def test_format_field_value():
+    assert format_field_value(None) == ""
+    assert format_field_value(True) == "true"
+    assert format_field_value(3) == "3"
+    assert format_field_value(["a", None, "b"]) == "a,,b"
+    assert format_field_value("foo\tbar\nbaz") == "foo bar baz"
+    assert format_field_value(datetime(2023, 1, 2, tzinfo=timezone.utc)) == "2023-01-02T00:00:00+00:00"
+
+
+def test_print_fields(capsys):
+    tags = [
+        from_dict(Tag, {"name": "foo", "url": "https://example.com/tags/foo"}, fields=["name", "url"]),
+        from_dict(Tag, {"name": "bar", "url": None}, fields=["name", "url"]),
+    ]
+    print_fields(tags, ["name", "url"])
+
+    assert capsys.readouterr().out == "foo\thttps://example.com/tags/foo\nbar\t\n"
+
+
+def test_buffered_output(capsys):
+    with buffered_output() as buffer:
+        buffer.chunk_size = 13
+        buffer.flush_interval = 60
+        echo("foo")
+        echo("bar")
+        assert capsys.readouterr().out == ""
+
+        # Written once the chunk size is reached
+        echo("bazqux")
+        assert capsys.readouterr().out == "foo\nbar\nbazqux\n"
+
+        echo("last")
+        with buffered_output():
+            echo("nested")
+        assert capsys.readouterr().out == ""
+
+    assert capsys.readouterr().out == "last\nnested\n"
+
+    # Not buffered outside the block
+    echo("unbuffered")
+    assert capsys.readouterr().out == "unbuffered\n"
+
+
+def test_buffered_output_flush_interval(capsys, monkeypatch):
+    now = 100.0
+    monkeypatch.setattr(output.time, "monotonic", lambda: now)
+
+    with buffered_output() as buffer:
+        buffer.flush_interval = 0.5
+        echo("foo")
+        now += 0.4
+        echo("bar")
+        assert capsys.readouterr().out == ""
+
+        # Written once the first buffered line is old enough
+        now += 0.1
+        echo("baz")
+        assert capsys.readouterr().out == "foo\nbar\nbaz\n"
+
+        # The interval starts again with the next line
+        now += 1
+        echo("qux")
+        assert capsys.readouterr().out == ""
+
+
+TAGS = [
+    {"name": "foo", "url": "https://example.com/tags/foo", "history": [], "following": True},
+    {"name": "bar, baz", "url": "https://example.com/tags/bar", "history": [], "following": None},
+]
+
+
+def test_print_records_ndjson(capsys):
+    print_records(TAGS, Tag, "ndjson")
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line) for line in lines] == TAGS
+
+
+def test_print_records_csv(capsys):
+    print_records(TAGS, Tag, "csv")
+
+    assert capsys.readouterr().out == (
+        "name,url,following\n"
+        "foo,https://example.com/tags/foo,true\n"
+        '"bar, baz",https://example.com/tags/bar,\n'
+    )
+
+
+def test_print_records_tsv_fields(capsys):
+    print_records(TAGS, Tag, "tsv", ["following", "name"])
+
+    assert capsys.readouterr().out == "following\tname\ntrue\tfoo\n\tbar, baz\n"
+
+
+def test_print_timeline_parallel(capsys):
+    timeline = make_timeline(250)
+
+    with click.Context(click.Command("test"), max_content_width=80):
+        print_timeline([from_dict(Status, item) for item in timeline])
+        expected = capsys.readouterr().out
+
+        pages = [timeline[:100], timeline[100:200], timeline[200:]]
+        print_timeline_parallel(iter(pages), workers=2)
+        assert capsys.readouterr().out == expected
+
+
+def test_render_timeline_parallel_fans_out(monkeypatch):
+    submitted = []
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, items, *args):
+            submitted.append(len(items))
+            return super().submit(fn, items, *args)
+
+    monkeypatch.setattr(output, "ProcessPoolExecutor", RecordingExecutor)
+    timeline = make_timeline(40)
+
+    rendered = list(render_timeline_parallel([timeline[:30], timeline[30:]], 80, workers=4))
+
+    # Each page is split between all workers
+    assert submitted == [8, 8, 8, 6, 3, 3, 3, 1]
+    assert len(rendered) == len(submitted)
+
+
+def test_print_table_streaming(capsys, monkeypatch):
+    monkeypatch.setattr(output, "TABLE_SAMPLE_SIZE", 2)
+    rows = [["1", "foo"], ["2", "bar"], ["3", "much longer"]]
+    print_table(["ID", "Name"], iter(rows))
+
+    # Columns are sized from the sample, longer cells are truncated
+    assert capsys.readouterr().out.splitlines() == [
+        "ID  Name  ",
+        "--  ----  ",
+        "1   foo   ",
+        "2   bar   ",
+        "3   muc…  ",
+    ]
+
+
+def test_print_table_truncates_wide_characters(capsys, monkeypatch):
+    monkeypatch.setattr(output, "TABLE_SAMPLE_SIZE", 1)
+    print_table(["ID", "Name"], iter([["1", "Names"], ["2", "日本語"]]))
+
+    assert capsys.readouterr().out.splitlines() == [
+        "ID  Name   ",
+        "--  -----  ",
+        "1   Names  ",
+        "2   日…    ",
+    ]
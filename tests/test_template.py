@@ -0,0 +1,58 @@
+import pytest
+
+from datetime import datetime
+
+from toot.entities import Status, from_dict
+from toot.template import compile_template
+from tests.utils import make_account, make_status as make_status_data
+
+
+def make_status(**kwargs):
+    return make_status_data(account=make_account(acct="foo@example.com"), **kwargs)
+
+
+def test_render_template():
+    template = compile_template("{id} {account.acct} [{reblog.id}] {favourites_count:>4}", Status)
+    status = make_status(id="123", reblog=None, favourites_count=42)
+
+    assert template.fields == ["id", "account.acct", "reblog.id", "favourites_count"]
+    assert template.render_data(status) == "123 foo@example.com []   42"
+
+
+def test_render_template_filters():
+    template = compile_template("{created_at:%Y-%m-%d} {content:text} | {content:text:12} | {{literal}}", Status)
+    status = make_status(content="<p>Hello <b>world</b></p><p>second<br>line</p>")
+
+    rendered = template.render_data(status)
+    created_at = datetime.fromisoformat(status["created_at"].replace("Z", "+00:00")).astimezone()
+    assert rendered == f"{created_at:%Y-%m-%d} Hello world second line | Hello world… | {{literal}}"
+
+
+@pytest.mark.parametrize("template, error", [
+    ("{foo}", "Unknown field `Status.foo`"),
+    ("{id.foo}", "Field `Status.id` has no subfields"),
+    ("{id!r}", "Conversions are not supported"),
+    ("{}", "Empty field name"),
+    ("{content:text:0}", "Truncation width must be 1 or larger"),
+    ("{favourites_count:%H}", "Invalid format spec `%H` for field `favourites_count`"),
+    ("{account.acct:=10}", "Invalid format spec `=10` for field `account.acct`"),
+    ("{media_attachments.url:>10}", "Invalid format spec `>10` for field `media_attachments.url`"),
+    ("{account:>10}", "Invalid format spec `>10` for field `account`"),
+])
+def test_compile_template_errors(template, error):
+    with pytest.raises(ValueError, match=error):
+        compile_template(template, Status)
+
+
+def test_render_template_entity():
+    template = compile_template("{id}\t{account.acct}\t{created_at}", Status)
+    status = make_status()
+
+    # Rendering a fully converted entity gives the same result
+    rendered = template.render(from_dict(Status, status))
+    assert rendered == template.render_data(status)
+
+    id, acct, created_at = rendered.split("\t")
+    assert id == status["id"]
+    assert acct == "foo@example.com"
+    assert datetime.fromisoformat(created_at).tzinfo is not None
@@ -0,0 +1,114 @@
+import click
+import io
+import json
+import pytest
+
+from concurrent.futures import ThreadPoolExecutor
+from requests import Response
+
+from tests.utils import make_timeline
+from toot import output
+from toot.cli import timelines_v2
+from toot.cli.timelines_v2 import TimelineOptions, _validate_options
+from toot.template import compile_template
+from toot.entities import Status
+
+
+class FakeResponse(Response):
+    def __init__(self, items):
+        super().__init__()
+        self.status_code = 200
+        self.raw = io.BytesIO(json.dumps(items).encode())
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+class FakeResponses:
+    """Pages of a timeline, records fetched pages and whether paging was stopped."""
+    def __init__(self, pages):
+        self.pages = pages
+        self.fetched = []
+        self.stopped = False
+
+    def __iter__(self):
+        try:
+            for page in self.pages:
+                response = FakeResponse(page)
+                self.fetched.append(response)
+                yield response
+        finally:
+            self.stopped = True
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_external_pager_closes_responses_on_exit(monkeypatch, workers):
+    monkeypatch.setattr(output, "ProcessPoolExecutor", ThreadPoolExecutor)
+    timeline = make_timeline(120)
+    pages = FakeResponses([timeline[:40], timeline[40:80], timeline[80:]])
+    read = []
+
+    def echo_via_pager(generator):
+        # The pager exits after reading a few chunks
+        for _ in range(3):
+            read.append(next(generator))
+
+    monkeypatch.setattr(click, "echo_via_pager", echo_via_pager)
+
+    with click.Context(click.Command("test"), max_content_width=80):
+        timelines_v2._print_external_pager(iter(pages), workers)
+
+    assert len(read) == 3
+    assert pages.stopped
+    assert len(pages.fetched) < len(pages.pages)
+    assert all(response.closed for response in pages.fetched)
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_print_unpaged_all_pages(monkeypatch, capsys, workers):
+    monkeypatch.setattr(output, "ProcessPoolExecutor", ThreadPoolExecutor)
+    timeline = make_timeline(100)
+    pages = FakeResponses([timeline[:40], timeline[40:80], timeline[80:]])
+
+    with click.Context(click.Command("test"), max_content_width=80):
+        timelines_v2._print_unpaged(iter(pages), False, 40, workers, True)
+
+    out = capsys.readouterr().out
+    assert len(pages.fetched) == 3
+    assert all(f"ID {status['id']} " in out for status in timeline)
+    assert "There may be more results" not in out
+
+
+def make_options(**kwargs):
+    defaults = dict(
+        json=False, fields=None, output_format=None, template=None, pager=True,
+        external_pager=False, clear=True, limit=None, workers=None, all_pages=False,
+    )
+    return TimelineOptions(**{**defaults, **kwargs})
+
+
+@pytest.mark.parametrize("options, error", [
+    (dict(json=True, fields=["id"]), "--json cannot be used with --fields"),
+    (dict(all_pages=True), "--all-pages requires --no-pager, --fields, --format or --template"),
+    (dict(external_pager=True, all_pages=True), "--all-pages requires --no-pager"),
+    (dict(json=True, all_pages=True), "--all-pages cannot be used with --json"),
+    (dict(external_pager=True, output_format="csv"), "--external-pager cannot be used with"),
+    (dict(workers=2), "--workers requires --no-pager or --external-pager"),
+])
+def test_validate_options_errors(options, error):
+    with pytest.raises(click.UsageError, match=error):
+        _validate_options(make_options(**options))
+
+
+@pytest.mark.parametrize("options", [
+    dict(fields=["id"], all_pages=True),
+    dict(output_format="csv", fields=["id"], all_pages=True),
+    dict(template=compile_template("{id}", Status), all_pages=True),
+    dict(pager=False, workers=2),
+    dict(pager=False, all_pages=True),
+    dict(pager=False, workers=2, all_pages=True),
+])
+def test_validate_options(options):
+    _validate_options(make_options(**options))
@@ -2,14 +2,16 @@ from datetime import datetime
 import click
 import pytest
 import sys
+import threading
+import time
 
 from toot.cli.validators import validate_duration
 from toot.utils.datetime import parse_datetime
-from toot.wcstring import wc_wrap, trunc, pad, fit_text
+from toot.wcstring import wc_width, wc_wrap, trunc, pad, fit_text
 from toot.tui.utils import LRUCache
 from PIL import Image
 from collections import namedtuple
-from toot.utils import batched, urlencode_url
+from toot.utils import batched, html_to_paragraphs, id_sort_key, parse_content, prefetch, urlencode_url
 
 
 def test_pad():
@@ -168,6 +170,18 @@ def test_wc_wrap_indented():
     ]
 
 
+def test_wc_wrap_empty():
+    assert list(wc_wrap("", 10)) == [""]
+    assert list(wc_wrap("   ", 10)) == [""]
+
+
+def test_wc_width():
+    assert wc_width("") == 0
+    assert wc_width("foo bar") == 7
+    assert wc_width("Frank Zappa 🎸") == 14
+    assert wc_width("日本語") == 6
+
+
 def test_duration():
     def duration(value):
         return validate_duration(None, None, value)
@@ -335,6 +349,61 @@ def test_batched():
         list(batched("foo", 0))
 
 
+def test_prefetch():
+    fetched = []
+    two_fetched = threading.Event()
+
+    def pages():
+        for page in range(5):
+            fetched.append(page)
+            if page == 2:
+                two_fetched.set()
+            yield page
+
+    results = prefetch(pages(), depth=2)
+    assert next(results) == 0
+
+    # Pages are fetched ahead of the consumer, up to depth
+    assert two_fetched.wait(timeout=5)
+    assert fetched == [0, 1, 2]
+
+    assert list(results) == [1, 2, 3, 4]
+
+    with pytest.raises(ValueError):
+        next(prefetch([], depth=0))
+
+
+def test_prefetch_error():
+    def pages():
+        yield 1
+        raise ValueError("failed")
+
+    results = prefetch(pages())
+    assert next(results) == 1
+    with pytest.raises(ValueError, match="failed"):
+        next(results)
+
+
+def test_prefetch_close():
+    fetched = []
+    release = threading.Event()
+
+    def pages():
+        for page in range(5):
+            fetched.append(page)
+            yield page
+            release.wait(timeout=5)
+
+    results = prefetch(pages(), depth=2)
+    assert next(results) == 0
+    results.close()
+    release.set()
+
+    # Once closed, no more pages are fetched other than the one in progress
+    time.sleep(0.1)
+    assert fetched in ([0], [0, 1])
+
+
 def test_parse_datetime():
     # mastodon uses this format
     dt = parse_datetime("2023-07-21T13:27:45.996+00:00")
@@ -350,6 +419,14 @@ def test_parse_datetime():
     dt = parse_datetime("2023-12-29T09:22:15Z")
     assert dt_tuple(dt) == (2023, 12, 29, 9, 22, 15, 0)
 
+    dt = parse_datetime("2023-12-29T09:22:15.123Z")
+    assert dt_tuple(dt) == (2023, 12, 29, 9, 22, 15, 0)
+    assert dt.microsecond == 123000
+
+    # other formats are handled by dateutil
+    dt = parse_datetime("Fri, 29 Dec 2023 09:22:15 +0100")
+    assert dt_tuple(dt) == (2023, 12, 29, 8, 22, 15, 0)
+
 
 def dt_tuple(dt: datetime):
     assert isinstance(dt, datetime)
@@ -367,3 +444,36 @@ def dt_tuple(dt: datetime):
         dt.second,
         offset.total_seconds()
     )
+
+
+def test_html_to_paragraphs():
+    assert html_to_paragraphs("") == []
+    assert html_to_paragraphs("foo") == [["foo"]]
+    assert html_to_paragraphs("<p>foo &amp; &apos;bar&apos;</p><p>baz<br>qux<br />ｆｕｌｌ</p>") == [
+        ["foo & 'bar'"],
+        ["baz", "qux", "full"],
+    ]
+    # Empty paragraphs are dropped, empty lines are not
+    assert html_to_paragraphs("<p></p><p><br/></p>") == [["", ""]]
+
+
+def test_parse_content():
+    content = parse_content(
+        '<p><span class="h-card"><a href="https://example.com/@foo" class="u-url mention">@<span>foo</span></a></span>'
+        ' see <a href="https://example.com/" title="Example">example.com</a></p>'
+        '<p><a href="https://example.com/tags/toot" class="mention hashtag" rel="tag">#<span>toot</span></a></p>'
+    )
+
+    assert content.paragraphs == [["@foo see example.com"], ["#toot"]]
+    assert content.links == [
+        ("https://example.com/@foo", None),
+        ("https://example.com/", "Example"),
+        ("https://example.com/tags/toot", None),
+    ]
+    assert content.mentions == ["@foo"]
+    assert content.hashtags == ["toot"]
+
+
+def test_id_sort_key():
+    ids = ["110000000000000001", "9", "109999999999999999", "10"]
+    assert sorted(ids, key=id_sort_key) == ["9", "10", "109999999999999999", "110000000000000001"]
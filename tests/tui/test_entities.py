@@ -0,0 +1,54 @@
+from toot.entities import Status as StatusEntity, from_dict
+from toot.tui.entities import Status
+
+from tests.utils import make_timeline
+
+
+def make_status(data, is_mine=False):
+    return Status(from_dict(StatusEntity, data), data, is_mine, "example.com")
+
+
+def test_status():
+    [data] = make_timeline(1)
+    data["account"]["acct"] = "foo"
+    data["account"]["display_name"] = "Foo"
+    data["reblog"] = None
+
+    status = make_status(data)
+
+    assert status.id == data["id"]
+    assert status.account == "foo@example.com"
+    assert status.author.account == "foo@example.com"
+    assert status.author.display_name == "Foo"
+    assert status.original is status
+    assert status.reblog is None
+    assert status.show_sensitive is False
+    assert status.translation is None
+
+
+def test_reblog():
+    data, reblogged = make_timeline(2)
+    data["reblog"] = reblogged
+    data["account"]["acct"] = "foo@bar.com"
+    reblogged["account"]["acct"] = "baz"
+
+    status = make_status(data, is_mine=True)
+
+    assert status.account == "foo@bar.com"
+    assert status.reblog is not None
+    assert status.original is status.reblog
+    assert status.original.entity is status.entity.reblog
+    assert status.original.data is reblogged
+    assert status.original.account == "baz@example.com"
+    assert status.original.is_mine is False
+
+
+def test_status_keeps_source_data():
+    [data] = make_timeline(1)
+    data["reblog"] = None
+    data["unknown_field"] = "kept"
+
+    status = make_status(data)
+
+    assert status.data is data
+    assert status.data["unknown_field"] == "kept"
@@ -43,3 +43,15 @@ def test_html_to_widgets():
     assert bar_embed.embedded == []
     assert bar_embed.attrib == [(None, 4), ("b", 3), (None, 1), ("i", 3)]
     assert bar_embed.text == "foo bar baz"
+
+
+def test_html_to_widgets_not_shared():
+    html = '<p>foo <a href="https://example.com">bar</a></p>'
+
+    first = html_to_widgets(html)
+    second = html_to_widgets(html)
+
+    # Rendered markup is cached, but each view gets its own widgets
+    assert len(first) == len(second) == 1
+    assert first[0] is not second[0]
+    assert first[0].contents[0][0].text == second[0].contents[0][0].text
@@ -3,7 +3,7 @@ Helpers for testing.
 """
 
 import time
-from typing import Callable, TypeVar
+from typing import Callable, List, TypeVar
 
 
 T = TypeVar("T")
@@ -27,3 +27,80 @@ def run_with_retries(fn: Callable[..., T]) -> T:
             time.sleep(delay)
 
     return fn()
+
+
+def make_account(id: str = "1", **kwargs) -> dict:
+    """Returns account data as received from Mastodon."""
+    return {
+        "id": id,
+        "username": f"user{id}",
+        "acct": f"user{id}@example.com",
+        "url": f"https://example.com/@user{id}",
+        "display_name": f"User {id}",
+        "note": "<p>Hello, I'm a test account</p>",
+        "avatar": f"https://example.com/avatars/{id}.png",
+        "avatar_static": f"https://example.com/avatars/{id}.png",
+        "header": f"https://example.com/headers/{id}.png",
+        "header_static": f"https://example.com/headers/{id}.png",
+        "locked": False,
+        "fields": [],
+        "emojis": [],
+        "bot": False,
+        "group": False,
+        "discoverable": True,
+        "created_at": "2024-01-02T03:04:05.000Z",
+        "last_status_at": "2024-01-02",
+        "statuses_count": 10,
+        "followers_count": 20,
+        "following_count": 30,
+        **kwargs,
+    }
+
+
+def make_status(id: str = "1", **kwargs) -> dict:
+    """Returns status data as received from Mastodon."""
+    return {
+        "id": id,
+        "uri": f"https://example.com/users/user1/statuses/{id}",
+        "url": f"https://example.com/@user1/{id}",
+        "created_at": "2024-01-02T03:04:05.000Z",
+        "account": make_account(),
+        "content": f"<p>Status <b>{id}</b> with <a href=\"https://example.com/\">a link</a></p><p>第二段 👍</p>",
+        "visibility": "public",
+        "sensitive": False,
+        "spoiler_text": "",
+        "media_attachments": [],
+        "application": {"name": "toot", "website": "https://toot.bezdomni.net"},
+        "mentions": [],
+        "tags": [],
+        "emojis": [],
+        "reblogs_count": 1,
+        "favourites_count": 2,
+        "replies_count": 3,
+        "in_reply_to_id": None,
+        "in_reply_to_account_id": None,
+        "reblog": None,
+        "poll": None,
+        "card": None,
+        "language": "en",
+        "edited_at": None,
+        "favourited": False,
+        "reblogged": False,
+        "muted": False,
+        "bookmarked": False,
+        "pinned": False,
+        "filtered": [],
+        **kwargs,
+    }
+
+
+def make_timeline(count: int) -> List[dict]:
+    """Returns `count` statuses, newest first, some of which are reblogs."""
+    statuses = []
+    for n in range(count, 0, -1):
+        status = make_status(str(n), account=make_account(str(n % 5)))
+        if n % 4 == 0:
+            status["reblog"] = make_status(f"{n}0", account=make_account("9"))
+            status["content"] = ""
+        statuses.append(status)
+    return statuses
@@ -2,13 +2,14 @@ import mimetypes
 import re
 import uuid
 
+from concurrent.futures import ThreadPoolExecutor
 from os import path
 from requests import Response
 from typing import BinaryIO, List, Optional
 from urllib.parse import urlparse, urlencode, quote
 
 from toot import App, User, http, CLIENT_NAME, CLIENT_WEBSITE
-from toot.exceptions import ConsoleError
+from toot.exceptions import ConsoleError, NotFoundError
 from toot.utils import drop_empty_values, str_bool, str_bool_nullable
 
 
@@ -19,6 +20,24 @@ def find_account(app, user, account_name):
     if not account_name:
         raise ConsoleError("Empty account name given")
 
+    normalized_name = normalize_account_name(app, account_name)
+
+    response = search(app, user, account_name, type="accounts", resolve=True)
+    for account in http.decode_json(response)["accounts"]:
+        if account["acct"].lower() == normalized_name:
+            return account
+
+    raise ConsoleError("Account not found")
+
+
+def find_accounts(app, user, account_names: List[str], max_workers=4) -> List[dict]:
+    """Find multiple accounts in parallel. Raises if any account is not found."""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda name: find_account(app, user, name), account_names))
+
+
+def normalize_account_name(app, account_name: str) -> str:
+    """Normalize account name so it can be compared to the `acct` field of an account."""
     normalized_name = account_name.lstrip("@").lower()
 
     # Strip @<instance_name> from accounts on the local instance. The `acct`
@@ -30,21 +49,16 @@ def find_account(app, user, account_name):
         if instance == app.instance:
             normalized_name = username
 
-    response = search(app, user, account_name, type="accounts", resolve=True)
-    for account in response.json()["accounts"]:
-        if account["acct"].lower() == normalized_name:
-            return account
-
-    raise ConsoleError("Account not found")
+    return normalized_name
 
 
 def lookup(app, user, acct):
     return http.get(app, user, "/api/v1/accounts/lookup", {"acct": acct})
 
 
-def _account_action(app, user, account, action) -> Response:
+def _account_action(app, user, account, action, data=None) -> Response:
     url = f"/api/v1/accounts/{account}/{action}"
-    return http.post(app, user, url)
+    return http.post(app, user, url, data=data)
 
 
 def _status_action(app, user, status_id, action, data=None) -> Response:
@@ -63,7 +77,7 @@ def _resolve_status_id(app, user, id_or_url) -> str:
     """
     if re.match(r"^https?://", id_or_url):
         response = search(app, user, id_or_url, resolve=True, type="statuses")
-        statuses = response.json().get("statuses")
+        statuses = http.decode_json(response).get("statuses")
 
         if not statuses:
             raise ConsoleError(f"Cannot find status matching URL {id_or_url}")
@@ -91,15 +105,15 @@ def create_app(base_url):
         'website': CLIENT_WEBSITE,
     }
 
-    return http.anon_post(url, json=json).json()
+    return http.decode_json(http.anon_post(url, json=json))
 
 
 def get_muted_accounts(app, user):
-    return http.get(app, user, "/api/v1/mutes").json()
+    return http.decode_json(http.get(app, user, "/api/v1/mutes"))
 
 
 def get_blocked_accounts(app, user):
-    return http.get(app, user, "/api/v1/blocks").json()
+    return http.decode_json(http.get(app, user, "/api/v1/blocks"))
 
 
 def register_account(app, username, email, password, locale="en", agreement=True):
@@ -119,7 +133,7 @@ def register_account(app, username, email, password, locale="en", agreement=True
         "locale": locale
     }
 
-    return http.anon_post(url, json=json, headers=headers).json()
+    return http.decode_json(http.anon_post(url, json=json, headers=headers))
 
 
 def update_account(
@@ -165,7 +179,7 @@ def fetch_app_token(app):
         "scope": "read write"
     }
 
-    return http.anon_post(f"{app.base_url}/oauth/token", json=json).json()
+    return http.decode_json(http.anon_post(f"{app.base_url}/oauth/token", json=json))
 
 
 def login(app: App, username: str, password: str):
@@ -180,7 +194,7 @@ def login(app: App, username: str, password: str):
         'scope': SCOPES,
     }
 
-    return http.anon_post(url, data=data).json()
+    return http.decode_json(http.anon_post(url, data=data))
 
 
 def get_browser_login_url(app: App) -> str:
@@ -204,7 +218,7 @@ def request_access_token(app: App, authorization_code: str):
         'redirect_uri': 'urn:ietf:wg:oauth:2.0:oob',
     }
 
-    return http.anon_post(url, data=data, allow_redirects=False).json()
+    return http.decode_json(http.anon_post(url, data=data, allow_redirects=False))
 
 
 def post_status(
@@ -326,7 +340,7 @@ def scheduled_statuses(app, user):
     List scheduled statuses
     https://docs.joinmastodon.org/methods/scheduled_statuses/#get
     """
-    return http.get(app, user, "/api/v1/scheduled_statuses").json()
+    return http.decode_json(http.get(app, user, "/api/v1/scheduled_statuses"))
 
 
 def delete_status(app, user, status_id):
@@ -383,6 +397,11 @@ def reblogged_by(app, user, status_id) -> Response:
     return http.get(app, user, url)
 
 
+def reblogged_by_generator(app, user, status_id):
+    path = f"/api/v1/statuses/{status_id}/reblogged_by"
+    return _response_list_generator(app, user, path)
+
+
 def get_timeline_generator(
     app: Optional[App],
     user: Optional[User],
@@ -428,26 +447,50 @@ def _timeline_generator(app, user, path, params=None):
 
     while path:
         response = http.get(app, user, path)
-        yield response.json()
+        yield http.decode_json(response)
         path = _get_next_path(response.headers)
 
 
-def _notification_timeline_generator(app, user, path, params=None):
-    for batch in _timeline_generator(app, user, path, params):
-        yield [n["status"] for n in batch if n.get("status")]
-
-
 def _conversation_timeline_generator(app, user, path, params=None):
     for batch in _timeline_generator(app, user, path, params):
         yield [c["last_status"] for c in batch if c.get("last_status")]
 
 
-def home_timeline_generator(app, user, limit=20):
+def home_timeline_generator(app, user, limit=20, max_id=None):
     path = "/api/v1/timelines/home"
-    params = {"limit": limit}
+    params = drop_empty_values({"limit": limit, "max_id": max_id})
     return _timeline_generator(app, user, path, params)
 
 
+def home_timeline_around_generator(app, user, status_id, limit=20):
+    """
+    Yields batches of the home timeline starting at the given status.
+
+    The first batch contains the status itself followed by the page of older
+    statuses, subsequent batches contain older statuses. If the status was
+    deleted, the first batch starts at the next older one. Newer statuses are
+    loaded separately using `home_timeline_newer`.
+    """
+    try:
+        first = [http.decode_json(fetch_status(app, user, status_id))]
+    except NotFoundError:
+        first = []
+
+    generator = home_timeline_generator(app, user, limit=limit, max_id=status_id)
+    yield first + next(generator, [])
+    yield from generator
+
+
+def home_timeline_newer(app, user, min_id, limit=20):
+    """
+    Fetch the page of home timeline statuses immediately newer than `min_id`,
+    newest first.
+    https://docs.joinmastodon.org/methods/timelines/#home
+    """
+    params = {"min_id": min_id, "limit": limit}
+    return http.get(app, user, "/api/v1/timelines/home", params)
+
+
 def public_timeline_generator(app, user, local=False, limit=20):
     path = '/api/v1/timelines/public'
     params = {'local': str_bool(local), 'limit': limit}
@@ -472,11 +515,16 @@ def favourite_timeline_generator(app, user, limit=20):
     return _timeline_generator(app, user, path, params)
 
 
-def notification_timeline_generator(app, user, limit=20):
+def notification_batch_generator(app, user, limit=20):
     # exclude all but mentions and statuses
     exclude_types = ["follow", "favourite", "reblog", "poll", "follow_request"]
     params = {"exclude_types[]": exclude_types, "limit": limit}
-    return _notification_timeline_generator(app, user, "/api/v1/notifications", params)
+    return _timeline_generator(app, user, "/api/v1/notifications", params)
+
+
+def notification_timeline_generator(app, user, limit=20):
+    for batch in notification_batch_generator(app, user, limit):
+        yield [n["status"] for n in batch if n.get("status")]
 
 
 def conversation_timeline_generator(app, user, limit=20):
@@ -509,7 +557,7 @@ def _anon_timeline_generator(url, params=None):
 
     while url:
         response = http.anon_get(url)
-        yield response.json()
+        yield http.decode_json(response)
         url = _get_next_url(response.headers)
 
 
@@ -526,7 +574,7 @@ def anon_tag_timeline_generator(base_url, hashtag, local=False, limit=20):
 
 
 def get_media(app: App, user: User, id: str):
-    return http.get(app, user, f"/api/v1/media/{id}").json()
+    return http.decode_json(http.get(app, user, f"/api/v1/media/{id}"))
 
 
 def upload_media(
@@ -605,8 +653,13 @@ def list_follow_requests(app, user):
     return _get_response_list(app, user, "/api/v1/follow_requests")
 
 
-def follow(app, user, account):
-    return _account_action(app, user, account, 'follow')
+def follow(app, user, account, reblogs=None, notify=None, languages=None):
+    data = drop_empty_values({
+        "reblogs": str_bool_nullable(reblogs),
+        "notify": str_bool_nullable(notify),
+        "languages[]": languages,
+    })
+    return _account_action(app, user, account, 'follow', data)
 
 
 def unfollow(app, user, account):
@@ -621,23 +674,46 @@ def unfollow_tag(app, user, tag_name) -> Response:
     return _tag_action(app, user, tag_name, 'unfollow')
 
 
-def _get_response_list(app, user, path):
-    items = []
+def _get_response_list(app, user, path, stream=False):
+    return list(_response_list_generator(app, user, path, stream=stream))
+
+
+def _response_list_generator(app, user, path, params=None, stream=False):
+    """
+    Yields items from all pages of a paged list. If `stream` is set, responses
+    are streamed so that items are yielded as soon as they are received. This
+    is only worth it for large pages, smaller ones are decoded faster whole.
+    """
     while path:
-        response = http.get(app, user, path)
-        items += response.json()
+        if stream:
+            response = http.get(app, user, path, params, stream=True)
+            yield from http.iter_json_array(response)
+        else:
+            response = http.get(app, user, path, params)
+            yield from http.decode_json(response)
         path = _get_next_path(response.headers)
-    return items
+        # Next page path already contains the query params
+        params = None
 
 
 def following(app, user, account):
     path = f"/api/v1/accounts/{account}/following"
-    return _get_response_list(app, user, path)
+    return _get_response_list(app, user, path, stream=True)
 
 
 def followers(app, user, account):
     path = f"/api/v1/accounts/{account}/followers"
-    return _get_response_list(app, user, path)
+    return _get_response_list(app, user, path, stream=True)
+
+
+def following_generator(app, user, account):
+    path = f"/api/v1/accounts/{account}/following"
+    return _response_list_generator(app, user, path, stream=True)
+
+
+def followers_generator(app, user, account):
+    path = f"/api/v1/accounts/{account}/followers"
+    return _response_list_generator(app, user, path, stream=True)
 
 
 def followed_tags(app, user):
@@ -645,6 +721,11 @@ def followed_tags(app, user):
     return _get_response_list(app, user, path)
 
 
+def followed_tags_generator(app, user):
+    path = '/api/v1/followed_tags'
+    return _response_list_generator(app, user, path)
+
+
 def featured_tags(app, user):
     return http.get(app, user, "/api/v1/featured_tags")
 
@@ -660,7 +741,7 @@ def unfeature_tag(app, user, tag_id: str) -> Response:
 def find_tag(app, user, tag) -> Optional[dict]:
     """Find a hashtag by tag name or ID"""
     tag = tag.lstrip("#")
-    results = search(app, user, tag, type="hashtags").json()
+    results = http.decode_json(search(app, user, tag, type="hashtags"))
 
     return next(
         (
@@ -675,7 +756,7 @@ def find_featured_tag(app, user, tag) -> Optional[dict]:
     """Find a featured tag by tag name or ID"""
     return next(
         (
-            t for t in featured_tags(app, user).json()
+            t for t in http.decode_json(featured_tags(app, user))
             if t["name"].lower() == tag.lstrip("#").lower() or t["id"] == tag
         ),
         None
@@ -683,22 +764,28 @@ def find_featured_tag(app, user, tag) -> Optional[dict]:
 
 
 def whois(app, user, account):
-    return http.get(app, user, f'/api/v1/accounts/{account}').json()
+    return http.decode_json(http.get(app, user, f'/api/v1/accounts/{account}'))
 
 
 def vote(app, user, poll_id, choices: List[int]):
     url = f"/api/v1/polls/{poll_id}/votes"
     json = {'choices': choices}
-    return http.post(app, user, url, json=json).json()
+    return http.decode_json(http.post(app, user, url, json=json))
 
 
 def get_relationship(app, user, account):
     params = {"id[]": account}
-    return http.get(app, user, '/api/v1/accounts/relationships', params).json()[0]
+    return http.decode_json(http.get(app, user, '/api/v1/accounts/relationships', params))[0]
+
+
+def get_relationships(app, user, account_ids: List[str]):
+    params = {"id[]": account_ids}
+    return http.decode_json(http.get(app, user, '/api/v1/accounts/relationships', params))
 
 
-def mute(app, user, account):
-    return _account_action(app, user, account, 'mute')
+def mute(app, user, account, notifications=None):
+    data = drop_empty_values({"notifications": str_bool_nullable(notifications)})
+    return _account_action(app, user, account, 'mute', data)
 
 
 def unmute(app, user, account):
@@ -730,10 +817,108 @@ def get_notifications(app, user, types=[], exclude_types=[], limit=20) -> Respon
     return http.get(app, user, '/api/v1/notifications', params)
 
 
+def notifications_generator(app, user, types=[], exclude_types=[], limit=None):
+    params = {"types[]": types, "exclude_types[]": exclude_types, "limit": limit}
+    # Notifications embed statuses, so pages are large enough to stream
+    return _response_list_generator(app, user, '/api/v1/notifications', params, stream=True)
+
+
+def get_grouped_notifications(
+    app,
+    user,
+    types=[],
+    exclude_types=[],
+    limit=None,
+    since_id=None,
+    max_id=None,
+) -> Response:
+    """
+    Fetch a page of grouped notifications.
+    https://docs.joinmastodon.org/methods/grouped_notifications/#get-grouped
+    """
+    params = drop_empty_values({
+        "types[]": types,
+        "exclude_types[]": exclude_types,
+        "limit": limit,
+        "since_id": since_id,
+        "max_id": max_id,
+    })
+    return http.get(app, user, "/api/v2/notifications", params)
+
+
+def grouped_notifications(app, user, types=[], exclude_types=[], limit=None, since_id=None):
+    """
+    Fetch grouped notifications, merged into a single GroupedNotificationsResults dict.
+
+    If `since_id` is given, fetches all pages of notifications newer than it,
+    otherwise fetches a single page.
+    """
+    def _pages():
+        max_id = None
+        while True:
+            response = get_grouped_notifications(app, user, types, exclude_types, limit, since_id, max_id)
+            page = http.decode_json(response)
+            yield page
+
+            groups = page["notification_groups"]
+            if not since_id or not groups:
+                break
+
+            last = groups[-1]
+            max_id = last.get("page_min_id") or last["most_recent_notification_id"]
+
+    return merge_grouped_notifications(_pages())
+
+
+def merge_grouped_notifications(pages) -> dict:
+    """
+    Merge pages of grouped notifications, deduplicating included accounts and
+    statuses by ID and notification groups by group key.
+    """
+    accounts = {}
+    statuses = {}
+    groups = {}
+
+    for page in pages:
+        for account in page.get("accounts", []):
+            accounts.setdefault(account["id"], account)
+        for status in page.get("statuses", []):
+            statuses.setdefault(status["id"], status)
+        for group in page.get("notification_groups", []):
+            groups.setdefault(group["group_key"], group)
+
+    return {
+        "accounts": list(accounts.values()),
+        "statuses": list(statuses.values()),
+        "notification_groups": list(groups.values()),
+    }
+
+
 def clear_notifications(app, user):
     http.post(app, user, '/api/v1/notifications/clear')
 
 
+def get_markers(app, user, timelines: List[str]) -> Response:
+    """
+    Fetch saved read positions for the given timelines.
+    https://docs.joinmastodon.org/methods/markers/#get
+    """
+    params = {"timeline[]": timelines}
+    return http.get(app, user, "/api/v1/markers", params)
+
+
+def save_markers(app, user, home: Optional[str] = None, notifications: Optional[str] = None) -> Response:
+    """
+    Save read positions for the home and/or notifications timelines.
+    https://docs.joinmastodon.org/methods/markers/#create
+    """
+    data = drop_empty_values({
+        "home[last_read_id]": home,
+        "notifications[last_read_id]": notifications,
+    })
+    return http.post(app, user, "/api/v1/markers", data=data)
+
+
 def get_instance(base_url: str) -> Response:
     url = f"{base_url}/api/v1/instance"
     return http.anon_get(url)
@@ -744,7 +929,7 @@ def get_preferences(app, user) -> Response:
 
 
 def get_lists(app, user):
-    return http.get(app, user, "/api/v1/lists").json()
+    return http.decode_json(http.get(app, user, "/api/v1/lists"))
 
 
 def get_poll(app, user, poll_id) -> Response:
@@ -761,6 +946,11 @@ def get_list_accounts(app, user, list_id):
     return _get_response_list(app, user, path)
 
 
+def list_accounts_generator(app, user, list_id):
+    path = f"/api/v1/lists/{list_id}/accounts"
+    return _response_list_generator(app, user, path)
+
+
 def create_list(app, user, title, replies_policy="none"):
     url = "/api/v1/lists"
     json = {'title': title}
@@ -773,6 +963,10 @@ def delete_list(app, user, id):
     return http.delete(app, user, f"/api/v1/lists/{id}")
 
 
+# Maximum number of accounts to add to or remove from a list in one request
+LIST_ACCOUNTS_BATCH_SIZE = 40
+
+
 def add_accounts_to_list(app, user, list_id, account_ids):
     url = f"/api/v1/lists/{list_id}/accounts"
     json = {'account_ids': account_ids}
@@ -1,4 +1,4 @@
-from toot import api, config, User, App
+from toot import api, config, http, User, App
 from toot.entities import from_dict, Instance
 from toot.exceptions import ApiError, ConsoleError
 from urllib.parse import urlparse
@@ -6,7 +6,7 @@ from urllib.parse import urlparse
 
 def find_instance(base_url: str) -> Instance:
     try:
-        instance = api.get_instance(base_url).json()
+        instance = http.decode_json(api.get_instance(base_url))
         return from_dict(Instance, instance)
     except ApiError:
         raise ConsoleError(f"Instance not found at {base_url}")
@@ -33,7 +33,7 @@ def get_or_create_app(base_url: str) -> App:
 def create_user(app: App, access_token: str) -> User:
     # Username is not yet known at this point, so fetch it from Mastodon
     user = User(app.instance, None, access_token)
-    creds = api.verify_credentials(app, user).json()
+    creds = http.decode_json(api.verify_credentials(app, user))
 
     user = User(app.instance, creds["username"], access_token)
     config.save_user(user, activate=True)
@@ -1,11 +1,16 @@
+import hashlib
 import os
 import sys
+import threading
 
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Hashable, Optional, Tuple, TypeVar
 
 from toot import App, User
 
+T = TypeVar("T")
+
 CACHE_SUBFOLDER = "toot"
 
 
@@ -59,3 +64,53 @@ def _cache_dir_path() -> Path:
         return Path(os.environ["XDG_CACHE_HOME"], CACHE_SUBFOLDER)
 
     return Path.home() / ".cache" / CACHE_SUBFOLDER
+
+
+class RenderCache:
+    """
+    Bounded in-memory cache of rendered content.
+
+    Items are keyed by the renderer name, a hash of the rendered content and
+    any options which affect the output, such as width. When the cache is full
+    the least recently used item is evicted.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        assert max_size > 0
+        self.max_size = max_size
+        self._items: "OrderedDict[Tuple[Hashable, ...], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, name: str, content: str, render: Callable[[], T], *options: Hashable) -> T:
+        """
+        Returns the cached result of rendering `content`, calling `render` to
+        produce it if not cached.
+        """
+        digest = hashlib.blake2b(content.encode(), digest_size=16).digest()
+        key = (name, digest, *options)
+
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+
+        value = render()
+
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+render_cache = RenderCache()
+"""Cache shared by the CLI and TUI content renderers."""
@@ -9,8 +9,10 @@ from click.types import StringParamType
 from functools import wraps
 
 from toot import App, User, config, __version__
+from toot.entities import Status
 from toot.output import print_warning
 from toot.settings import get_settings
+from toot.template import compile_template
 
 if t.TYPE_CHECKING:
     import typing_extensions as te
@@ -166,6 +168,56 @@ json_option = click.option(
 )
 
 
+def _split_fields(ctx: click.Context, param: click.Parameter, value: t.Optional[str]) -> t.Optional[t.List[str]]:
+    if value is None:
+        return None
+
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    if not fields:
+        raise click.BadParameter("Expected a comma separated list of fields")
+
+    return fields
+
+
+fields_option = click.option(
+    "--fields",
+    callback=_split_fields,
+    help="""Print only the given comma separated fields, one line per item with
+         values separated by tabs. Nested fields are given as dotted paths,
+         e.g. 'id,account.acct,url'.""",
+)
+
+
+def _compile_status_template(ctx: click.Context, param: click.Parameter, value: t.Optional[str]):
+    if value is None:
+        return None
+
+    try:
+        return compile_template(value, Status)
+    except ValueError as ex:
+        raise click.BadParameter(str(ex))
+
+
+template_option = click.option(
+    "--template",
+    callback=_compile_status_template,
+    help="""Print each status on one line using the given template, e.g.
+         '{id} {account.acct} {created_at:%H:%M} {content:text:80}'. Fields are
+         dotted paths, optionally followed by filters: 'text' converts HTML to
+         plain text, a number truncates to that width. A trailing format spec,
+         such as a date format, is passed to format().""",
+)
+
+format_option = click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["ndjson", "csv", "tsv"]),
+    help="""Print records in the given format, one per line, as they are
+         received. CSV and TSV columns can be chosen using --fields where
+         supported.""",
+)
+
+
 @click.group(context_settings=CONTEXT)
 @click.option("-w", "--max-width", type=int, default=80, help="Maximum width for content rendered by toot")
 @click.option("--debug/--no-debug", default=False, help="Log debug info to stderr")
@@ -188,6 +240,7 @@ from toot.cli import accounts  # noqa
 from toot.cli import auth  # noqa
 from toot.cli import diag  # noqa
 from toot.cli import follow_requests  # noqa
+from toot.cli import imports  # noqa
 from toot.cli import lists  # noqa
 from toot.cli import polls  # noqa
 from toot.cli import post  # noqa
@@ -5,9 +5,10 @@ from copy import copy
 from typing import BinaryIO, Optional
 
 from toot import api
-from toot.cli import PRIVACY_CHOICES, cli, json_option, Context, pass_context
+from toot.cli import PRIVACY_CHOICES, cli, format_option, json_option, Context, pass_context
 from toot.cli.validators import validate_language
-from toot.output import print_acct_list
+from toot.entities import Account
+from toot.output import print_acct_list, print_records
 
 
 @cli.command()
@@ -144,35 +145,45 @@ def unfollow(ctx: Context, account: str, json: bool):
 @cli.command()
 @click.argument("account", required=False)
 @json_option
+@format_option
 @pass_context
-def following(ctx: Context, account: Optional[str], json: bool):
+def following(ctx: Context, account: Optional[str], json: bool, output_format: Optional[str]):
     """List accounts followed by an account.
 
     If no account is given list accounts followed by you.
     """
     account = account or ctx.user.username
     found_account = api.find_account(ctx.app, ctx.user, account)
-    accounts = api.following(ctx.app, ctx.user, found_account["id"])
     if json:
+        accounts = api.following(ctx.app, ctx.user, found_account["id"])
         click.echo(pyjson.dumps(accounts))
+    elif output_format:
+        accounts = api.following_generator(ctx.app, ctx.user, found_account["id"])
+        print_records(accounts, Account, output_format)
     else:
+        accounts = api.following_generator(ctx.app, ctx.user, found_account["id"])
         print_acct_list(accounts)
 
 
 @cli.command()
 @click.argument("account", required=False)
 @json_option
+@format_option
 @pass_context
-def followers(ctx: Context, account: Optional[str], json: bool):
+def followers(ctx: Context, account: Optional[str], json: bool, output_format: Optional[str]):
     """List accounts following an account.
 
     If no account given list accounts following you."""
     account = account or ctx.user.username
     found_account = api.find_account(ctx.app, ctx.user, account)
-    accounts = api.followers(ctx.app, ctx.user, found_account["id"])
     if json:
+        accounts = api.followers(ctx.app, ctx.user, found_account["id"])
         click.echo(pyjson.dumps(accounts))
+    elif output_format:
+        accounts = api.followers_generator(ctx.app, ctx.user, found_account["id"])
+        print_records(accounts, Account, output_format)
     else:
+        accounts = api.followers_generator(ctx.app, ctx.user, found_account["id"])
         print_acct_list(accounts)
 
 
@@ -5,7 +5,7 @@ from typing import Optional
 
 import click
 
-from toot import __version__, api, config, settings
+from toot import __version__, api, config, http, settings
 from toot.cli import cli
 from toot.entities import Instance, from_dict
 from toot.output import bold, yellow
@@ -50,7 +50,7 @@ def print_diag(files: bool, server: bool):
         _, app = config.get_active_user_app()
         if app:
             response = api.get_instance(app.base_url)
-            instance = from_dict(Instance, response.json())
+            instance = from_dict(Instance, http.decode_json(response))
 
     click.echo("## Toot Diagnostics")
     print_environment()
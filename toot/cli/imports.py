@@ -0,0 +1,233 @@
+import csv
+import click
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Set, Union
+
+from toot import api, http
+from toot.cli import Context, cli, pass_context
+from toot.exceptions import ApiError, ConsoleError, NotFoundError
+from toot.output import print_warning
+from toot.utils import batched
+
+# Maximum number of account IDs per relationships request
+RELATIONSHIPS_BATCH_SIZE = 40
+
+# Header of the first column in CSV files exported by Mastodon
+ACCOUNT_ADDRESS = "Account address"
+
+Row = Dict[str, str]
+Action = Callable[[Context, str, Row], None]
+
+
+def import_options(func):
+    @click.argument("file", type=click.Path(exists=True, dir_okay=False))
+    @click.option(
+        "-j",
+        "--concurrency",
+        type=click.IntRange(1, 16),
+        default=4,
+        help="Number of requests to run in parallel",
+    )
+    @click.option(
+        "--progress-file",
+        type=click.Path(dir_okay=False),
+        help="""File in which to log processed accounts, used to resume an
+             interrupted import. [default: FILE.progress]""",
+    )
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+@cli.group(name="import")
+def import_group():
+    """Import follows, mutes and blocks from CSV files exported by Mastodon"""
+
+
+@import_group.command()
+@import_options
+@pass_context
+def follows(ctx: Context, file: str, concurrency: int, progress_file: Optional[str]):
+    """Follow accounts listed in a CSV file.
+
+    FILE is a list of follows exported from Mastodon (following_accounts.csv).
+    """
+    _import(ctx, file, progress_file, concurrency, ["following", "requested"], _follow)
+    click.secho("✓ Follows imported", fg="green")
+
+
+@import_group.command()
+@import_options
+@pass_context
+def mutes(ctx: Context, file: str, concurrency: int, progress_file: Optional[str]):
+    """Mute accounts listed in a CSV file.
+
+    FILE is a list of mutes exported from Mastodon (mutes.csv).
+    """
+    _import(ctx, file, progress_file, concurrency, ["muting"], _mute)
+    click.secho("✓ Mutes imported", fg="green")
+
+
+@import_group.command()
+@import_options
+@pass_context
+def blocks(ctx: Context, file: str, concurrency: int, progress_file: Optional[str]):
+    """Block accounts listed in a CSV file.
+
+    FILE is a list of blocks exported from Mastodon (blocked_accounts.csv).
+    """
+    _import(ctx, file, progress_file, concurrency, ["blocking"], _block)
+    click.secho("✓ Blocks imported", fg="green")
+
+
+def _follow(ctx: Context, account_id: str, row: Row):
+    languages = row.get("Languages")
+    api.follow(
+        ctx.app,
+        ctx.user,
+        account_id,
+        reblogs=_parse_bool(row.get("Show boosts")),
+        notify=_parse_bool(row.get("Notify on new posts")),
+        languages=[lang.strip() for lang in languages.split(",") if lang.strip()] if languages else None,
+    )
+
+
+def _mute(ctx: Context, account_id: str, row: Row):
+    notifications = _parse_bool(row.get("Hide notifications"))
+    api.mute(ctx.app, ctx.user, account_id, notifications=notifications)
+
+
+def _block(ctx: Context, account_id: str, row: Row):
+    api.block(ctx.app, ctx.user, account_id)
+
+
+def _import(
+    ctx: Context,
+    path: str,
+    progress_path: Optional[str],
+    concurrency: int,
+    relationships: List[str],
+    action: Action,
+):
+    """
+    Apply `action` to accounts listed in the CSV file at `path`.
+
+    Accounts are resolved and acted on in parallel, in batches. Accounts which
+    already have any of the given `relationships` are skipped. Processed
+    accounts are logged to the progress file so that an interrupted import can
+    be resumed by running it again.
+    """
+    progress_path = progress_path or f"{path}.progress"
+    done = _read_progress(progress_path)
+    rows = [row for row in _read_csv(path) if row[ACCOUNT_ADDRESS] not in done]
+
+    if done:
+        click.echo(f"Resuming import, {len(done)} accounts already processed")
+
+    def _resolve(row: Row) -> Union[str, Exception, None]:
+        """Returns the account ID, None if not found, or the error if the
+        lookup failed for another reason, e.g. rate limiting."""
+        acct = row[ACCOUNT_ADDRESS]
+        try:
+            return http.decode_json(api.lookup(ctx.app, ctx.user, acct))["id"]
+        except NotFoundError:
+            pass
+        except ApiError as ex:
+            return ex
+
+        try:
+            return api.find_account(ctx.app, ctx.user, acct)["id"]
+        except ConsoleError:
+            return None
+        except ApiError as ex:
+            return ex
+
+    def _act(args) -> Optional[Exception]:
+        account_id, row = args
+        try:
+            action(ctx, account_id, row)
+        except click.ClickException as ex:
+            return ex
+
+    count = len(rows)
+    processed = 0
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor, open(progress_path, "a") as progress:
+        for batch in batched(rows, RELATIONSHIPS_BATCH_SIZE):
+            resolved = {}
+            for row, result in zip(batch, executor.map(_resolve, batch)):
+                acct = row[ACCOUNT_ADDRESS]
+                if isinstance(result, Exception):
+                    print_warning(f"Failed importing {acct}: {result.message}")
+                elif result is None:
+                    print_warning(f"Account not found: {acct}")
+                else:
+                    resolved[result] = row
+
+            try:
+                existing = _existing_relationships(ctx, list(resolved.keys()), relationships)
+            except ApiError as ex:
+                # Not fatal, importing is idempotent
+                print_warning(f"Failed loading relationships: {ex.message}")
+                existing = set()
+            pending = [(id, row) for id, row in resolved.items() if id not in existing]
+
+            for id in existing:
+                progress.write(f"{resolved[id][ACCOUNT_ADDRESS]}\n")
+
+            for (_, row), error in zip(pending, executor.map(_act, pending)):
+                acct = row[ACCOUNT_ADDRESS]
+                if error:
+                    print_warning(f"Failed importing {acct}: {error.message}")
+                else:
+                    progress.write(f"{acct}\n")
+
+            progress.flush()
+            processed += len(batch)
+            click.echo(f"Processed {processed}/{count} accounts ({len(existing)} skipped in batch)")
+
+
+def _existing_relationships(ctx: Context, account_ids: List[str], relationships: List[str]) -> Set[str]:
+    """Returns IDs of accounts which have any of the given relationships."""
+    if not account_ids:
+        return set()
+
+    return {
+        relationship["id"]
+        for relationship in api.get_relationships(ctx.app, ctx.user, account_ids)
+        if any(relationship.get(name) for name in relationships)
+    }
+
+
+def _read_csv(path: str) -> List[Row]:
+    """
+    Read a list of accounts exported from Mastodon. Files may contain a header
+    row (follows and mutes) or just a list of accounts (blocks).
+    """
+    with open(path, newline="") as f:
+        rows = [row for row in csv.reader(f) if row and row[0].strip()]
+
+    if rows and rows[0][0] == ACCOUNT_ADDRESS:
+        header, rows = rows[0], rows[1:]
+    else:
+        header = [ACCOUNT_ADDRESS]
+
+    return [dict(zip(header, [cell.strip() for cell in row])) for row in rows]
+
+
+def _read_progress(path: str) -> Set[str]:
+    try:
+        with open(path) as f:
+            return {line.strip() for line in f if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+
+def _parse_bool(value: Optional[str]) -> Optional[bool]:
+    if not value:
+        return None
+    return value.strip().lower() == "true"
@@ -1,12 +1,14 @@
 import json as pyjson
-from typing import Optional
+from typing import List as TList, NamedTuple, Optional, Tuple
 
 import click
+from requests import Response
 
-from toot import api
-from toot.cli import Context, cli, json_option, pass_context
-from toot.entities import List, from_dict_list
-from toot.output import print_list_accounts, print_lists, print_warning
+from toot import api, http
+from toot.cli import Context, cli, format_option, json_option, pass_context
+from toot.entities import Account, List, from_dict_list
+from toot.output import print_list_accounts, print_lists, print_records, print_warning
+from toot.utils import batched
 
 
 @cli.group()
@@ -36,16 +38,23 @@ def list(ctx: Context, json: bool):
 @click.argument("title", required=False)
 @click.option("--id", help="List ID if not title is given")
 @json_option
+@format_option
 @pass_context
-def accounts(ctx: Context, title: str, id: Optional[str], json: bool):
+def accounts(ctx: Context, title: str, id: Optional[str], json: bool, output_format: Optional[str]):
     """List the accounts in a list"""
     list_id = get_list_id(ctx, title, id)
-    response = api.get_list_accounts(ctx.app, ctx.user, list_id)
+
+    if output_format:
+        accounts = api.list_accounts_generator(ctx.app, ctx.user, list_id)
+        print_records(accounts, Account, output_format)
+        return
 
     if json:
+        response = api.get_list_accounts(ctx.app, ctx.user, list_id)
         click.echo(pyjson.dumps(response))
     else:
-        print_list_accounts(response)
+        accounts = api.list_accounts_generator(ctx.app, ctx.user, list_id)
+        print_list_accounts(accounts)
 
 
 @lists.command()
@@ -84,52 +93,258 @@ def delete(ctx: Context, title: str, id: Optional[str], json: bool):
 
 @lists.command()
 @click.argument("title", required=False)
-@click.argument("account")
+@click.argument("accounts", nargs=-1)
 @click.option("--id", help="List ID if not title is given")
 @json_option
 @pass_context
-def add(ctx: Context, title: str, account: str, id: Optional[str], json: bool):
-    """Add an account to a list"""
+def add(ctx: Context, title: str, accounts: Tuple[str, ...], id: Optional[str], json: bool):
+    """Add accounts to a list
+
+    Multiple accounts can be given. If no accounts are given, or the account
+    is "-", account names are read from stdin, one per line.
+
+    Accounts are added in batches of 40. With --json, the server response is
+    printed if there is one batch, otherwise a list of batch results.
+    """
+    title, accounts = _shift_title(title, accounts, id)
     list_id = get_list_id(ctx, title, id)
-    found_account = api.find_account(ctx.app, ctx.user, account)
+    names = _read_account_names(accounts)
+    found_accounts = api.find_accounts(ctx.app, ctx.user, names)
 
-    try:
-        response = api.add_accounts_to_list(ctx.app, ctx.user, list_id, [found_account["id"]])
-        if json:
-            click.echo(response.text)
-        else:
-            click.secho(f"✓ Added account \"{account}\"", fg="green")
-    except Exception:
-        # TODO: this is slow, improve
-        # if we failed to add the account, try to give a
-        # more specific error message than "record not found"
-        my_accounts = api.followers(ctx.app, ctx.user, found_account["id"])
-        found = False
-        if my_accounts:
-            for my_account in my_accounts:
-                if my_account["id"] == found_account["id"]:
-                    found = True
-                    break
-        if found is False:
-            raise click.ClickException(f"You must follow @{account} before adding this account to a list.")
-        raise
+    results = _batch_add(ctx, list_id, [a["id"] for a in found_accounts])
+    _report_batches(ctx, results, found_accounts, "added", json, check_following=True)
+
+    if json:
+        return
+    elif len(names) == 1:
+        click.secho(f"✓ Added account \"{names[0]}\"", fg="green")
+    else:
+        click.secho(f"✓ Added {len(names)} accounts", fg="green")
 
 
 @lists.command()
 @click.argument("title", required=False)
-@click.argument("account")
+@click.argument("accounts", nargs=-1)
 @click.option("--id", help="List ID if not title is given")
 @json_option
 @pass_context
-def remove(ctx: Context, title: str, account: str, id: Optional[str], json: bool):
-    """Remove an account from a list"""
+def remove(ctx: Context, title: str, accounts: Tuple[str, ...], id: Optional[str], json: bool):
+    """Remove accounts from a list
+
+    Multiple accounts can be given. If no accounts are given, or the account
+    is "-", account names are read from stdin, one per line.
+
+    Accounts are removed in batches of 40. With --json, the server response is
+    printed if there is one batch, otherwise a list of batch results.
+    """
+    title, accounts = _shift_title(title, accounts, id)
     list_id = get_list_id(ctx, title, id)
-    found_account = api.find_account(ctx.app, ctx.user, account)
-    response = api.remove_accounts_from_list(ctx.app, ctx.user, list_id, [found_account["id"]])
+    names = _read_account_names(accounts)
+    found_accounts = api.find_accounts(ctx.app, ctx.user, names)
+    results = _batch_remove(ctx, list_id, [a["id"] for a in found_accounts])
+    _report_batches(ctx, results, found_accounts, "removed", json)
+
     if json:
-        click.echo(response.text)
+        return
+    elif len(names) == 1:
+        click.secho(f"✓ Removed account \"{names[0]}\"", fg="green")
     else:
-        click.secho(f"✓ Removed account \"{account}\"", fg="green")
+        click.secho(f"✓ Removed {len(names)} accounts", fg="green")
+
+
+@lists.command()
+@click.argument("title", required=False)
+@click.argument("accounts", nargs=-1)
+@click.option("--id", help="List ID if not title is given")
+@click.option("--dry-run", is_flag=True, help="Show the changes without applying them")
+@click.option("--allow-empty", is_flag=True, help="Allow removing all accounts from the list")
+@pass_context
+def sync(
+    ctx: Context,
+    title: str,
+    accounts: Tuple[str, ...],
+    id: Optional[str],
+    dry_run: bool,
+    allow_empty: bool,
+):
+    """Make list members match the given accounts
+
+    Adds the given accounts which are not in the list and removes list members
+    which are not given. If no accounts are given, or the account is "-",
+    account names are read from stdin, one per line.
+
+    To remove all accounts from the list, pass "-" and an empty stdin, or use
+    --allow-empty.
+    """
+    title, accounts = _shift_title(title, accounts, id)
+    list_id = get_list_id(ctx, title, id)
+    names = _read_account_names(accounts, allow_empty=allow_empty or accounts == ("-",))
+    current = api.get_list_accounts(ctx.app, ctx.user, list_id)
+
+    # Only look up accounts which are not already list members
+    current_by_acct = {a["acct"].lower(): a for a in current}
+    desired = {}
+    unresolved = []
+    for name in names:
+        account = current_by_acct.get(api.normalize_account_name(ctx.app, name))
+        if account:
+            desired[account["id"]] = account
+        else:
+            unresolved.append(name)
+
+    for account in api.find_accounts(ctx.app, ctx.user, unresolved):
+        desired[account["id"]] = account
+
+    current_ids = {a["id"] for a in current}
+    to_add = [a for id, a in desired.items() if id not in current_ids]
+    to_remove = [a for a in current if a["id"] not in desired]
+
+    for account in to_add:
+        click.echo(f"+ @{account['acct']}")
+    for account in to_remove:
+        click.echo(f"- @{account['acct']}")
+
+    if dry_run:
+        click.secho(f"Would add {len(to_add)} and remove {len(to_remove)} accounts", fg="yellow")
+        return
+
+    if to_add:
+        results = _batch_add(ctx, list_id, [a["id"] for a in to_add])
+        _report_batches(ctx, results, to_add, "added", check_following=True)
+
+    if to_remove:
+        results = _batch_remove(ctx, list_id, [a["id"] for a in to_remove])
+        _report_batches(ctx, results, to_remove, "removed")
+
+    click.secho(f"✓ Added {len(to_add)} and removed {len(to_remove)} accounts", fg="green")
+
+
+def _shift_title(title: Optional[str], accounts: Tuple[str, ...], list_id: Optional[str]):
+    """When the list is given by --id, the title argument holds the first account."""
+    if list_id and title:
+        return None, (title,) + accounts
+    return title, accounts
+
+
+def _read_account_names(accounts: Tuple[str, ...], allow_empty: bool = False) -> TList[str]:
+    """
+    Returns account names given as arguments, or read from stdin if none are
+    given or the account is "-". Raises an error if there are no accounts,
+    unless `allow_empty` is set.
+    """
+    if not accounts or accounts == ("-",):
+        stdin = click.get_text_stream("stdin")
+        if not stdin.isatty():
+            accounts = tuple(stdin.read().split())
+        elif accounts or not allow_empty:
+            raise click.ClickException("Please specify at least one account")
+
+    # Drop duplicates, keep order
+    names = [name for name in dict.fromkeys(a.strip() for a in accounts) if name]
+
+    if not names and not allow_empty:
+        raise click.ClickException("Please specify at least one account")
+
+    return names
+
+
+class BatchResult(NamedTuple):
+    """Outcome of adding or removing one batch of list accounts."""
+    account_ids: TList[str]
+    response: Optional[Response] = None
+    error: Optional[click.ClickException] = None
+
+
+def _batch_add(ctx: Context, list_id: str, account_ids: TList[str]) -> TList[BatchResult]:
+    return _apply_batches(api.add_accounts_to_list, ctx, list_id, account_ids)
+
+
+def _batch_remove(ctx: Context, list_id: str, account_ids: TList[str]) -> TList[BatchResult]:
+    return _apply_batches(api.remove_accounts_from_list, ctx, list_id, account_ids)
+
+
+def _apply_batches(action, ctx: Context, list_id: str, account_ids: TList[str]) -> TList[BatchResult]:
+    """
+    Apply `action` to the accounts in batches, as large as the API allows.
+    Batches are not applied atomically, so a failed batch does not stop the
+    remaining ones from being applied.
+    """
+    results = []
+    for batch in batched(account_ids, api.LIST_ACCOUNTS_BATCH_SIZE):
+        try:
+            response = action(ctx.app, ctx.user, list_id, batch)
+            results.append(BatchResult(batch, response=response))
+        except click.ClickException as ex:
+            results.append(BatchResult(batch, error=ex))
+    return results
+
+
+def _report_batches(
+    ctx: Context,
+    results: TList[BatchResult],
+    accounts: TList[dict],
+    verb: str,
+    json: bool = False,
+    check_following: bool = False,
+):
+    """
+    Print the outcome of each batch if there is more than one. When printing
+    JSON, prints the server response if there is a single batch, otherwise the
+    results of all batches. Raises an error if any of the batches failed.
+    """
+    if json and len(results) == 1:
+        if results[0].response is not None:
+            click.echo(results[0].response.text)
+    elif json:
+        click.echo(pyjson.dumps([_batch_result_json(result) for result in results]))
+    elif len(results) > 1:
+        for n, result in enumerate(results, start=1):
+            count = len(result.account_ids)
+            if result.error:
+                print_warning(f"Batch {n}/{len(results)} failed, {count} accounts not {verb}: {result.error.message}")
+            else:
+                click.echo(f"Batch {n}/{len(results)}: {count} accounts {verb}")
+
+    failed = [result for result in results if result.error]
+    if not failed:
+        return
+
+    if check_following:
+        # Try to give a more specific error message than "record not found"
+        failed_ids = {id for result in failed for id in result.account_ids}
+        failed_accounts = [a for a in accounts if a["id"] in failed_ids]
+        _check_following(ctx, [a["acct"] for a in failed_accounts], failed_accounts)
+
+    if len(results) == 1:
+        raise failed[0].error
+
+    applied = sum(len(result.account_ids) for result in results if not result.error)
+    raise click.ClickException(
+        f"{len(failed)} of {len(results)} batches failed, {applied} accounts were {verb}"
+    )
+
+
+def _batch_result_json(result: BatchResult) -> dict:
+    if result.error:
+        return {"account_ids": result.account_ids, "error": result.error.message}
+    return {"account_ids": result.account_ids, "response": http.decode_json(result.response)}
+
+
+def _check_following(ctx: Context, names: TList[str], accounts: TList[dict]):
+    """Raise an error if any of the given accounts is not followed."""
+    not_followed = []
+    for batch in batched(zip(names, accounts), api.LIST_ACCOUNTS_BATCH_SIZE):
+        account_ids = [account["id"] for _, account in batch]
+        relationships = api.get_relationships(ctx.app, ctx.user, account_ids)
+        following = {r["id"] for r in relationships if r["following"]}
+        not_followed += [f"@{name}" for name, account in batch if account["id"] not in following]
+
+    if len(not_followed) == 1:
+        raise click.ClickException(f"You must follow {not_followed[0]} before adding this account to a list.")
+    if not_followed:
+        raise click.ClickException(
+            f"You must follow {', '.join(not_followed)} before adding these accounts to a list."
+        )
 
 
 # -- Deprecated commands -------------------------------------------------------
@@ -6,7 +6,7 @@ from datetime import datetime, timedelta, timezone
 from time import sleep, time
 from typing import BinaryIO, Optional, Tuple
 
-from toot import api, config
+from toot import api, config, http
 from toot.cache import get_last_post_id, save_last_post_id
 from toot.cli import AccountParamType, cli, json_option, pass_context, Context
 from toot.cli import DURATION_EXAMPLES, VISIBILITY_CHOICES
@@ -183,7 +183,7 @@ def post(
         poll_hide_totals=poll_hide_totals,
     )
 
-    status = response.json()
+    status = http.decode_json(response)
 
     if json:
         click.echo(response.text)
@@ -222,7 +222,7 @@ def upload(
     if json:
         click.echo(response.text)
     else:
-        media = from_dict(MediaAttachment, response.json())
+        media = from_dict(MediaAttachment, http.decode_json(response))
         click.echo()
         click.echo(f"Successfully uploaded media ID {media.id}, type '{media.type}'")
         click.echo(f"URL: {media.url}")
@@ -281,7 +281,7 @@ def _upload_media(app, user, media, descriptions, thumbnails):
     for idx, file in enumerate(media):
         description = descriptions[idx].strip() if idx < len(descriptions) else None
         thumbnail = thumbnails[idx] if idx < len(thumbnails) else None
-        result = _do_upload(app, user, file, description, thumbnail).json()
+        result = http.decode_json(_do_upload(app, user, file, description, thumbnail))
         uploaded_media.append(result)
 
     _wait_until_all_processed(app, user, uploaded_media)
@@ -2,14 +2,17 @@ import click
 import json as pyjson
 
 from itertools import chain
-from typing import Optional
+from typing import List, Optional
 
-from toot import api
+from toot import api, http
 from toot.cli.validators import validate_instance
-from toot.entities import Instance, Status, from_dict, Account
+from toot.entities import Account, Instance, Status, Tag, from_dict, interning, validate_fields
 from toot.exceptions import ApiError, ConsoleError
-from toot.output import print_account, print_instance, print_search_results, print_status, print_timeline
-from toot.cli import InstanceParamType, cli, get_context, json_option, pass_context, Context
+from toot.output import print_account, print_fields, print_instance, print_records, print_search_results, print_status
+from toot.output import print_lines, print_timeline
+from toot.template import Template
+from toot.cli import InstanceParamType, cli, get_context, pass_context, Context
+from toot.cli import fields_option, format_option, json_option, template_option
 
 
 @cli.command()
@@ -22,7 +25,7 @@ def whoami(ctx: Context, json: bool):
     if json:
         click.echo(response.text)
     else:
-        account = from_dict(Account, response.json())
+        account = from_dict(Account, http.decode_json(response))
         print_account(account)
 
 
@@ -69,7 +72,14 @@ def instance(instance: Optional[str], json: bool):
     if json:
         click.echo(response.text)
     else:
-        print_instance(from_dict(Instance, response.json()))
+        print_instance(from_dict(Instance, http.decode_json(response)))
+
+
+SEARCH_ENTITIES = {
+    "accounts": Account,
+    "hashtags": Tag,
+    "statuses": Status,
+}
 
 
 @cli.command()
@@ -85,6 +95,8 @@ def instance(instance: Optional[str], json: bool):
 @click.option("--min-id", help="Return results newer than this ID.")
 @click.option("--max-id", help="Return results older than this ID.")
 @json_option
+@fields_option
+@format_option
 @pass_context
 def search(
     ctx: Context,
@@ -95,42 +107,72 @@ def search(
     limit: Optional[int],
     min_id: Optional[str],
     max_id: Optional[str],
-    json: bool
+    json: bool,
+    fields: Optional[List[str]],
+    output_format: Optional[str],
 ):
     """Search for content in accounts, statuses and hashtags."""
+    if output_format and not type:
+        raise click.UsageError("--format requires --type to be given")
+
+    if fields:
+        if not type:
+            raise click.UsageError("--fields requires --type to be given")
+        cls = SEARCH_ENTITIES[type]
+        try:
+            validate_fields(cls, fields)
+        except ValueError as ex:
+            raise click.BadParameter(str(ex), param_hint="'--fields'")
+
     response = api.search(ctx.app, ctx.user, query, resolve, type, offset, limit, min_id, max_id)
     if json:
         click.echo(response.text)
+    elif output_format:
+        items = http.decode_json(response)[type]
+        print_records(items, SEARCH_ENTITIES[type], output_format, fields)
+    elif fields:
+        items = http.decode_json(response)[type]
+        print_fields((from_dict(cls, item, fields=fields) for item in items), fields)
     else:
-        print_search_results(response.json())
+        print_search_results(http.decode_json(response))
 
 
 @cli.command()
 @click.argument("status_id")
 @json_option
+@template_option
 @pass_context
-def status(ctx: Context, status_id: str, json: bool):
+def status(ctx: Context, status_id: str, json: bool, template: Optional[Template]):
     """Show a single status"""
     response = api.fetch_status(ctx.app, ctx.user, status_id)
     if json:
         click.echo(response.text)
+    elif template:
+        click.echo(template.render_data(http.decode_json(response)))
     else:
-        status = from_dict(Status, response.json())
+        status = from_dict(Status, http.decode_json(response))
         print_status(status)
 
 
 @cli.command()
 @click.argument("status_id")
 @json_option
+@template_option
 @pass_context
-def thread(ctx: Context, status_id: str, json: bool):
+def thread(ctx: Context, status_id: str, json: bool, template: Optional[Template]):
     """Show thread for a toot."""
     context_response = api.context(ctx.app, ctx.user, status_id)
     if json:
         click.echo(context_response.text)
     else:
-        toot = api.fetch_status(ctx.app, ctx.user, status_id).json()
-        context = context_response.json()
+        toot = http.decode_json(api.fetch_status(ctx.app, ctx.user, status_id))
+        context = http.decode_json(context_response)
 
         statuses = chain(context["ancestors"], [toot], context["descendants"])
-        print_timeline(from_dict(Status, s) for s in statuses)
+        if template:
+            print_lines(template.render_data(s) for s in statuses)
+            return
+
+        with interning():
+            statuses = [from_dict(Status, s, lazy=True) for s in statuses]
+        print_timeline(statuses)
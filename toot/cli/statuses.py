@@ -1,4 +1,5 @@
 from copy import copy
+from itertools import chain
 import click
 
 from toot import api
@@ -136,15 +137,16 @@ def unbookmark(ctx: Context, status_id: str, json: bool):
 @pass_context
 def reblogged_by(ctx: Context, status_id: str, json: bool):
     """Show accounts that reblogged a status"""
-    response = api.reblogged_by(ctx.app, ctx.user, status_id)
-
     if json:
+        response = api.reblogged_by(ctx.app, ctx.user, status_id)
         click.echo(response.text)
     else:
-        rows = [[a["acct"], a["display_name"]] for a in response.json()]
-        if rows:
+        accounts = api.reblogged_by_generator(ctx.app, ctx.user, status_id)
+        rows = ([a["acct"], a["display_name"]] for a in accounts)
+        first = next(rows, None)
+        if first:
             headers = ["Account", "Display name"]
-            print_table(headers, rows)
+            print_table(headers, chain([first], rows))
         else:
             click.echo("This status is not reblogged by anyone")
 
@@ -1,11 +1,12 @@
 import json as pyjson
+from typing import Optional
 
 import click
 
-from toot import api
-from toot.cli import Context, cli, json_option, pass_context
+from toot import api, http
+from toot.cli import Context, cli, format_option, json_option, pass_context
 from toot.entities import Tag, from_dict
-from toot.output import print_tag_list
+from toot.output import print_records, print_tag_list
 
 
 @cli.group()
@@ -38,9 +39,15 @@ def info(ctx: Context, tag, json: bool):
 
 @tags.command()
 @json_option
+@format_option
 @pass_context
-def followed(ctx: Context, json: bool):
+def followed(ctx: Context, json: bool, output_format: Optional[str]):
     """List followed tags"""
+    if output_format:
+        tags = api.followed_tags_generator(ctx.app, ctx.user)
+        print_records(tags, Tag, output_format)
+        return
+
     tags = api.followed_tags(ctx.app, ctx.user)
     if json:
         click.echo(pyjson.dumps(tags))
@@ -88,7 +95,7 @@ def featured(ctx: Context, json: bool):
     if json:
         click.echo(response.text)
     else:
-        tags = response.json()
+        tags = http.decode_json(response)
         if tags:
             print_tag_list(tags)
         else:
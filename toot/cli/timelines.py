@@ -1,13 +1,16 @@
 import sys
 import click
+import json as pyjson
 
-from toot import api
-from toot.cli import NOTIFICATION_TYPE_CHOICES, InstanceParamType, cli, get_context, pass_context, Context, json_option
+from toot import api, http
+from toot.cli import NOTIFICATION_TYPE_CHOICES, InstanceParamType, cli, get_context, pass_context, Context
+from toot.cli import format_option, json_option
 from typing import Optional, Tuple
 from toot.cli.validators import validate_instance
 
-from toot.entities import Notification, Status, from_dict
-from toot.output import print_notifications, print_timeline, print_warning
+from toot.entities import GroupedNotificationsResults, InternPool, Notification, Status, from_dict, interning
+from toot.output import print_notification_groups, print_notifications, print_records, print_timeline, print_warning
+from toot.utils import prefetch
 
 
 @cli.command()
@@ -135,7 +138,16 @@ def bookmarks(
     "--mentions", "-m", is_flag=True,
     help="Show only mentions (same as --type mention, overrides --type, DEPRECATED)"
 )
+@click.option(
+    "--grouped", "-g", is_flag=True,
+    help="Show grouped notifications, e.g. favourites of a status are shown once (requires Mastodon 4.3+)"
+)
+@click.option(
+    "--since-id",
+    help="Show only notifications newer than this ID, fetches all pages of grouped notifications"
+)
 @json_option
+@format_option
 @pass_context
 def notifications(
     ctx: Context,
@@ -144,7 +156,10 @@ def notifications(
     mentions: bool,
     types: Tuple[str],
     exclude_types: Tuple[str],
+    grouped: bool,
+    since_id: Optional[str],
     json: bool,
+    output_format: Optional[str],
 ):
     """Show notifications"""
     if clear:
@@ -156,6 +171,22 @@ def notifications(
         print_warning("`--mentions` option is deprecated in favour of `--type mentions`")
         types = ("mention",)
 
+    if output_format:
+        if grouped:
+            raise click.UsageError("--format is not supported alongside --grouped")
+        if reverse:
+            print_warning("--reverse is not supported alongside --format, ignoring")
+        notifications = api.notifications_generator(ctx.app, ctx.user, types=types, exclude_types=exclude_types)
+        print_records(notifications, Notification, output_format)
+        return
+
+    if grouped:
+        _show_grouped_notifications(ctx, reverse, types, exclude_types, since_id, json)
+        return
+
+    if since_id:
+        print_warning("--since-id is only supported alongside --grouped, ignoring")
+
     response = api.get_notifications(ctx.app, ctx.user, types=types, exclude_types=exclude_types)
 
     if json:
@@ -164,7 +195,7 @@ def notifications(
         click.echo(response.text)
         return
 
-    notifications = [from_dict(Notification, n) for n in response.json()]
+    notifications = [from_dict(Notification, n) for n in http.decode_json(response)]
     if reverse:
         notifications = reversed(notifications)
 
@@ -174,26 +205,65 @@ def notifications(
         click.echo("You have no notifications")
 
 
-def _show_timeline(generator, reverse, once):
-    while True:
-        try:
-            items = next(generator)
-        except StopIteration:
-            click.echo("That's all folks.")
-            return
+def _show_grouped_notifications(
+    ctx: Context,
+    reverse: bool,
+    types: Tuple[str],
+    exclude_types: Tuple[str],
+    since_id: Optional[str],
+    json: bool,
+):
+    data = api.grouped_notifications(
+        ctx.app, ctx.user, types=types, exclude_types=exclude_types, since_id=since_id
+    )
 
+    if json:
         if reverse:
-            items = reversed(items)
+            print_warning("--reverse is not supported alongside --json, ignoring")
+        click.echo(pyjson.dumps(data))
+        return
+
+    results = from_dict(GroupedNotificationsResults, data)
+    if reverse:
+        results.notification_groups.reverse()
+
+    if results.notification_groups:
+        print_notification_groups(results)
+    else:
+        click.echo("You have no notifications")
+
+
+def _show_timeline(generator, reverse, once):
+    pool = InternPool()
+
+    # Fetch the next page in the background while the user reads the current
+    # one, unless only one page will be shown
+    if not once and sys.stdout.isatty():
+        generator = prefetch(generator)
+
+    try:
+        while True:
+            try:
+                items = next(generator)
+            except StopIteration:
+                click.echo("That's all folks.")
+                return
+
+            if reverse:
+                items = reversed(items)
 
-        statuses = [from_dict(Status, item) for item in items]
-        print_timeline(statuses)
+            with interning(pool):
+                statuses = [from_dict(Status, item, lazy=True) for item in items]
+            print_timeline(statuses)
 
-        if once or not sys.stdout.isatty():
-            break
+            if once or not sys.stdout.isatty():
+                break
 
-        char = input("\nContinue? [Y/n] ")
-        if char.lower() == "n":
-            break
+            char = input("\nContinue? [Y/n] ")
+            if char.lower() == "n":
+                break
+    finally:
+        generator.close()
 
 
 def _get_list_id(ctx: Context, value: Optional[str]) -> Optional[str]:
@@ -1,23 +1,86 @@
+from contextlib import closing
 from functools import wraps
-from typing import Iterable, List, Optional, Tuple
+from itertools import chain
+from typing import Callable, Generator, Iterable, List, NamedTuple, Optional, Tuple
 from urllib.parse import quote
 
 import click
 from requests import Response
 
 from toot import api, http
-from toot.cli import Context, cli, json_option, pass_context
+from toot.cli import Context, cli, fields_option, format_option, json_option, pass_context, template_option
 from toot.cli.lists import get_list_id
-from toot.cli.validators import validate_instance
+from toot.cli.validators import validate_instance, validate_positive
 from toot.entities import (
     Account,
+    InternPool,
     Status,
-    from_dict_list,
+    from_dict,
     from_response,
-    from_response_list,
+    from_response_stream,
+    validate_fields,
+)
+from toot.output import (
+    get_continue,
+    get_terminal_height,
+    flush_output,
+    get_width,
+    print_fields,
+    print_lines,
+    print_records,
+    print_timeline,
+    print_timeline_parallel,
+    render_timeline_parallel,
+    status_lines,
+)
+from toot.template import Template
+from toot.utils import batched, drop_empty_values, prefetch, str_bool_nullable
+
+PREFETCH_PAGES = 1
+"""Number of pages fetched ahead of the one being shown"""
+
+
+class TimelineOptions(NamedTuple):
+    """Output options shared by timeline commands"""
+    json: bool
+    fields: Optional[List[str]]
+    output_format: Optional[str]
+    template: Optional[Template]
+    pager: bool
+    external_pager: bool
+    clear: bool
+    limit: Optional[int]
+    workers: Optional[int]
+    all_pages: bool
+
+
+Fetch = Callable[..., Generator[Response, None, None]]
+"""Fetches timeline responses, takes `paged` and `stream` flags"""
+
+external_pager_option = click.option(
+    "-P",
+    "--external-pager",
+    is_flag=True,
+    help="""Stream the timeline into $PAGER, e.g. 'less -R', instead of paging
+         within toot. Pages are fetched as the pager reads them.""",
+)
+
+all_pages_option = click.option(
+    "--all-pages",
+    is_flag=True,
+    help="""Fetch all pages of results when printing with --no-pager, --fields,
+         --format or --template, e.g. to export a timeline. By default a
+         single page of --limit statuses is fetched.""",
+)
+
+workers_option = click.option(
+    "--workers",
+    type=int,
+    callback=validate_positive,
+    help="""Render statuses using this many processes, requires --no-pager or
+         --external-pager. Speeds up printing large timelines on multi-core
+         machines, e.g. with --no-pager --all-pages.""",
 )
-from toot.output import get_continue, get_terminal_height, get_width, print_timeline, status_lines
-from toot.utils import drop_empty_values, str_bool_nullable
 
 
 def common_timeline_options(func):
@@ -55,6 +118,9 @@ def common_timeline_options(func):
         help="Clear the screen before printing. If paged, clear before each page.",
         default=True,
     )
+    @all_pages_option
+    @workers_option
+    @external_pager_option
     @wraps(func)
     def wrapper(*args, **kwargs):
         return func(*args, **kwargs)
@@ -62,6 +128,31 @@ def common_timeline_options(func):
     return wrapper
 
 
+def pass_timeline_options(func):
+    """Collect the output options into a `TimelineOptions` passed as `options`."""
+    @wraps(func)
+    def wrapper(
+        *args,
+        json: bool,
+        fields: Optional[List[str]],
+        output_format: Optional[str],
+        template: Optional[Template],
+        pager: bool,
+        external_pager: bool,
+        clear: bool,
+        limit: Optional[int],
+        workers: Optional[int],
+        all_pages: bool,
+        **kwargs,
+    ):
+        options = TimelineOptions(
+            json, fields, output_format, template, pager, external_pager, clear, limit, workers, all_pages
+        )
+        return func(*args, options=options, **kwargs)
+
+    return wrapper
+
+
 instance_option = click.option(
     "-i",
     "--instance",
@@ -81,6 +172,10 @@ def timelines():
 @click.argument("account_name")
 @common_timeline_options
 @json_option
+@fields_option
+@format_option
+@template_option
+@pass_timeline_options
 @pass_context
 def account(
     ctx: Context,
@@ -88,10 +183,7 @@ def account(
     min_id: Optional[str],
     max_id: Optional[str],
     since_id: Optional[str],
-    limit: Optional[int],
-    pager: bool,
-    clear: bool,
-    json: bool,
+    options: TimelineOptions,
 ):
     """View statuses posted to the given account."""
     response = api.lookup(ctx.app, ctx.user, account_name)
@@ -101,25 +193,26 @@ def account(
         "min_id": min_id,
         "max_id": max_id,
         "since_id": since_id,
-        "limit": limit,
+        "limit": options.limit,
     }
 
-    _show_timeline(ctx, path, params, json, pager, clear, limit)
+    _show_timeline(options, _fetcher(ctx, path, params))
 
 
 @timelines.command()
 @common_timeline_options
 @json_option
+@fields_option
+@format_option
+@template_option
+@pass_timeline_options
 @pass_context
 def favourites(
     ctx: Context,
     min_id: Optional[str],
     max_id: Optional[str],
     since_id: Optional[str],
-    limit: Optional[int],
-    pager: bool,
-    clear: bool,
-    json: bool,
+    options: TimelineOptions,
 ):
     """View favourited statuses."""
     path = "/api/v1/favourites"
@@ -127,25 +220,26 @@ def favourites(
         "min_id": min_id,
         "max_id": max_id,
         "since_id": since_id,
-        "limit": limit,
+        "limit": options.limit,
     }
 
-    _show_timeline(ctx, path, params, json, pager, clear, limit)
+    _show_timeline(options, _fetcher(ctx, path, params))
 
 
 @timelines.command()
 @common_timeline_options
 @json_option
+@fields_option
+@format_option
+@template_option
+@pass_timeline_options
 @pass_context
 def home(
     ctx: Context,
     min_id: Optional[str],
     max_id: Optional[str],
     since_id: Optional[str],
-    limit: Optional[int],
-    pager: bool,
-    clear: bool,
-    json: bool,
+    options: TimelineOptions,
 ):
     """View statuses from followed users and hashtags."""
     path = "/api/v1/timelines/home"
@@ -153,16 +247,20 @@ def home(
         "min_id": min_id,
         "max_id": max_id,
         "since_id": since_id,
-        "limit": limit,
+        "limit": options.limit,
     }
 
-    _show_timeline(ctx, path, params, json, pager, clear, limit)
+    _show_timeline(options, _fetcher(ctx, path, params))
 
 
 @timelines.command()
 @click.argument("link_url")
 @common_timeline_options
 @json_option
+@fields_option
+@format_option
+@template_option
+@pass_timeline_options
 @pass_context
 def link(
     ctx: Context,
@@ -170,10 +268,7 @@ def link(
     min_id: Optional[str],
     max_id: Optional[str],
     since_id: Optional[str],
-    limit: Optional[int],
-    pager: bool,
-    clear: bool,
-    json: bool,
+    options: TimelineOptions,
 ):
     """View statuses sharing a link.
 
@@ -187,16 +282,20 @@ def link(
         "min_id": min_id,
         "max_id": max_id,
         "since_id": since_id,
-        "limit": limit,
+        "limit": options.limit,
     }
 
-    _show_timeline(ctx, path, params, json, pager, clear, limit)
+    _show_timeline(options, _fetcher(ctx, path, params))
 
 
 @timelines.command("list")
 @click.argument("list_name_or_id")
 @common_timeline_options
 @json_option
+@fields_option
+@format_option
+@template_option
+@pass_timeline_options
 @pass_context
 def list_cmd(
     ctx: Context,
@@ -204,10 +303,7 @@ def list_cmd(
     min_id: Optional[str],
     max_id: Optional[str],
     since_id: Optional[str],
-    limit: Optional[int],
-    pager: bool,
-    clear: bool,
-    json: bool,
+    options: TimelineOptions,
 ):
     """View statuses in the given list timeline."""
     list_id = get_list_id(ctx, list_name_or_id, list_name_or_id)
@@ -217,10 +313,10 @@ def list_cmd(
         "min_id": min_id,
         "max_id": max_id,
         "since_id": since_id,
-        "limit": limit,
+        "limit": options.limit,
     }
 
-    _show_timeline(ctx, path, params, json, pager, clear, limit)
+    _show_timeline(options, _fetcher(ctx, path, params))
 
 
 @timelines.command()
@@ -245,6 +341,10 @@ def list_cmd(
     help="Show only statuses with media attached",
 )
 @json_option
+@fields_option
+@format_option
+@template_option
+@pass_timeline_options
 @pass_context
 def public(
     ctx: Context,
@@ -252,13 +352,10 @@ def public(
     min_id: Optional[str],
     max_id: Optional[str],
     since_id: Optional[str],
-    limit: Optional[int],
-    pager: bool,
-    clear: bool,
     local: Optional[bool],
     remote: Optional[bool],
     only_media: Optional[bool],
-    json: bool,
+    options: TimelineOptions,
 ):
     """View public statuses."""
     path = "/api/v1/timelines/public"
@@ -266,7 +363,7 @@ def public(
         "min_id": min_id,
         "max_id": max_id,
         "since_id": since_id,
-        "limit": limit,
+        "limit": options.limit,
         "local": str_bool_nullable(local),
         "remote": str_bool_nullable(remote),
         "only_media": str_bool_nullable(only_media),
@@ -274,9 +371,9 @@ def public(
 
     if instance:
         url = f"{instance}{path}"
-        _show_anon_timeline(url, params, json, pager, clear, limit)
+        _show_timeline(options, _anon_fetcher(url, params))
     else:
-        _show_timeline(ctx, path, params, json, pager, clear, limit)
+        _show_timeline(options, _fetcher(ctx, path, params))
 
 
 @timelines.command()
@@ -317,6 +414,10 @@ def public(
     help="Return statuses that contain none of these additional tags (can be specified multiple times)",
 )
 @json_option
+@fields_option
+@format_option
+@template_option
+@pass_timeline_options
 @pass_context
 def tag(
     ctx: Context,
@@ -325,16 +426,13 @@ def tag(
     min_id: Optional[str],
     max_id: Optional[str],
     since_id: Optional[str],
-    limit: Optional[int],
-    pager: bool,
-    clear: bool,
     local: Optional[bool],
     remote: Optional[bool],
     only_media: Optional[bool],
     any: Tuple[str],
     all: Tuple[str],
     none: Tuple[str],
-    json: bool,
+    options: TimelineOptions,
 ):
     """View public statuses containing the given hashtag."""
     path = f"/api/v1/timelines/tag/{quote(tag_name)}"
@@ -342,7 +440,7 @@ def tag(
         "min_id": min_id,
         "max_id": max_id,
         "since_id": since_id,
-        "limit": limit,
+        "limit": options.limit,
         "local": str_bool_nullable(local),
         "remote": str_bool_nullable(remote),
         "only_media": str_bool_nullable(only_media),
@@ -353,9 +451,9 @@ def tag(
 
     if instance:
         url = f"{instance}{path}"
-        _show_anon_timeline(url, params, json, pager, clear, limit)
+        _show_timeline(options, _anon_fetcher(url, params))
     else:
-        _show_timeline(ctx, path, params, json, pager, clear, limit)
+        _show_timeline(options, _fetcher(ctx, path, params))
 
 
 @timelines.command()
@@ -386,78 +484,242 @@ def tag(
     help="Clear the screen before printing. If paged, clear before each page.",
     default=True,
 )
+@all_pages_option
+@workers_option
+@external_pager_option
 @json_option
+@fields_option
+@format_option
+@template_option
+@pass_timeline_options
 @pass_context
 def trending(
     ctx: Context,
     instance: Optional[str],
     offset: Optional[str],
-    limit: Optional[int],
-    pager: bool,
-    clear: bool,
-    json: bool,
+    options: TimelineOptions,
 ):
     """View trending statuses."""
     path = "/api/v1/trends/statuses"
     params = {
         "offset": offset,
-        "limit": limit,
+        "limit": options.limit,
     }
 
     if instance:
         url = f"{instance}{path}"
-        _show_anon_timeline(url, params, json, pager, clear, limit)
+        _show_timeline(options, _anon_fetcher(url, params))
     else:
-        _show_timeline(ctx, path, params, json, pager, clear, limit)
+        _show_timeline(options, _fetcher(ctx, path, params))
 
 
-def _show_timeline(ctx, path, params, json, pager, clear, limit):
+def _fetcher(ctx: Context, path: str, params: dict) -> Fetch:
     params = drop_empty_values(params)
 
-    if json:
-        response = http.get(ctx.app, ctx.user, path, params)
-        click.echo(response.text)
-        return
-
-    if pager:
-        responses = http.get_paged(ctx.app, ctx.user, path, params)
-        _print_paged(responses, clear)
-        return
+    def _fetch(paged: bool, stream: bool = False) -> Generator[Response, None, None]:
+        if paged:
+            yield from http.get_paged(ctx.app, ctx.user, path, params, stream=stream)
+        else:
+            yield http.get(ctx.app, ctx.user, path, params, stream=stream)
 
-    response = http.get(ctx.app, ctx.user, path, params)
-    _print_single(response, clear, limit)
+    return _fetch
 
 
-def _show_anon_timeline(url, params, json, pager, clear, limit):
+def _anon_fetcher(url: str, params: dict) -> Fetch:
     params = drop_empty_values(params)
 
-    if json:
-        response = http.anon_get(url, params)
+    def _fetch(paged: bool, stream: bool = False) -> Generator[Response, None, None]:
+        if paged:
+            yield from http.anon_get_paged(url, params, stream=stream)
+        else:
+            yield http.anon_get(url, params, stream=stream)
+
+    return _fetch
+
+
+def _show_timeline(options: TimelineOptions, fetch: Fetch):
+    """Print the statuses fetched using `fetch` in the chosen output mode."""
+    _validate_options(options)
+
+    # Formatted output is not paged interactively, it is printed for a single
+    # page of results unless all pages are requested
+    if options.template:
+        responses = fetch(paged=options.all_pages, stream=True)
+        _print_template(responses, options.template)
+        return
+
+    if options.output_format:
+        if options.fields:
+            _validate_fields(options.fields)
+        responses = fetch(paged=options.all_pages, stream=True)
+        _print_records(responses, options.output_format, options.fields)
+        return
+
+    if options.fields:
+        _validate_fields(options.fields)
+        responses = fetch(paged=options.all_pages, stream=True)
+        _print_fields(responses, options.fields)
+        return
+
+    if options.json:
+        response = next(fetch(paged=False))
         click.echo(response.text)
         return
 
-    if pager:
-        responses = http.anon_get_paged(url, params)
-        _print_paged(responses, clear)
+    if options.external_pager:
+        responses = fetch(paged=True, stream=True)
+        _print_external_pager(responses, options.workers)
         return
 
-    response = http.anon_get(url, params)
-    _print_single(response, clear, limit)
+    if options.pager:
+        responses = fetch(paged=True)
+        _print_paged(responses, options.clear)
+        return
+
+    responses = fetch(paged=options.all_pages, stream=True)
+    _print_unpaged(responses, options.clear, options.limit, options.workers, options.all_pages)
+
+
+def _validate_options(options: TimelineOptions):
+    """Reject options which would be ignored in the chosen output mode."""
+    formatted = options.json or options.fields or options.output_format or options.template
+
+    if options.json and options.fields:
+        raise click.UsageError("--json cannot be used with --fields")
+
+    if options.all_pages:
+        if options.json:
+            raise click.UsageError("--all-pages cannot be used with --json")
+        if not formatted and (options.pager or options.external_pager):
+            raise click.UsageError("--all-pages requires --no-pager, --fields, --format or --template")
+
+    if options.external_pager and formatted:
+        raise click.UsageError("--external-pager cannot be used with --json, --fields, --format or --template")
+
+    if options.workers:
+        if formatted:
+            raise click.UsageError("--workers cannot be used with --json, --fields, --format or --template")
+        if options.pager and not options.external_pager:
+            raise click.UsageError("--workers requires --no-pager or --external-pager")
+
+
+def _validate_fields(fields: List[str]):
+    try:
+        validate_fields(Status, fields)
+    except ValueError as ex:
+        raise click.BadParameter(str(ex), param_hint="'--fields'")
+
+
+def _print_fields(responses: Iterable[Response], fields: List[str]):
+    statuses = (from_dict(Status, item, fields=fields) for item in _iter_items(responses))
+    print_fields(statuses, fields)
+
+
+def _print_records(responses: Iterable[Response], output_format: str, fields: Optional[List[str]]):
+    print_records(_iter_items(responses), Status, output_format, fields)
+
+
+def _print_template(responses: Iterable[Response], template: Template):
+    print_lines(template.render_data(item) for item in _iter_items(responses))
+
 
+def _iter_items(responses: Iterable[Response]):
+    for response in responses:
+        yield from http.iter_json_array(response)
+        # Write out the page before waiting for the next one
+        flush_output()
+
+
+def _print_unpaged(
+    responses: Iterable[Response],
+    clear: bool,
+    limit: Optional[int],
+    workers: Optional[int],
+    all_pages: bool,
+):
+    """Print statuses from the given responses without paging."""
+    if workers:
+        # Statuses are converted in the worker processes
+        statuses = _iter_items(responses)
+    else:
+        pool = InternPool()
+        statuses = (
+            status
+            for response in responses
+            for status in from_response_stream(Status, response, lazy=True, pool=pool)
+        )
+    first = next(statuses, None)
 
-def _print_single(response: Response, clear: bool, limit: Optional[int]):
-    statuses = from_response_list(Status, response)
     if clear:
         click.clear()
-    if statuses:
-        print_timeline(statuses)
-        if not limit or len(statuses) == limit:
-            click.secho(
-                "There may be more results. Increase the --limit or use --pager to see the rest.",
-                dim=True,
-            )
-    else:
+
+    if not first:
         click.echo("No statuses found")
+        return
+
+    count = 0
+
+    def _counted():
+        nonlocal count
+        for status in chain([first], statuses):
+            count += 1
+            yield status
+
+    if workers:
+        # Split into pages so the next page is fetched while one is rendered
+        print_timeline_parallel(batched(_counted(), limit or 20), workers)
+    else:
+        print_timeline(_counted())
+
+    if not all_pages and (not limit or count == limit):
+        click.secho(
+            "There may be more results. Increase the --limit or use --pager to see the rest.",
+            dim=True,
+        )
+
+
+def _print_external_pager(responses: Generator[Response, None, None], workers: Optional[int]):
+    width = get_width()
+    separator = "─" * width
+    pool = InternPool()
+    current: Optional[Response] = None
+
+    def _responses():
+        nonlocal current
+        for response in responses:
+            current = response
+            yield response
+            response.close()
+
+    def _generator():
+        try:
+            yield separator + "\n"
+            if workers:
+                # Statuses are converted in the worker processes
+                pages = (list(http.iter_json_array(response)) for response in _responses())
+                with closing(render_timeline_parallel(pages, width, workers)) as rendered:
+                    for text in rendered:
+                        yield text + "\n"
+                return
+
+            for response in _responses():
+                for status in from_response_stream(Status, response, lazy=True, pool=pool):
+                    yield "\n".join(status_lines(status, width)) + "\n" + separator + "\n"
+        finally:
+            # Release the connection and stop paging, also when the pager
+            # exits before reading everything
+            if current is not None:
+                current.close()
+            responses.close()
+
+    # Statuses are rendered and written to the pager as it reads them. When the
+    # pager exits, click stops reading from the generator, which is then closed
+    # so no more pages are fetched.
+    statuses = _generator()
+    try:
+        click.echo_via_pager(statuses)
+    finally:
+        statuses.close()
 
 
 def _print_paged(responses: Iterable[Response], clear: bool):
@@ -465,11 +727,16 @@ def _print_paged(responses: Iterable[Response], clear: bool):
     height = get_terminal_height()
     separator = "─" * width
 
+    pool = InternPool()
+
+    # Fetch the next page in the background while the current one is shown.
+    # Responses are not streamed so the whole page is loaded in advance.
+    responses = prefetch(responses, depth=PREFETCH_PAGES)
+
     def _page_generator():
         batch_lines: List[str] = []
         for response in responses:
-            statuses = from_dict_list(Status, response.json())
-            for status in statuses:
+            for status in from_response_stream(Status, response, lazy=True, pool=pool):
                 lines = [separator] + list(status_lines(status, width))
                 if len(batch_lines) + len(lines) > height - 2 and batch_lines:
                     yield "\n".join(batch_lines) + "\n" + separator
@@ -481,14 +748,17 @@ def _print_paged(responses: Iterable[Response], clear: bool):
 
     first = True
     printed_any = False
-    for page in _page_generator():
-        if not first and not get_continue():
-            break
-        if clear:
-            click.clear()
-        click.echo(page)
-        first = False
-        printed_any = True
+    try:
+        for page in _page_generator():
+            if not first and not get_continue():
+                break
+            if clear:
+                click.clear()
+            click.echo(page)
+            first = False
+            printed_any = True
+    finally:
+        responses.close()
 
     if not printed_any:
         click.echo("No statuses found")
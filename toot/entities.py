@@ -6,19 +6,28 @@ used when constructing the data class using `from_dict`. The method will be
 called with the dict and may modify it and return a modified dict. This is used
 to implement any pre-processing which may be required, e.g. to support
 different versions of the Mastodon API.
+
+Data classes may also have an attribute named `__toot_intern_key__` which names
+the field identifying the entity. Such entities are deduplicated when converted
+within an `interning` block, see `InternPool`.
 """
 
 import dataclasses
+import threading
 import typing as t
 
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, is_dataclass
 from datetime import date, datetime
 from functools import lru_cache
-from typing import Any, Dict, NamedTuple, Optional, Type, TypeVar, Union
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional, Tuple, Type, TypeVar, Union
 from typing import get_args, get_origin, get_type_hints
 
 from requests import Response
 
+from toot import http
 from toot.utils import batched, get_text
 from toot.utils.datetime import parse_datetime
 
@@ -29,7 +38,31 @@ T = TypeVar("T")
 Data = Dict[str, Any]
 
 
-@dataclass
+def entity(cls: Type[T]) -> Type[T]:
+    """
+    Create a dataclass which uses `__slots__` instead of a per-instance
+    `__dict__`, reducing the memory footprint of each instance.
+
+    Equivalent to `@dataclass(slots=True)` which requires Python 3.10.
+    """
+    cls = dataclass(cls)
+    field_names = tuple(f.name for f in dataclasses.fields(cls))
+
+    cls_dict = dict(cls.__dict__)
+    cls_dict["__slots__"] = field_names
+    for name in field_names:
+        # Remove class attributes holding field defaults, they would conflict
+        # with the slot descriptors. Defaults are already bound in `__init__`.
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+
+    slotted = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+@entity
 class AccountField:
     """
     https://docs.joinmastodon.org/entities/Account/#Field
@@ -39,7 +72,7 @@ class AccountField:
     verified_at: Optional[datetime]
 
 
-@dataclass
+@entity
 class CustomEmoji:
     """
     https://docs.joinmastodon.org/entities/CustomEmoji/
@@ -50,8 +83,10 @@ class CustomEmoji:
     visible_in_picker: bool
     category: str
 
+    __toot_intern_key__ = "shortcode"
 
-@dataclass
+
+@entity
 class Account:
     """
     https://docs.joinmastodon.org/entities/Account/
@@ -83,6 +118,8 @@ class Account:
     following_count: int
     source: Optional[dict]
 
+    __toot_intern_key__ = "id"
+
     @staticmethod
     def __toot_prepare__(obj: Data) -> Data:
         # Pleroma has not yet converted last_status_at from datetime to date
@@ -98,7 +135,7 @@ class Account:
         return get_text(self.note)
 
 
-@dataclass
+@entity
 class Application:
     """
     https://docs.joinmastodon.org/entities/Status/#application
@@ -107,7 +144,7 @@ class Application:
     website: Optional[str]
 
 
-@dataclass
+@entity
 class MediaAttachment:
     """
     https://docs.joinmastodon.org/entities/MediaAttachment/
@@ -122,7 +159,7 @@ class MediaAttachment:
     blurhash: str
 
 
-@dataclass
+@entity
 class StatusMention:
     """
     https://docs.joinmastodon.org/entities/Status/#Mention
@@ -133,7 +170,7 @@ class StatusMention:
     acct: str
 
 
-@dataclass
+@entity
 class StatusTag:
     """
     https://docs.joinmastodon.org/entities/Status/#Tag
@@ -142,7 +179,7 @@ class StatusTag:
     url: str
 
 
-@dataclass
+@entity
 class PollOption:
     """
     https://docs.joinmastodon.org/entities/Poll/#Option
@@ -151,7 +188,7 @@ class PollOption:
     votes_count: Optional[int]
 
 
-@dataclass
+@entity
 class Poll:
     """
     https://docs.joinmastodon.org/entities/Poll/
@@ -168,7 +205,7 @@ class Poll:
     own_votes: Optional[t.List[int]]
 
 
-@dataclass
+@entity
 class PreviewCard:
     """
     https://docs.joinmastodon.org/entities/PreviewCard/
@@ -189,7 +226,7 @@ class PreviewCard:
     blurhash: Optional[str]
 
 
-@dataclass
+@entity
 class FilterKeyword:
     """
     https://docs.joinmastodon.org/entities/FilterKeyword/
@@ -199,7 +236,7 @@ class FilterKeyword:
     whole_word: str
 
 
-@dataclass
+@entity
 class FilterStatus:
     """
     https://docs.joinmastodon.org/entities/FilterStatus/
@@ -208,7 +245,7 @@ class FilterStatus:
     status_id: str
 
 
-@dataclass
+@entity
 class Filter:
     """
     https://docs.joinmastodon.org/entities/Filter/
@@ -222,7 +259,7 @@ class Filter:
     statuses: t.List[FilterStatus]
 
 
-@dataclass
+@entity
 class FilterResult:
     """
     https://docs.joinmastodon.org/entities/FilterResult/
@@ -232,7 +269,7 @@ class FilterResult:
     status_matches: Optional[str]
 
 
-@dataclass
+@entity
 class Status:
     """
     https://docs.joinmastodon.org/entities/Status/
@@ -285,7 +322,7 @@ class Status:
         return obj
 
 
-@dataclass
+@entity
 class Report:
     """
     https://docs.joinmastodon.org/entities/Report/
@@ -302,7 +339,7 @@ class Report:
     target_account: Account
 
 
-@dataclass
+@entity
 class Notification:
     """
     https://docs.joinmastodon.org/entities/Notification/
@@ -315,26 +352,53 @@ class Notification:
     report: Optional[Report]
 
 
-@dataclass
+@entity
+class NotificationGroup:
+    """
+    https://docs.joinmastodon.org/entities/GroupedNotificationsResults/#NotificationGroup
+    """
+    group_key: str
+    notifications_count: int
+    type: str
+    most_recent_notification_id: str
+    page_min_id: Optional[str]
+    page_max_id: Optional[str]
+    latest_page_notification_at: Optional[datetime]
+    sample_account_ids: t.List[str]
+    status_id: Optional[str]
+    report: Optional[Report]
+
+
+@entity
+class GroupedNotificationsResults:
+    """
+    https://docs.joinmastodon.org/entities/GroupedNotificationsResults/
+    """
+    accounts: t.List[Account]
+    statuses: t.List[Status]
+    notification_groups: t.List[NotificationGroup]
+
+
+@entity
 class InstanceUrls:
     streaming_api: str
 
 
-@dataclass
+@entity
 class InstanceStats:
     user_count: int
     status_count: int
     domain_count: int
 
 
-@dataclass
+@entity
 class InstanceConfigurationStatuses:
     max_characters: int
     max_media_attachments: int
     characters_reserved_per_url: int
 
 
-@dataclass
+@entity
 class InstanceConfigurationMediaAttachments:
     supported_mime_types: t.List[str]
     image_size_limit: int
@@ -344,7 +408,7 @@ class InstanceConfigurationMediaAttachments:
     video_matrix_limit: int
 
 
-@dataclass
+@entity
 class InstanceConfigurationPolls:
     max_options: int
     max_characters_per_option: int
@@ -352,7 +416,7 @@ class InstanceConfigurationPolls:
     max_expiration: int
 
 
-@dataclass
+@entity
 class InstanceConfiguration:
     """
     https://docs.joinmastodon.org/entities/V1_Instance/#configuration
@@ -362,7 +426,7 @@ class InstanceConfiguration:
     polls: InstanceConfigurationPolls
 
 
-@dataclass
+@entity
 class Rule:
     """
     https://docs.joinmastodon.org/entities/Rule/
@@ -371,7 +435,7 @@ class Rule:
     text: str
 
 
-@dataclass
+@entity
 class Instance:
     """
     https://docs.joinmastodon.org/entities/V1_Instance/
@@ -394,7 +458,7 @@ class Instance:
     rules: t.List[Rule]
 
 
-@dataclass
+@entity
 class Relationship:
     """
     Represents the relationship between accounts, such as following / blocking /
@@ -417,7 +481,7 @@ class Relationship:
     note: str
 
 
-@dataclass
+@entity
 class TagHistory:
     """
     Usage statistics for given days (typically the past week).
@@ -428,7 +492,7 @@ class TagHistory:
     accounts: str
 
 
-@dataclass
+@entity
 class Tag:
     """
     Represents a hashtag used within the content of a status.
@@ -440,7 +504,7 @@ class Tag:
     following: Optional[bool]
 
 
-@dataclass
+@entity
 class FeaturedTag:
     """
     Represents a hashtag that is featured on a profile.
@@ -453,7 +517,7 @@ class FeaturedTag:
     last_status_at: datetime
 
 
-@dataclass
+@entity
 class List:
     """
     Represents a list of some users that the authenticated user follows.
@@ -483,45 +547,142 @@ class ConversionError(Exception):
         )
 
 
-def from_dict(cls: Type[T], data: Data) -> T:
-    """Convert a nested dict into an instance of `cls`."""
-    # Apply __toot_prepare__ if it exists
-    prepare = getattr(cls, '__toot_prepare__', None)
-    if prepare:
-        data = prepare(data)
+class InternPool:
+    """
+    Deduplicates entities which appear repeatedly in API responses, such as
+    accounts and custom emoji in a timeline.
+
+    Converting an entity whose data equals that of a previously converted
+    entity with the same key returns the previously converted instance. Since
+    instances are shared, they should not be modified.
+
+    Only a fingerprint of the source data is kept, not the data itself. When
+    the pool is full the least recently used entity is evicted.
+    """
+    def __init__(self, max_size: int = 1024):
+        assert max_size > 0
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entities: "OrderedDict[Tuple[type, Any], Tuple[int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cls: Type[T], data: Data, converter: Callable[[Data], T]) -> T:
+        key = (cls, data.get(cls.__toot_intern_key__))
+        fingerprint = hash(repr(data))
+
+        with self._lock:
+            cached = self._entities.get(key)
+            if cached and cached[0] == fingerprint:
+                self._entities.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        instance = converter(data)
+
+        with self._lock:
+            self._entities[key] = (fingerprint, instance)
+            self._entities.move_to_end(key)
+            while len(self._entities) > self.max_size:
+                self._entities.popitem(last=False)
+
+        return instance
 
-    def _fields():
-        for field in _get_fields(cls):
-            value = data.get(field.name, field.default)
-            converted = _convert_with_error_handling(cls, field, value)
-            yield field.name, converted
+    def __len__(self):
+        return len(self._entities)
 
-    return cls(**dict(_fields()))
 
+_intern_pool: ContextVar[Optional[InternPool]] = ContextVar("_intern_pool", default=None)
 
-def from_dict_list(cls: Type[T], data: t.List[Data]) -> t.List[T]:
+
+@contextmanager
+def interning(pool: Optional[InternPool] = None) -> Iterator[InternPool]:
+    """
+    Deduplicate entities converted within this block using the given pool, or
+    a new one if not given. Pass the same pool to multiple blocks to share it
+    between them, e.g. for each page of a paged response.
+    """
+    pool = pool if pool is not None else InternPool()
+    token = _intern_pool.set(pool)
+    try:
+        yield pool
+    finally:
+        _intern_pool.reset(token)
+
+
+def from_dict(
+    cls: Type[T],
+    data: Data,
+    lazy: bool = False,
+    fields: Optional[t.Iterable[str]] = None,
+) -> T:
+    """
+    Convert a nested dict into an instance of `cls`.
+
+    If `lazy` is set, fields holding nested data classes are converted on first
+    access instead of upfront. Use it when only some fields will be read.
+
+    If `fields` is given, only the listed fields are converted and all other
+    fields are set to None. Nested fields are given as dotted paths, e.g.
+    `["id", "account.acct"]`. Such partial instances are not interned.
+    """
+    if fields is not None:
+        return _get_projected_converter(cls, tuple(fields))(data)
+
+    converter = _get_lazy_converter(cls) if lazy else _get_converter(cls)
+
+    pool = _intern_pool.get()
+    if pool is not None and hasattr(cls, "__toot_intern_key__"):
+        return pool.get(cls, data, converter)
+
+    return converter(data)
+
+
+def from_dict_list(cls: Type[T], data: t.List[Data], lazy: bool = False) -> t.List[T]:
     """Convert a list of nested dicts into a list of `cls` instances."""
-    return [from_dict(cls, x) for x in data]
+    return [from_dict(cls, x, lazy) for x in data]
 
 
-def from_response(cls: Type[T], response: Response) -> T:
+def from_response(cls: Type[T], response: Response, lazy: bool = False) -> T:
     """Convert a nested dict extracted from response body into an instance of `cls`."""
-    return from_dict(cls, response.json())
+    return from_dict(cls, http.decode_json(response), lazy)
 
 
-def from_response_list(cls: Type[T], response: Response) -> t.List[T]:
+def from_response_list(cls: Type[T], response: Response, lazy: bool = False) -> t.List[T]:
     """Convert a list of nested dicts extracted from response body into a list of `cls` instances."""
-    return from_dict_list(cls, response.json())
+    return from_dict_list(cls, http.decode_json(response), lazy)
+
+
+def from_response_stream(
+    cls: Type[T],
+    response: Response,
+    lazy: bool = False,
+    pool: Optional[InternPool] = None,
+) -> t.Iterator[T]:
+    """
+    Convert a list of nested dicts from a streamed response body into `cls`
+    instances, yielding each one as soon as it has been received. If `pool` is
+    given, entities are interned in it.
+    """
+    for item in http.iter_json_array(response):
+        if pool is not None:
+            with interning(pool):
+                instance = from_dict(cls, item, lazy)
+        else:
+            instance = from_dict(cls, item, lazy)
+        yield instance
 
 
 def from_responses_batched(
     responses: t.Iterable[Response],
     cls: Type[T],
     page_size: int,
+    lazy: bool = False,
 ) -> t.Generator[t.List[T], None, None]:
     def _gen():
         for response in responses:
-            statuses = from_dict_list(cls, response.json())
+            statuses = from_dict_list(cls, http.decode_json(response), lazy)
             for status in statuses:
                 yield status
 
@@ -551,36 +712,336 @@ def _get_default_value(field: dataclasses.Field):
     return None
 
 
-def _convert_with_error_handling(data_class: type, field: Field, field_value: Any) -> Any:
-    try:
-        return _convert(field.type, field_value)
-    except ConversionError:
-        raise
-    except Exception:
-        raise ConversionError(data_class, field, field_value)
+@lru_cache(maxsize=None)
+def _get_converter(cls: Type[T]) -> Callable[[Data], T]:
+    """
+    Compile a function which converts a dict into an instance of `cls`.
 
+    Conversion for each field is resolved once, when the converter is
+    compiled, instead of inspecting field types for each converted object.
+    """
+    prepare = getattr(cls, "__toot_prepare__", None)
+    fields = [
+        (field.name, field.default, field, _get_value_converter(field.type))
+        for field in _get_fields(cls)
+    ]
 
-def _convert(field_type: Any, value: Any) -> Any:
-    if value is None:
-        return None
+    def _converter(data: Data) -> T:
+        if prepare:
+            data = prepare(data)
+
+        kwargs = {}
+        for name, default, field, convert in fields:
+            value = data.get(name, default)
+            if value is None or convert is None:
+                kwargs[name] = value
+                continue
+
+            try:
+                kwargs[name] = convert(value)
+            except ConversionError:
+                raise
+            except Exception:
+                raise ConversionError(cls, field, value)
 
-    if field_type in [str, int, bool, dict]:
+        return cls(**kwargs)
+
+    return _converter
+
+
+def validate_fields(cls: type, fields: t.Iterable[str]):
+    """
+    Check that the given field paths exist in `cls`, raises ValueError if they
+    don't. See `from_dict`.
+    """
+    _get_projected_converter(cls, tuple(fields))
+
+
+def get_field(instance: Any, path: str) -> Any:
+    """
+    Returns the value of the field at the given dotted path. If the path
+    traverses a list, returns a list of values.
+    """
+    value = instance
+    for name in path.split("."):
+        if isinstance(value, list):
+            value = [getattr(item, name) if item is not None else None for item in value]
+        elif value is not None:
+            value = getattr(value, name)
+    return value
+
+
+def get_field_type(cls: type, path: str) -> type:
+    """
+    Returns the type of the field at the given dotted path, without Optional.
+    If the path traverses a list, returns a list of the field type.
+    Raises ValueError if the field does not exist, see `validate_fields`.
+    """
+    validate_fields(cls, [path])
+
+    field_type = cls
+    is_list = False
+    for name in path.split("."):
+        field_type = next(field.type for field in _get_fields(field_type) if field.name == name)
+        if get_origin(field_type) is list:
+            is_list = True
+            field_type = _prune_optional(get_args(field_type)[0])
+
+    return t.List[field_type] if is_list else field_type
+
+
+@lru_cache(maxsize=None)
+def _get_projected_converter(cls: Type[T], fields: t.Tuple[str, ...]) -> Callable[[Data], T]:
+    """
+    Compile a function which converts only the given fields of `cls`, leaving
+    others set to None. Fields are given as dotted paths, e.g. `account.acct`.
+    """
+    # Group paths by top level field name, e.g. {"account": ["acct", "id"]}.
+    # Fields given without a subpath are converted whole.
+    paths: Dict[str, t.List[str]] = {}
+    whole = set()
+    for path in fields:
+        name, _, subpath = path.partition(".")
+        paths.setdefault(name, [])
+        if subpath:
+            paths[name].append(subpath)
+        else:
+            whole.add(name)
+
+    known_fields = {field.name: field for field in _get_fields(cls)}
+    unknown = [name for name in paths if name not in known_fields]
+    if unknown:
+        raise ValueError(f"Unknown field `{cls.__name__}.{unknown[0]}`")
+
+    prepare = getattr(cls, "__toot_prepare__", None)
+    skipped = [field.name for field in _get_fields(cls) if field.name not in paths]
+    projected = []
+    for name, subpaths in paths.items():
+        field = known_fields[name]
+        convert = (
+            _get_projected_value_converter(cls, field, tuple(subpaths))
+            if name not in whole
+            else _get_value_converter(field.type)
+        )
+        projected.append((name, field.default, field, convert))
+
+    def _converter(data: Data) -> T:
+        if prepare:
+            data = prepare(data)
+
+        instance = object.__new__(cls)
+        for name in skipped:
+            setattr(instance, name, None)
+
+        for name, default, field, convert in projected:
+            value = data.get(name, default)
+            if value is not None and convert is not None:
+                try:
+                    value = convert(value)
+                except ConversionError:
+                    raise
+                except Exception:
+                    raise ConversionError(cls, field, value)
+            setattr(instance, name, value)
+
+        return instance
+
+    return _converter
+
+
+def _get_projected_value_converter(cls: type, field: Field, subpaths: t.Tuple[str, ...]) -> Callable[[Any], Any]:
+    """
+    Returns a function which converts the given subpaths of a field holding a
+    data class or a list of data classes.
+    """
+    field_type = field.type
+    is_list = get_origin(field_type) == list
+    if is_list:
+        (field_type,) = get_args(field_type)
+
+    if not is_dataclass(field_type):
+        raise ValueError(f"Field `{cls.__name__}.{field.name}` has no subfields")
+
+    convert = _get_projected_converter(field_type, subpaths)
+
+    if is_list:
+        def _convert_list(value):
+            return [None if x is None else convert(x) for x in value]
+
+        return _convert_list
+
+    return convert
+
+
+@lru_cache(maxsize=None)
+def _get_lazy_converter(cls: Type[T]) -> Callable[[Data], T]:
+    """
+    Compile a function which converts a dict into a lazy instance of `cls`.
+
+    Fields which hold nested data classes are left unset and converted from the
+    source dict on first access, see `_lazy_field`. Other fields are converted
+    upfront, as they are cheap. The returned objects are instances of a
+    subclass of `cls` which holds a reference to the source dict, and to the
+    intern pool active at creation time, which is used to convert nested fields.
+    Both references are dropped once all nested fields have been converted.
+
+    Requires `cls` to be declared using `@entity`, other data classes are
+    converted eagerly.
+    """
+    if "__slots__" not in cls.__dict__:
+        return _get_converter(cls)
+
+    prepare = getattr(cls, "__toot_prepare__", None)
+    eager_fields = []
+    lazy_fields = {}
+
+    def _release(instance):
+        """Drop the source dict once all nested fields have been converted."""
+        for slot in lazy_slots:
+            try:
+                slot.__get__(instance)
+            except AttributeError:
+                return
+        instance._toot_data = None
+        instance._toot_pool = None
+
+    for field in _get_fields(cls):
+        if _is_nested(field.type):
+            convert = _get_value_converter(field.type, lazy=True)
+            lazy_fields[field.name] = _lazy_field(cls, field, convert, _release)
+        else:
+            convert = _get_value_converter(field.type)
+            eager_fields.append((field.name, field.default, field, convert))
+
+    field_names = [field.name for field in _get_fields(cls)]
+    lazy_slots = [cls.__dict__[name] for name in lazy_fields]
+
+    def __eq__(self, other):
+        # Allow comparing lazy and eagerly converted instances
+        if isinstance(other, cls):
+            return all(getattr(self, name) == getattr(other, name) for name in field_names)
+        return NotImplemented
+
+    lazy_cls = type(cls)(cls.__name__, (cls,), {
+        "__slots__": ("_toot_data", "_toot_pool"),
+        "__eq__": __eq__,
+        "__hash__": cls.__hash__,
+        "__qualname__": cls.__qualname__,
+        "__module__": cls.__module__,
+        **lazy_fields,
+    })
+
+    def _converter(data: Data) -> T:
+        if prepare:
+            data = prepare(data)
+
+        instance = object.__new__(lazy_cls)
+        instance._toot_data = data if lazy_fields else None
+        instance._toot_pool = _intern_pool.get() if lazy_fields else None
+
+        for name, default, field, convert in eager_fields:
+            value = data.get(name, default)
+            if value is not None and convert is not None:
+                try:
+                    value = convert(value)
+                except ConversionError:
+                    raise
+                except Exception:
+                    raise ConversionError(cls, field, value)
+            setattr(instance, name, value)
+
+        return instance
+
+    return _converter
+
+
+def _lazy_field(
+    cls: type,
+    field: Field,
+    convert: Callable[[Any], Any],
+    release: Callable[[Any], None],
+) -> property:
+    """
+    Returns a property which converts the field value from the source dict on
+    first access and stores it in the slot defined by `cls`. Calls `release`
+    with the instance whenever a field is stored.
+    """
+    slot = cls.__dict__[field.name]
+
+    def _get(instance):
+        try:
+            return slot.__get__(instance)
+        except AttributeError:
+            pass
+
+        value = instance._toot_data.get(field.name, field.default)
+        if value is not None:
+            token = _intern_pool.set(instance._toot_pool)
+            try:
+                value = convert(value)
+            except ConversionError:
+                raise
+            except Exception:
+                raise ConversionError(cls, field, value)
+            finally:
+                _intern_pool.reset(token)
+
+        slot.__set__(instance, value)
+        release(instance)
         return value
 
+    def _set(instance, value):
+        slot.__set__(instance, value)
+        release(instance)
+
+    return property(_get, _set)
+
+
+def _is_nested(field_type: Any) -> bool:
+    """Returns True if the field holds a data class or a list of data classes."""
+    if get_origin(field_type) == list:
+        (field_type,) = get_args(field_type)
+    return is_dataclass(field_type)
+
+
+def _get_value_converter(field_type: Any, lazy: bool = False) -> Optional[Callable[[Any], Any]]:
+    """
+    Returns a function which converts a non-null JSON value to `field_type`,
+    or None if the value can be used as is.
+    """
+    if field_type in (str, int, bool, dict):
+        return None
+
     if field_type == datetime:
-        return parse_datetime(value)
+        return parse_datetime
 
     if field_type == date:
-        return date.fromisoformat(value)
+        return date.fromisoformat
 
     if get_origin(field_type) == list:
         (inner_type,) = get_args(field_type)
-        return [_convert(inner_type, x) for x in value]
+        convert_inner = _get_value_converter(inner_type, lazy)
+
+        if convert_inner is None:
+            return list
+
+        def _convert_list(value):
+            return [None if x is None else convert_inner(x) for x in value]
+
+        return _convert_list
 
     if is_dataclass(field_type):
-        return from_dict(field_type, value)
+        # Resolved on each call instead of upfront to support recursive types
+        # such as `Account.moved`
+        def _convert_dataclass(value):
+            return from_dict(field_type, value, lazy)
+
+        return _convert_dataclass
+
+    def _not_implemented(value):
+        raise ValueError(f"Not implemented for type '{field_type}'")
 
-    raise ValueError(f"Not implemented for type '{field_type}'")
+    return _not_implemented
 
 
 def _prune_optional(field_type: type) -> type:
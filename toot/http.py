@@ -1,14 +1,27 @@
+import codecs
+import json
+
+from typing import Any, Iterator
 from urllib.parse import urlencode, urlparse
 
-from requests import Request, Session
+from requests import Request, Response, Session
 from requests.exceptions import RequestException
 
 from toot import __version__
 from toot.exceptions import ApiError, NotFoundError
 from toot.logging import log_request, log_request_exception, log_response
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Size of chunks read from the response when streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+
 
-def send_request(request, allow_redirects=True):
+def send_request(request, allow_redirects=True, stream=False):
     # Set a user agent string
     # Required for accessing instances using Cloudfront DDOS protection.
     request.headers["User-Agent"] = "toot/{}".format(__version__)
@@ -18,7 +31,7 @@ def send_request(request, allow_redirects=True):
     try:
         with Session() as session:
             prepared = session.prepare_request(request)
-            settings = session.merge_environment_settings(prepared.url, {}, None, None, None)
+            settings = session.merge_environment_settings(prepared.url, {}, stream, None, None)
             response = session.send(prepared, allow_redirects=allow_redirects, **settings)
     except RequestException as ex:
         log_request_exception(request, ex)
@@ -29,10 +42,86 @@ def send_request(request, allow_redirects=True):
     return response
 
 
+def decode_json(response: Response) -> Any:
+    """
+    Decode the JSON response body. Uses orjson if it's installed, which is
+    considerably faster than the standard library for large responses.
+    """
+    if orjson:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+
+def iter_json_array(response: Response) -> Iterator[Any]:
+    """
+    Decode a JSON array from the response body, yielding each element as soon
+    as it has been received. Use with `stream=True` to avoid loading the whole
+    response body into memory.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    chunks = response.iter_content(STREAM_CHUNK_SIZE)
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def _fill():
+        # Discard consumed data and append the next chunk
+        nonlocal buffer, pos, eof
+        chunk = next(chunks, None)
+        eof = chunk is None
+        buffer = buffer[pos:] + utf8.decode(chunk or b"", final=eof)
+        pos = 0
+
+    def _next_char() -> str:
+        # Skip whitespace and return the next character
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\n\r":
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if eof:
+                raise ValueError("Unexpected end of JSON array")
+            _fill()
+
+    if _next_char() != "[":
+        raise ValueError("Expected a JSON array")
+    pos += 1
+
+    if _next_char() == "]":
+        return
+
+    while True:
+        _next_char()
+
+        # Elements are always followed by "," or "]", so an element which ends
+        # at the end of the buffer may be incomplete, e.g. a truncated number
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                if end < len(buffer) or eof:
+                    break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            _fill()
+
+        yield value
+        pos = end
+
+        char = _next_char()
+        pos += 1
+        if char == "]":
+            return
+        if char != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+
+
 def _get_error_message(response):
     """Attempt to extract an error message from response body"""
     try:
-        data = response.json()
+        data = decode_json(response)
         if "error_description" in data:
             return data['error_description']
         if "error" in data:
@@ -55,24 +144,24 @@ def process_response(response):
     return response
 
 
-def get(app, user, path, params=None, headers=None):
+def get(app, user, path, params=None, headers=None, stream=False):
     url = app.base_url + path
 
     headers = headers or {}
     headers["Authorization"] = f"Bearer {user.access_token}"
 
     request = Request('GET', url, headers, params=params)
-    response = send_request(request)
+    response = send_request(request, stream=stream)
 
     return process_response(response)
 
 
-def get_paged(app, user, path, params=None, headers=None):
+def get_paged(app, user, path, params=None, headers=None, stream=False):
     if params:
         path += f"?{urlencode(params)}"
 
     while path:
-        response = get(app, user, path, headers=headers)
+        response = get(app, user, path, headers=headers, stream=stream)
         yield response
         path = _next_path(response)
 
@@ -84,19 +173,19 @@ def _next_path(response):
         return "?".join([next_url.path, next_url.query])
 
 
-def anon_get(url, params=None):
+def anon_get(url, params=None, stream=False):
     request = Request('GET', url, None, params=params)
-    response = send_request(request)
+    response = send_request(request, stream=stream)
 
     return process_response(response)
 
 
-def anon_get_paged(url, params=None):
+def anon_get_paged(url, params=None, stream=False):
     if params:
         url += f"?{urlencode(params)}"
 
     while url:
-        response = anon_get(url)
+        response = anon_get(url, stream=stream)
         yield response
         url = _next_url(response)
 
@@ -1,17 +1,108 @@
+import csv
+import json
 import re
 import shutil
 import textwrap
+import time
 import typing as t
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date
+from itertools import chain, islice
 
 import click
 from wcwidth import wcswidth
 
-from toot.entities import Account, Instance, List, Notification, Poll, Status
-from toot.utils import get_text, html_to_paragraphs
-from toot.wcstring import pad, wc_wrap
+from toot.cache import render_cache
+from toot.entities import Account, GroupedNotificationsResults, Instance, List
+from toot.entities import Notification, NotificationGroup, Poll, Status, Tag, from_dict, get_field
+from toot.utils import batched, get_text, html_to_paragraphs
+from toot.wcstring import pad, trunc, wc_width, wc_wrap
 
 DEFAULT_WIDTH = 80
 
+OUTPUT_CHUNK_SIZE = 64 * 1024
+"""Number of characters buffered before writing to output"""
+
+OUTPUT_FLUSH_INTERVAL = 0.1
+"""Number of seconds after which buffered output is written, even if the
+chunk is not full"""
+
+
+class OutputBuffer:
+    """
+    Accumulates lines of output and writes them in large chunks. Removing ANSI
+    styles, when color is disabled, is done once per chunk by `click.echo`.
+
+    Lines are not held back for long when output is produced slowly, e.g. when
+    statuses are printed as they are received. The buffer is written out once
+    `flush_interval` seconds have passed since the first line was buffered.
+    """
+    def __init__(self, chunk_size: int = OUTPUT_CHUNK_SIZE, flush_interval: float = OUTPUT_FLUSH_INTERVAL):
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self._lines: t.List[str] = []
+        self._size = 0
+        self._deadline = 0.0
+
+    def write(self, line: str):
+        now = time.monotonic()
+        if not self._lines:
+            self._deadline = now + self.flush_interval
+
+        self._lines.append(line)
+        self._size += len(line) + 1
+        if self._size >= self.chunk_size or now >= self._deadline:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            self._lines.append("")
+            click.echo("\n".join(self._lines), nl=False)
+            self._lines = []
+            self._size = 0
+
+
+_output_buffer: ContextVar[t.Optional[OutputBuffer]] = ContextVar("output_buffer", default=None)
+
+
+@contextmanager
+def buffered_output() -> t.Iterator[OutputBuffer]:
+    """
+    Buffer lines printed using `echo` within the block, and write them out in
+    chunks. The buffer is flushed when the outermost block exits.
+    """
+    buffer = _output_buffer.get()
+    if buffer:
+        yield buffer
+        return
+
+    buffer = OutputBuffer()
+    token = _output_buffer.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _output_buffer.reset(token)
+        buffer.flush()
+
+
+def flush_output():
+    """Write out any buffered output, e.g. before prompting the user."""
+    buffer = _output_buffer.get()
+    if buffer:
+        buffer.flush()
+
+
+def echo(line: str = ""):
+    """Print a line of output, buffered if within a `buffered_output` block."""
+    buffer = _output_buffer.get()
+    if buffer:
+        buffer.write(line)
+    else:
+        click.echo(line)
+
 
 def get_max_width() -> int:
     return click.get_current_context().max_content_width or DEFAULT_WIDTH
@@ -34,6 +125,7 @@ def print_warning(text: str):
 
 
 def get_continue():
+    flush_output()
     click.secho(
         f"Press {green('Space')} or {green('Enter')} to continue, {yellow('Esc')} or {yellow('q')} to break."
     )
@@ -137,30 +229,47 @@ def print_lists(lists: t.List[List]):
     print_table(headers, data)
 
 
-def print_table(headers: t.List[str], data: t.List[t.List[str]]):
-    widths = [[wcswidth(cell) for cell in row] for row in data + [headers]]
-    widths = [max(width) for width in zip(*widths)]
+TABLE_SAMPLE_SIZE = 100
+"""Number of rows used to determine table column widths"""
+
+
+def print_table(headers: t.List[str], data: t.Iterable[t.List[str]]):
+    """
+    Print data as a table with aligned columns. Rows are printed as they are
+    read from `data`, so it can be a generator which fetches more data.
+
+    Columns are sized to fit the headers and the first TABLE_SAMPLE_SIZE rows.
+    Cells which are wider than their column are truncated.
+    """
+    rows = iter(data)
+    sample = list(islice(rows, TABLE_SAMPLE_SIZE))
+    widths = [max(wc_width(cell) for cell in column) for column in zip(headers, *sample)]
 
     def print_row(row):
-        for idx, cell in enumerate(row):
-            width = widths[idx]
-            click.echo(pad(cell, width), nl=False)
-            click.echo("  ", nl=False)
-        click.echo()
+        cells = [_fit_cell(cell, width) for cell, width in zip(row, widths)]
+        click.echo("".join(f"{cell}  " for cell in cells))
 
     underlines = ["-" * width for width in widths]
 
     print_row(headers)
     print_row(underlines)
 
-    for row in data:
+    for row in chain(sample, rows):
         print_row(row)
 
 
-def print_list_accounts(accounts):
-    if accounts:
+def _fit_cell(cell: str, width: int) -> str:
+    if wc_width(cell) > width:
+        cell = trunc(cell, width) if width > 0 else ""
+    return pad(cell, width)
+
+
+def print_list_accounts(accounts: t.Iterable[t.Dict[str, t.Any]]):
+    accounts = iter(accounts)
+    first = next(accounts, None)
+    if first:
         click.echo("Accounts in list:\n")
-        print_acct_list(accounts)
+        print_acct_list(chain([first], accounts))
     else:
         click.echo("This list has no accounts.")
 
@@ -189,11 +298,10 @@ def print_search_results(results):
 
 def print_status(status: Status) -> None:
     for line in status_lines(status, get_width()):
-        click.echo(line)
+        echo(line)
 
 
 def status_lines(status: Status, width: int) -> t.Generator[str, None, None]:
-    width = get_width()
     status_id = status.id
     in_reply_to_id = status.in_reply_to_id
     reblogged_by = status.account if status.reblog else None
@@ -237,7 +345,12 @@ def status_lines(status: Status, width: int) -> t.Generator[str, None, None]:
     yield f"ID {yellow(status_id)}  Visibility: {status.visibility}  {reply} {boost}"
 
 
-def html_lines(html: str, width: int) -> t.Generator[str, None, None]:
+def html_lines(html: str, width: int) -> t.Tuple[str, ...]:
+    """Render html as plain text lines wrapped to width. Results are cached."""
+    return render_cache.get("html_lines", html, lambda: tuple(_html_lines(html, width)), width)
+
+
+def _html_lines(html: str, width: int) -> t.Generator[str, None, None]:
     first = True
     for paragraph in html_to_paragraphs(html):
         if not first:
@@ -290,10 +403,140 @@ def render_poll_bar(text: str, width: int, perc: int):
 
 
 def print_timeline(items: t.Iterable[Status]):
-    print_divider()
-    for item in items:
-        print_status(item)
+    with buffered_output():
         print_divider()
+        for item in items:
+            print_status(item)
+            print_divider()
+
+
+def print_timeline_parallel(pages: t.Iterable[t.List[t.Dict[str, t.Any]]], workers: int):
+    """
+    Print pages of statuses, as received from the API, using a pool of worker
+    processes to render them. Output matches `print_timeline`.
+    """
+    width = get_width()
+
+    with buffered_output():
+        echo("─" * width)
+        for text in render_timeline_parallel(pages, width, workers):
+            echo(text)
+
+
+def render_timeline_parallel(
+    pages: t.Iterable[t.List[t.Dict[str, t.Any]]],
+    width: int,
+    workers: int,
+) -> t.Generator[str, None, None]:
+    """
+    Render pages of statuses, as received from the API, in worker processes.
+
+    Each page is split into one chunk per worker so that all workers render
+    it in parallel. While a page is rendered the next one is fetched. Yields
+    the rendered chunks in order, each status followed by a divider.
+    """
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending: t.Deque = deque()
+
+    try:
+        for page in pages:
+            chunk_size = max(1, -(-len(page) // workers))
+            for chunk in batched(page, chunk_size):
+                pending.append(executor.submit(_render_statuses, chunk, width))
+
+            # Output the previous page while the current one is rendered
+            while len(pending) > workers:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _render_statuses(items: t.List[t.Dict[str, t.Any]], width: int) -> str:
+    """Render statuses followed by dividers. Runs in worker processes."""
+    lines: t.List[str] = []
+    for item in items:
+        lines.extend(status_lines(from_dict(Status, item, lazy=True), width))
+        lines.append("─" * width)
+    return "\n".join(lines)
+
+
+def print_lines(lines: t.Iterable[str]):
+    """Print lines of output as they are produced, buffered."""
+    with buffered_output():
+        for line in lines:
+            echo(line)
+
+
+def print_fields(items: t.Iterable[t.Any], fields: t.List[str]):
+    """Print given fields of each item on a single line, separated by tabs."""
+    with buffered_output():
+        for item in items:
+            values = [format_field_value(get_field(item, field)) for field in fields]
+            echo("\t".join(values))
+
+
+RECORD_FORMATS = ["ndjson", "csv", "tsv"]
+
+RECORD_COLUMNS: t.Dict[type, t.List[str]] = {
+    Account: [
+        "id", "acct", "display_name", "url", "created_at", "bot", "locked",
+        "followers_count", "following_count", "statuses_count",
+    ],
+    Notification: ["id", "type", "created_at", "account.acct", "status.id", "status.url"],
+    Status: [
+        "id", "created_at", "account.acct", "visibility", "language", "url", "in_reply_to_id",
+        "reblog.id", "replies_count", "reblogs_count", "favourites_count", "content",
+    ],
+    Tag: ["name", "url", "following"],
+}
+"""Default CSV and TSV columns for each record type"""
+
+
+def print_records(
+    items: t.Iterable[t.Dict[str, t.Any]],
+    cls: type,
+    format: str,
+    fields: t.Optional[t.List[str]] = None,
+):
+    """
+    Print items as received from the API, one record per line, in the given
+    format. For CSV and TSV, `fields` are the columns, defaulting to a fixed set
+    of columns for each record type.
+    """
+    with buffered_output():
+        if format == "ndjson":
+            for item in items:
+                echo(json.dumps(item, ensure_ascii=False, separators=(",", ":")))
+            return
+
+        columns = fields or RECORD_COLUMNS[cls]
+        dialect = "excel-tab" if format == "tsv" else "excel"
+        # Each row is written in a single call, so echo can act as the file
+        writer = csv.writer(_EchoFile(), dialect, lineterminator="")
+        writer.writerow(columns)
+        for item in items:
+            record = from_dict(cls, item, fields=columns)
+            writer.writerow(format_field_value(get_field(record, column)) for column in columns)
+
+
+class _EchoFile:
+    def write(self, line: str):
+        echo(line)
+
+
+def format_field_value(value: t.Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, list):
+        return ",".join(format_field_value(v) for v in value)
+    return re.sub(r"[\t\r\n]+", " ", str(value))
 
 
 def print_notification(notification: Notification):
@@ -304,47 +547,79 @@ def print_notification(notification: Notification):
 
 
 def print_notifications(notifications: t.Iterable[Notification]):
-    for notification in notifications:
-        if notification.type not in ["pleroma:emoji_reaction"]:
-            print_divider()
-            print_notification(notification)
-    print_divider()
+    with buffered_output():
+        for notification in notifications:
+            if notification.type not in ["pleroma:emoji_reaction"]:
+                print_divider()
+                print_notification(notification)
+        print_divider()
 
 
 def print_notification_header(notification: Notification):
     account_name = format_account_name(notification.account)
+    _print_notification_message(notification.type, account_name)
+
+
+def print_notification_groups(results: GroupedNotificationsResults):
+    accounts = {account.id: account for account in results.accounts}
+    statuses = {status.id: status for status in results.statuses}
+
+    with buffered_output():
+        for group in results.notification_groups:
+            if group.type not in ["pleroma:emoji_reaction"]:
+                print_divider()
+                print_notification_group_header(group, accounts)
+
+                status = statuses.get(group.status_id) if group.status_id else None
+                if status:
+                    print_divider(char="-")
+                    print_status(status)
+        print_divider()
+
 
-    if notification.type == "follow":
-        click.echo(f"{account_name} now follows you")
-    elif notification.type == "follow_request":
-        click.echo(f"{account_name} requested to follow you")
-    elif notification.type == "mention":
-        click.echo(f"{account_name} mentioned you")
-    elif notification.type == "reblog":
-        click.echo(f"{account_name} boosted your status")
-    elif notification.type == "favourite":
-        click.echo(f"{account_name} favourited your status")
-    elif notification.type == "update":
-        click.echo(f"{account_name} edited a post")
-    elif notification.type == "status":
-        click.echo(f"{account_name} posted a status")
-    elif notification.type == "poll":
-        click.echo("A poll you participated in has ended")
-    elif notification.type == "admin.sign_up":
-        click.echo(f"{account_name} has signed up")
-    elif notification.type == "admin.report":
-        click.echo(f"{account_name} filed a report")
-    elif notification.type == "quote":
-        click.echo(f"{account_name} quoted you")
+def print_notification_group_header(group: NotificationGroup, accounts: t.Dict[str, Account]):
+    sample_accounts = [accounts[id] for id in group.sample_account_ids if id in accounts]
+    account_name = format_account_name(sample_accounts[0]) if sample_accounts else ""
+
+    others = group.notifications_count - 1
+    if account_name and others > 0:
+        account_name += f" and {others} other" + ("s" if others > 1 else "")
+
+    _print_notification_message(group.type, account_name)
+
+
+def _print_notification_message(type: str, account_name: str):
+    if type == "follow":
+        echo(f"{account_name} now follows you")
+    elif type == "follow_request":
+        echo(f"{account_name} requested to follow you")
+    elif type == "mention":
+        echo(f"{account_name} mentioned you")
+    elif type == "reblog":
+        echo(f"{account_name} boosted your status")
+    elif type == "favourite":
+        echo(f"{account_name} favourited your status")
+    elif type == "update":
+        echo(f"{account_name} edited a post")
+    elif type == "status":
+        echo(f"{account_name} posted a status")
+    elif type == "poll":
+        echo("A poll you participated in has ended")
+    elif type == "admin.sign_up":
+        echo(f"{account_name} has signed up")
+    elif type == "admin.report":
+        echo(f"{account_name} filed a report")
+    elif type == "quote":
+        echo(f"{account_name} quoted you")
     else:
         click.secho(
-            f"Unknown notification type: '{notification.type}'", err=True, fg="yellow"
+            f"Unknown notification type: '{type}'", err=True, fg="yellow"
         )
         click.secho("Please report an issue to toot.", err=True, fg="yellow")
 
 
 def print_divider(char: str = "─"):
-    click.echo(char * get_width())
+    echo(char * get_width())
 
 
 def format_tag_name(tag):
@@ -0,0 +1,149 @@
+"""
+Templates for printing entities on a single line, used for scripting.
+
+Fields are given in braces as dotted paths, optionally followed by filters and
+a format spec, separated by colons:
+
+    {id} {account.acct} {created_at:%H:%M} {content:text:80}
+
+Filters:
+    text  convert HTML to plain text
+    <n>   truncate to n columns
+
+Anything following the filters is a format spec passed to `format()`, e.g. a
+strftime format for datetimes or an alignment such as `>10`.
+"""
+
+import re
+
+from datetime import date, datetime
+from string import Formatter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from toot.entities import Data, from_dict, get_field, get_field_type, validate_fields
+from toot.output import format_field_value
+from toot.utils import html_to_paragraphs
+from toot.wcstring import trunc
+
+Filter = Callable[[str], str]
+
+# Values used to check that a format spec is valid for a field type
+_FORMAT_SAMPLES: Dict[Any, Any] = {
+    str: "",
+    int: 0,
+    float: 0.0,
+    bool: False,
+    datetime: datetime(2000, 1, 1),
+    date: date(2000, 1, 1),
+}
+
+
+class Template:
+    """A template compiled for the given entity class, see `compile_template`."""
+
+    def __init__(self, cls: type, fields: List[str], parts: List[Tuple[str, Optional[Callable[[Any], str]]]]):
+        self.cls = cls
+        self.fields = fields
+        self._parts = parts
+
+    def render(self, instance: Any) -> str:
+        """Render an entity instance, which must have all template fields converted."""
+        return "".join(literal if render is None else literal + render(instance) for literal, render in self._parts)
+
+    def render_data(self, data: Data) -> str:
+        """Render an entity as received from the API, converting only the used fields."""
+        return self.render(from_dict(self.cls, data, fields=self.fields))
+
+
+def compile_template(template: str, cls: type) -> Template:
+    """
+    Parse a template and compile it into a renderer for instances of `cls`.
+    Raises ValueError if the template is invalid, uses unknown fields or format
+    specs which are not valid for the field type.
+    """
+    fields: List[str] = []
+    parts: List[Tuple[str, Optional[Callable[[Any], str]]]] = []
+    format_specs: List[Tuple[str, str]] = []
+
+    for literal, path, spec, conversion in Formatter().parse(template):
+        if path is None:
+            parts.append((literal, None))
+            continue
+
+        if not path:
+            raise ValueError("Empty field name in template")
+        if conversion:
+            raise ValueError(f"Conversions are not supported, found `!{conversion}` in `{{{path}}}`")
+
+        if path not in fields:
+            fields.append(path)
+        filters, format_spec = _parse_spec(spec or "")
+        if format_spec:
+            format_specs.append((path, format_spec))
+        parts.append((literal, _compile_field(path, filters, format_spec)))
+
+    validate_fields(cls, fields)
+    for path, format_spec in format_specs:
+        _validate_format_spec(cls, path, format_spec)
+
+    return Template(cls, fields, parts)
+
+
+def _parse_spec(spec: str) -> Tuple[List[Filter], str]:
+    """Split a field spec into filters and a format spec."""
+    segments = spec.split(":") if spec else []
+
+    # Leading segments which are known filters, the rest is a format spec
+    filters: List[Filter] = []
+    while segments:
+        filter = _get_filter(segments[0])
+        if not filter:
+            break
+        filters.append(filter)
+        segments.pop(0)
+
+    return filters, ":".join(segments)
+
+
+def _validate_format_spec(cls: type, path: str, format_spec: str):
+    # Other types, e.g. lists and entities, don't support format specs
+    sample = _FORMAT_SAMPLES.get(get_field_type(cls, path), object())
+    try:
+        format(sample, format_spec)
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid format spec `{format_spec}` for field `{path}`")
+
+
+def _compile_field(path: str, filters: List[Filter], format_spec: str) -> Callable[[Any], str]:
+    def _render(instance: Any) -> str:
+        value = get_field(instance, path)
+        if value is None:
+            text = ""
+        elif format_spec:
+            text = format(value, format_spec)
+        else:
+            text = format_field_value(value)
+
+        for filter in filters:
+            text = filter(text)
+        return text
+
+    return _render
+
+
+def _get_filter(name: str) -> Optional[Filter]:
+    if name == "text":
+        return _html_to_text
+
+    if name.isdigit():
+        width = int(name)
+        if width < 1:
+            raise ValueError("Truncation width must be 1 or larger")
+        return lambda text: trunc(text, width) if text else text
+
+    return None
+
+
+def _html_to_text(html: str) -> str:
+    lines = (line for paragraph in html_to_paragraphs(html) for line in paragraph)
+    return re.sub(r"\s+", " ", " ".join(lines)).strip()
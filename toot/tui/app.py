@@ -3,14 +3,17 @@ import subprocess
 import urwid
 
 
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from typing import NamedTuple, Optional
 from datetime import datetime, timezone
 
-from toot import api, config, __version__, settings
+from toot import api, config, entities, http, __version__, settings
 from toot import App, User
 from toot.cli import get_default_visibility
-from toot.utils.datetime import parse_datetime
+from toot.entities import InternPool, from_dict, interning
+from toot.utils import id_sort_key
 
 from .compose import StatusComposer
 from .constants import PALETTE
@@ -31,6 +34,12 @@ urwid.set_encoding('UTF-8')
 DEFAULT_MAX_TOOT_CHARS = 500
 DEFAULT_PALETTE_KEY = 'default'
 
+# How often to save read positions to the server, in seconds
+MARKER_SAVE_INTERVAL = 60
+
+# Number of thread contexts to keep cached
+THREAD_CACHE_SIZE = 50
+
 
 class TuiOptions(NamedTuple):
     colors: int
@@ -145,6 +154,7 @@ class TUI(urwid.Frame):
         self.max_toot_chars = DEFAULT_MAX_TOOT_CHARS
 
         self.timeline = None
+        self.thread = None
         self.overlay = None
         self.exception = None
         self.can_translate = False
@@ -152,6 +162,20 @@ class TUI(urwid.Frame):
         self.followed_accounts = []
         self.preferences = {}
 
+        # Read positions for the home and notifications timelines, used to
+        # sync the last read status via the server-side markers
+        self.read_markers = {}
+        self.saved_markers = {}
+
+        # Set while newer home statuses are being loaded
+        self.loading_newer = False
+
+        # Cached thread contexts, maps status ID to (ancestors, descendants)
+        self.thread_cache = OrderedDict()
+
+        # Shares accounts and custom emoji between loaded statuses
+        self.intern_pool = InternPool()
+
         if self.options.cache_size:
             self.cache_max = 1024 * 1024 * self.options.cache_size
         else:
@@ -163,9 +187,10 @@ class TUI(urwid.Frame):
         self.loop.set_alarm_in(0, lambda *args: self.async_load_account())
         self.loop.set_alarm_in(0, lambda *args: self.async_load_instance())
         self.loop.set_alarm_in(0, lambda *args: self.async_load_preferences())
-        self.loop.set_alarm_in(0, lambda *args: self.async_load_timeline(
-            is_initial=True, timeline_name="home"))
+        self.loop.set_alarm_in(0, lambda *args: self.async_load_home_timeline())
+        self.loop.set_alarm_in(MARKER_SAVE_INTERVAL, lambda *args: self.async_save_markers())
         self.loop.run()
+        self.save_markers_on_exit()
         self.executor.shutdown(wait=False)
 
     def build_intro(self):
@@ -225,6 +250,7 @@ class TUI(urwid.Frame):
 
     def connect_default_timeline_signals(self, timeline):
         urwid.connect_signal(timeline, "focus", self.refresh_footer)
+        urwid.connect_signal(timeline, "focus", self.update_read_markers)
 
     def build_timeline(self, name, statuses, local):
         def _close(*args):
@@ -233,6 +259,9 @@ class TUI(urwid.Frame):
         def _next(*args):
             self.async_load_timeline(is_initial=False)
 
+        def _previous(timeline):
+            self.async_load_newer_statuses(timeline)
+
         def _toggle_save(timeline, status):
             if not timeline.name.startswith("#"):
                 return
@@ -254,35 +283,112 @@ class TUI(urwid.Frame):
         urwid.connect_signal(timeline, "next", _next)
         urwid.connect_signal(timeline, "close", _close)
         urwid.connect_signal(timeline, "save", _toggle_save)
+        if name == "home":
+            urwid.connect_signal(timeline, "previous", _previous)
 
         return timeline
 
     def make_status(self, status_data):
-        is_mine = self.user.username == status_data["account"]["acct"]
-        return Status(status_data, is_mine, self.app.instance)
+        with interning(self.intern_pool):
+            entity = from_dict(entities.Status, status_data)
+        return self.wrap_status(entity, status_data)
+
+    def wrap_status(self, entity: entities.Status, status_data: dict) -> Status:
+        is_mine = self.user.username == entity.account.acct
+        return Status(entity, status_data, is_mine, self.app.instance)
+
+    def replace_status(self, status: Status, data: dict, **changes) -> Status:
+        """
+        Returns a new Status with the given entity fields changed. `data` holds
+        the same changes in the form received from Mastodon, used to update
+        the source data. Does not modify the given status.
+        """
+        entity = replace(status.entity, **changes)
+        return self.wrap_status(entity, {**status.data, **data})
 
     def show_thread(self, status):
+        """
+        Show the thread containing the given status.
+
+        The thread is shown immediately, from cache if it was opened before,
+        otherwise with only the given status. The context is then loaded in
+        the background and the thread is redrawn.
+        """
+        status_id = status.original.id
+        cached = self.thread_cache.get(status_id)
+        ancestors, descendants = cached or ([], [])
+        timeline = self.build_thread(status, ancestors, descendants)
+
+        if not cached:
+            self.footer.set_message("Loading thread...")
+
+        def _load_context():
+            context = http.decode_json(api.context(self.app, self.user, status_id))
+            ancestors = [self.make_status(s) for s in context["ancestors"]]
+            descendants = [self.make_status(s) for s in context["descendants"]]
+            return ancestors, descendants
+
+        def _done(context):
+            self.footer.clear_message()
+            self.cache_thread(status_id, context)
+
+            # Don't redraw if the thread was closed in the meantime
+            if self.thread is not timeline:
+                return
+
+            focused = timeline.get_focused_status()
+            self.build_thread(status, *context, focus_id=focused.id if focused else None)
+
+        self.run_in_thread(_load_context, done_callback=_done)
+
+    def build_thread(self, status, ancestors, descendants, focus_id=None):
         def _close(*args):
             """When thread is closed, go back to the main timeline."""
+            self.thread = None
             self.body = self.timeline
             self.body.refresh_status_details()
             self.refresh_footer(self.timeline)
 
-        # This is pretty fast, so it's probably ok to block while context is
-        # loaded, can be made async later if needed
-        context = api.context(self.app, self.user, status.original.id).json()
-        ancestors = [self.make_status(s) for s in context["ancestors"]]
-        descendants = [self.make_status(s) for s in context["descendants"]]
         statuses = ancestors + [status] + descendants
         focus = len(ancestors)
+        if focus_id:
+            focus = next((n for n, s in enumerate(statuses) if s.id == focus_id), focus)
 
         timeline = Timeline(self, "thread", statuses, focus=focus, is_thread=True)
 
         self.connect_default_timeline_signals(timeline)
         urwid.connect_signal(timeline, "close", _close)
-        self.body = timeline
+        self.thread = timeline
+
+        if self.overlay:
+            self.overlay.bottom_w = timeline
+        else:
+            self.body = timeline
+
         timeline.refresh_status_details()
         self.refresh_footer(timeline)
+        return timeline
+
+    def cache_thread(self, status_id, context):
+        self.thread_cache[status_id] = context
+        self.thread_cache.move_to_end(status_id)
+        while len(self.thread_cache) > THREAD_CACHE_SIZE:
+            self.thread_cache.popitem(last=False)
+
+    def update_status(self, status):
+        """
+        Replace the status with the given one wherever it is shown: in the main
+        timeline, the open thread, and cached threads.
+        """
+        for timeline in (self.timeline, self.thread):
+            if timeline is not None and any(s.id == status.id for s in timeline.statuses):
+                timeline.update_status(status)
+
+        for ancestors, descendants in self.thread_cache.values():
+            for statuses in (ancestors, descendants):
+                for n, cached in enumerate(statuses):
+                    if cached.id == status.id:
+                        statuses[n] = status
 
     def async_load_timeline(self, is_initial, timeline_name=None, local=None, last_read_id=None):
         """Asynchronously load a list of statuses."""
@@ -300,15 +406,17 @@ class TUI(urwid.Frame):
 
         def _done_initial(statuses):
             """Process initial batch of statuses, construct a Timeline."""
+            self.thread = None
             self.timeline = self.build_timeline(timeline_name, statuses, local)
             self.timeline.refresh_status_details()  # Draw first status
 
             if last_read_id:
-                status = next((s for s in self.timeline.statuses if s.id == last_read_id), None)
+                # Focus the last read status, or the next older one if it was
+                # deleted. Newer statuses remain above it.
+                key = id_sort_key(last_read_id)
+                status = next((s for s in self.timeline.statuses if id_sort_key(s.id) <= key), None)
                 if status:
                     self.timeline.focus_status(status)
-                else:
-                    self.timeline.focus_status(self.timeline.statuses[-1])
 
             self.refresh_footer(self.timeline)
             self.body = self.timeline
@@ -321,6 +429,117 @@ class TUI(urwid.Frame):
         return self.run_in_thread(_load_statuses,
             done_callback=_done_initial if is_initial else _done_next)
 
+    def async_load_newer_statuses(self, timeline):
+        """Load the page of home statuses newer than the topmost one."""
+        if self.loading_newer or not timeline.statuses:
+            return
+
+        self.loading_newer = True
+        min_id = timeline.statuses[0].id
+
+        def _load():
+            self.footer.set_message("Loading newer statuses...")
+            response = api.home_timeline_newer(self.app, self.user, min_id, limit=40)
+            return [self.make_status(s) for s in http.decode_json(response)]
+
+        def _done(statuses):
+            self.loading_newer = False
+            if statuses:
+                timeline.prepend_statuses(statuses)
+                self.footer.clear_message()
+            else:
+                self.footer.set_message("No newer statuses")
+                self.loop.set_alarm_in(3, lambda *args: self.footer.clear_message())
+
+        def _error(ex):
+            self.loading_newer = False
+            self.exception = ex
+            self.footer.set_error_message("An exception occurred, press X to view")
+
+        return self.run_in_thread(_load, done_callback=_done, error_callback=_error)
+
+    def async_load_home_timeline(self):
+        """
+        Load the home timeline starting at the last read status, as stored in
+        the server-side marker. Newer statuses are loaded when scrolling up
+        past the first one. Falls back to loading the newest statuses if no
+        marker is saved or the server does not support markers.
+        https://docs.joinmastodon.org/methods/markers/
+        """
+        def _load_markers():
+            return http.decode_json(api.get_markers(self.app, self.user, ["home", "notifications"]))
+
+        def _load_timeline(last_read_id):
+            if last_read_id:
+                self.timeline_generator = api.home_timeline_around_generator(
+                    self.app, self.user, last_read_id, limit=40)
+            else:
+                self.timeline_generator = api.home_timeline_generator(
+                    self.app, self.user, limit=40)
+            self.async_load_timeline(is_initial=True, timeline_name="home", last_read_id=last_read_id)
+
+        def _done(markers):
+            for name, marker in markers.items():
+                self.saved_markers[name] = marker["last_read_id"]
+            _load_timeline(self.saved_markers.get("home"))
+
+        def _error(ex):
+            logger.warning(f"Failed loading markers: {ex}")
+            _load_timeline(None)
+
+        return self.run_in_thread(_load_markers, done_callback=_done, error_callback=_error)
+
+    def update_read_markers(self, timeline):
+        """Track the focused status in the home timeline as last read."""
+        if timeline.name == "home":
+            status = timeline.get_focused_status()
+            if status:
+                self.advance_read_marker("home", status.id)
+
+    def advance_read_marker(self, name, last_read_id):
+        """Move the read position forward, scrolling back to older statuses
+        does not mark them as unread."""
+        current = self.read_markers.get(name) or self.saved_markers.get(name)
+        if not current or id_sort_key(last_read_id) > id_sort_key(current):
+            self.read_markers[name] = last_read_id
+
+    def notification_timeline_generator(self):
+        """Yields batches of statuses from notifications, marking the newest
+        loaded notification as last read."""
+        first = True
+        for batch in api.notification_batch_generator(self.app, self.user, limit=40):
+            if first and batch:
+                self.advance_read_marker("notifications", batch[0]["id"])
+            first = False
+            yield [n["status"] for n in batch if n.get("status")]
+
+    def save_markers(self):
+        """Save read positions which advanced since they were last saved."""
+        changed = {
+            name: last_read_id
+            for name, last_read_id in self.read_markers.items()
+            if not self.saved_markers.get(name)
+            or id_sort_key(last_read_id) > id_sort_key(self.saved_markers[name])
+        }
+
+        if changed:
+            api.save_markers(self.app, self.user, **changed)
+            self.saved_markers.update(changed)
+
+    def async_save_markers(self):
+        """Periodically save read positions in the background."""
+        def _error(ex):
+            logger.warning(f"Failed saving markers: {ex}")
+
+        self.run_in_thread(self.save_markers, error_callback=_error)
+        self.loop.set_alarm_in(MARKER_SAVE_INTERVAL, lambda *args: self.async_save_markers())
+
+    def save_markers_on_exit(self):
+        try:
+            self.save_markers()
+        except Exception as ex:
+            logger.warning(f"Failed saving markers: {ex}")
+
     def async_load_instance(self):
         """
         Attempt to update max_toot_chars from instance data.
@@ -333,7 +552,7 @@ class TUI(urwid.Frame):
         See: https://github.com/mastodon/mastodon/issues/19328
         """
         def _load_instance():
-            return api.get_instance(self.app.base_url).json()
+            return http.decode_json(api.get_instance(self.app.base_url))
 
         def _done(instance):
             self.max_toot_chars = get_max_toot_chars(instance, DEFAULT_MAX_TOOT_CHARS)
@@ -361,7 +580,7 @@ class TUI(urwid.Frame):
         https://docs.joinmastodon.org/methods/preferences/
         """
         def _load_preferences():
-            return api.get_preferences(self.app, self.user).json()
+            return http.decode_json(api.get_preferences(self.app, self.user))
 
         def _done(preferences):
             self.preferences = preferences
@@ -370,7 +589,7 @@ class TUI(urwid.Frame):
 
     def async_load_account(self):
         def _load_account():
-            return api.verify_credentials(self.app, self.user).json()
+            return http.decode_json(api.verify_credentials(self.app, self.user))
 
         def _done_account(account):
             self.account = account
@@ -411,14 +630,14 @@ class TUI(urwid.Frame):
         self.screen.clear()
 
     def show_links(self, status):
-        links = parse_content_links(status.original.data["content"]) if status else []
-        post_attachments = status.original.data["media_attachments"] or []
-        reblog_attachments = (status.data["reblog"]["media_attachments"] if status.data["reblog"] else None) or []
+        links = parse_content_links(status.original.entity.content) if status else []
+        post_attachments = status.original.entity.media_attachments
+        reblog_attachments = status.reblog.entity.media_attachments if status.reblog else []
 
         for a in post_attachments + reblog_attachments:
-            url = a["remote_url"] or a["url"]
+            url = a.remote_url or a.url
             url = url.strip()
-            description = a["description"] if a["description"] else url
+            description = a.description if a.description else url
             # Sanitize: remove newlines, collapse multiple spaces
             sanitized_desc = ' '.join(description.replace('\n', ' ').replace('\r', ' ').split())
             # Truncate to 120 chars with ellipsis if needed
@@ -476,7 +695,7 @@ class TUI(urwid.Frame):
 
     def async_edit(self, status):
         def _fetch_source():
-            return api.fetch_status_source(self.app, self.user, status.id).json()
+            return http.decode_json(api.fetch_status_source(self.app, self.user, status.id))
 
         def _done(source):
             self.close_overlay()
@@ -530,11 +749,19 @@ class TUI(urwid.Frame):
     def show_help(self):
         self.open_overlay(Help(), title="Help")
 
-    def show_poll(self, status):
-        self.open_overlay(
-            widget=Poll(self.app, self.user, status),
-            title="Poll",
-        )
+    def show_poll(self, timeline, status):
+        def _vote(poll_widget, poll, poll_data):
+            # Create a new Status with the updated poll
+            original = self.replace_status(status.original, {"poll": poll_data}, poll=poll)
+            if status.reblog:
+                new_status = self.replace_status(status, {"reblog": original.data}, reblog=original.entity)
+            else:
+                new_status = original
+            self.update_status(new_status)
+
+        poll = Poll(self.app, self.user, status)
+        urwid.connect_signal(poll, "vote", _vote)
+        self.open_overlay(widget=poll, title="Poll")
 
     def goto_home_timeline(self):
         self.timeline_generator = api.home_timeline_generator(
@@ -556,8 +783,7 @@ class TUI(urwid.Frame):
         promise.add_done_callback(lambda *args: self.close_overlay())
 
     def goto_notifications(self):
-        self.timeline_generator = api.notification_timeline_generator(
-            self.app, self.user, limit=40)
+        self.timeline_generator = self.notification_timeline_generator()
         promise = self.async_load_timeline(is_initial=True, timeline_name="notifications")
         promise.add_done_callback(lambda *args: self.close_overlay())
 
@@ -595,7 +821,7 @@ class TUI(urwid.Frame):
         promise.add_done_callback(lambda *args: self.close_overlay())
 
     def show_media(self, status):
-        urls = [m["url"] for m in status.original.data["media_attachments"]]
+        urls = [m.url for m in status.original.entity.media_attachments]
         if not urls:
             return
 
@@ -634,14 +860,15 @@ class TUI(urwid.Frame):
         ))
 
     def post_status(self, content, warning, visibility, in_reply_to_id):
-        data = api.post_status(
+        response = api.post_status(
             self.app,
             self.user,
             content,
             spoiler_text=warning,
             visibility=visibility,
             in_reply_to_id=in_reply_to_id
-        ).json()
+        )
+        data = http.decode_json(response)
 
         status = self.make_status(data)
 
@@ -654,21 +881,23 @@ class TUI(urwid.Frame):
         # We don't support editing polls (yet), so to avoid losing the poll
         # data from the original toot, copy it to the edit request.
         poll_args = {}
-        poll = status.original.data.get('poll', None)
+        poll = status.original.entity.poll
 
         if poll is not None:
-            poll_args['poll_options'] = [o['title'] for o in poll['options']]
-            poll_args['poll_multiple'] = poll['multiple']
+            poll_args['poll_options'] = [o.title for o in poll.options]
+            poll_args['poll_multiple'] = poll.multiple
 
             # Convert absolute expiry time into seconds from now.
-            expires_at = parse_datetime(poll['expires_at'])
-            expires_in = int((expires_at - datetime.now(timezone.utc)).total_seconds())
-            poll_args['poll_expires_in'] = expires_in
+            if poll.expires_at:
+                expires_in = int((poll.expires_at - datetime.now(timezone.utc)).total_seconds())
+                poll_args['poll_expires_in'] = expires_in
 
-            if 'hide_totals' in poll:
-                poll_args['poll_hide_totals'] = poll['hide_totals']
+            # Not part of the Poll entity, but kept if the server sends it
+            poll_data = status.original.data.get('poll') or {}
+            if 'hide_totals' in poll_data:
+                poll_args['poll_hide_totals'] = poll_data['hide_totals']
 
-        data = api.edit_status(
+        response = api.edit_status(
             self.app,
             self.user,
             status.id,
@@ -676,15 +905,15 @@ class TUI(urwid.Frame):
             spoiler_text=warning,
             visibility=visibility,
             **poll_args
-        ).json()
+        )
+        data = http.decode_json(response)
 
         new_status = self.make_status(data)
 
         self.footer.set_message("Status edited {} \\o/".format(status.id))
         self.close_overlay()
 
-        if self.timeline is not None:
-            self.timeline.update_status(new_status)
+        self.update_status(new_status)
 
     def show_account(self, account_id):
         account = api.whois(self.app, self.user, account_id)
@@ -703,10 +932,9 @@ class TUI(urwid.Frame):
 
         def _done(loop):
             # Create a new Status with flipped favourited flag
-            new_data = status.data
-            new_data["favourited"] = not status.favourited
-            new_status = self.make_status(new_data)
-            timeline.update_status(new_status)
+            favourited = not status.favourited
+            new_status = self.replace_status(status, {"favourited": favourited}, favourited=favourited)
+            self.update_status(new_status)
 
         self.run_in_thread(
             _unfavourite if status.favourited else _favourite,
@@ -722,10 +950,13 @@ class TUI(urwid.Frame):
 
         def _done(loop):
             # Create a new Status with flipped reblogged flag
-            new_data = status.data
-            new_status = self.make_status(new_data)
-            new_status.original.reblogged = not status.original.reblogged
-            timeline.update_status(new_status)
+            reblogged = not status.original.reblogged
+            original = self.replace_status(status.original, {"reblogged": reblogged}, reblogged=reblogged)
+            if status.reblog:
+                new_status = self.replace_status(status, {"reblog": original.data}, reblog=original.entity)
+            else:
+                new_status = original
+            self.update_status(new_status)
 
         # Check if status is rebloggable
         no_reblog_because_private = status.visibility == "private" and not status.is_mine
@@ -780,10 +1011,9 @@ class TUI(urwid.Frame):
 
         def _done(loop):
             # Create a new Status with flipped bookmarked flag
-            new_data = status.data
-            new_data["bookmarked"] = not status.bookmarked
-            new_status = self.make_status(new_data)
-            timeline.update_status(new_status)
+            bookmarked = not status.bookmarked
+            new_status = self.replace_status(status, {"bookmarked": bookmarked}, bookmarked=bookmarked)
+            self.update_status(new_status)
 
         self.run_in_thread(
             _unbookmark if status.bookmarked else _bookmark,
@@ -823,7 +1053,7 @@ class TUI(urwid.Frame):
     def copy_status(self, status):
         # TODO: copy a better version of status content
         # including URLs
-        copy_to_clipboard(self.screen, status.original.data["content"])
+        copy_to_clipboard(self.screen, status.original.entity.content)
         self.footer.set_message(f"Status {status.original.id} copied")
 
     # --- Overlay handling -----------------------------------------------------
@@ -879,13 +1109,16 @@ class TUI(urwid.Frame):
                 self.timeline_generator = api.public_timeline_generator(
                     self.app, self.user, local=self.timeline.name.startswith("local"), limit=40)
             elif self.timeline.name == "notifications":
-                self.timeline_generator = api.notification_timeline_generator(
-                    self.app, self.user, limit=40)
+                self.timeline_generator = self.notification_timeline_generator()
             elif self.timeline.name == "conversations":
                 self.timeline_generator = api.conversation_timeline_generator(
                     self.app, self.user, limit=40)
+            elif last_read_id:
+                # default to home timeline, starting at the focused status,
+                # newer statuses are loaded when scrolling up
+                self.timeline_generator = api.home_timeline_around_generator(
+                    self.app, self.user, last_read_id, limit=40)
             else:
-                # default to home timeline
                 self.timeline_generator = api.home_timeline_generator(
                     self.app, self.user, limit=40)
 
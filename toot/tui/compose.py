@@ -34,15 +34,15 @@ class StatusComposer(urwid.Frame):
 
         if edit:
             if source is None:
-                text = edit.data["content"]
+                text = edit.entity.content
             else:
-                text = source.get("text", edit.data["content"])
+                text = source.get("text", edit.entity.content)
 
                 if 'spoiler_text' in source:
                     self.cw_edit = EditBox(multiline=True, allow_tab=True,
                                            edit_text=source['spoiler_text'])
 
-            self.visibility = edit.data["visibility"]
+            self.visibility = edit.visibility
 
         else:   # not edit
             text = self.get_initial_text(in_reply_to)
@@ -72,7 +72,7 @@ class StatusComposer(urwid.Frame):
             return ""
 
         text = '' if in_reply_to.is_mine else '@{} '.format(in_reply_to.original.account)
-        mentions = ['@{}'.format(m["acct"]) for m in in_reply_to.mentions if m["acct"] != self.username]
+        mentions = ['@{}'.format(m.acct) for m in in_reply_to.mentions if m.acct != self.username]
         if mentions:
             text += '\n\n{}'.format(' '.join(mentions))
 
@@ -1,18 +1,27 @@
 from collections import namedtuple
+from datetime import datetime
+from typing import List, Optional
 
-from toot.utils.datetime import parse_datetime
+from toot import entities
 
 Author = namedtuple("Author", ["account", "display_name", "username"])
 
 
 class Status:
     """
-    A wrapper around the Status entity data fetched from Mastodon.
+    A status shown in the TUI.
 
-    https://github.com/tootsuite/documentation/blob/master/Using-the-API/API.md#status
+    Wraps the status entity, as received from Mastodon, and holds state which
+    is only used by the TUI.
 
     Attributes
     ----------
+    entity : toot.entities.Status
+        The wrapped status entity.
+
+    data : dict
+        The status as received from Mastodon, shown when viewing the source.
+
     reblog : Status or None
         The reblogged status if it exists.
 
@@ -20,13 +29,17 @@ class Status:
         If a reblog, the reblogged status, otherwise self.
     """
 
-    def __init__(self, data, is_mine, default_instance):
+    def __init__(self, entity: entities.Status, data: dict, is_mine: bool, default_instance: str):
         """
         Parameters
         ----------
+        entity : toot.entities.Status
+            Status converted to an entity.
+
         data : dict
-            Status data as received from Mastodon.
-            https://docs.joinmastodon.org/api/entities/#status
+            Status data as received from Mastodon, from which the entity was
+            converted.
+            https://docs.joinmastodon.org/entities/Status/
 
         is_mine : bool
             Whether the status was created by the logged in user.
@@ -37,6 +50,7 @@ class Status:
             Mastodon only populates the name, not the domain.
         """
 
+        self.entity = entity
         self.data = data
         self.is_mine = is_mine
         self.default_instance = default_instance
@@ -49,45 +63,70 @@ class Status:
         self.translation = None
         self.translated_from = None
 
-        # TODO: clean up
-        self.id = self.data["id"]
         self.account = self._get_account()
-        self.created_at = parse_datetime(data["created_at"])
-        if data.get("edited_at"):
-            self.edited_at = parse_datetime(data["edited_at"])
-        else:
-            self.edited_at = None
         self.author = self._get_author()
-        self.favourited = data.get("favourited", False)
-        self.reblogged = data.get("reblogged", False)
-        self.bookmarked = data.get("bookmarked", False)
-        self.in_reply_to = data.get("in_reply_to_id")
-        self.url = data.get("url")
-        self.mentions = data.get("mentions")
         self.reblog = self._get_reblog()
-        self.visibility = data.get("visibility")
 
     @property
-    def original(self):
+    def id(self) -> str:
+        return self.entity.id
+
+    @property
+    def created_at(self) -> datetime:
+        return self.entity.created_at
+
+    @property
+    def edited_at(self) -> Optional[datetime]:
+        return self.entity.edited_at
+
+    @property
+    def favourited(self) -> bool:
+        return bool(self.entity.favourited)
+
+    @property
+    def reblogged(self) -> bool:
+        return bool(self.entity.reblogged)
+
+    @property
+    def bookmarked(self) -> bool:
+        return bool(self.entity.bookmarked)
+
+    @property
+    def in_reply_to(self) -> Optional[str]:
+        return self.entity.in_reply_to_id
+
+    @property
+    def url(self) -> Optional[str]:
+        return self.entity.url
+
+    @property
+    def mentions(self) -> List[entities.StatusMention]:
+        return self.entity.mentions
+
+    @property
+    def visibility(self) -> str:
+        return self.entity.visibility
+
+    @property
+    def original(self) -> "Status":
         return self.reblog or self
 
-    def _get_reblog(self):
-        reblog = self.data.get("reblog")
+    def _get_reblog(self) -> Optional["Status"]:
+        reblog = self.entity.reblog
         if not reblog:
             return None
 
         reblog_is_mine = self.is_mine and (
-            self.data["account"]["acct"] == reblog["account"]["acct"]
+            self.entity.account.acct == reblog.account.acct
         )
-        return Status(reblog, reblog_is_mine, self.default_instance)
+        return Status(reblog, self.data["reblog"], reblog_is_mine, self.default_instance)
 
-    def _get_author(self):
-        acct = self.data['account']['acct']
-        acct = acct if "@" in acct else "{}@{}".format(acct, self.default_instance)
-        return Author(acct, self.data['account']['display_name'], self.data['account']['username'])
+    def _get_author(self) -> Author:
+        account = self.entity.account
+        return Author(self.account, account.display_name, account.username)
 
-    def _get_account(self):
-        acct = self.data['account']['acct']
+    def _get_account(self) -> str:
+        acct = self.entity.account.acct
         return acct if "@" in acct else "{}@{}".format(acct, self.default_instance)
 
     def __repr__(self):
@@ -4,7 +4,7 @@ import urwid
 import webbrowser
 
 from toot import __version__
-from toot import api
+from toot import api, http
 
 from toot.tui.utils import highlight_keys
 from toot.tui.images import image_support_enabled, load_image, graphics_widget
@@ -364,17 +364,17 @@ def take_action(button: Button, self: Account):
     action = button.get_label()
 
     if action == "Confirm Follow":
-        self.relationship = api.follow(self.app, self.user, self.account["id"]).json()
+        self.relationship = http.decode_json(api.follow(self.app, self.user, self.account["id"]))
     elif action == "Confirm Unfollow":
-        self.relationship = api.unfollow(self.app, self.user, self.account["id"]).json()
+        self.relationship = http.decode_json(api.unfollow(self.app, self.user, self.account["id"]))
     elif action == "Confirm Mute":
-        self.relationship = api.mute(self.app, self.user, self.account["id"]).json()
+        self.relationship = http.decode_json(api.mute(self.app, self.user, self.account["id"]))
     elif action == "Confirm Unmute":
-        self.relationship = api.unmute(self.app, self.user, self.account["id"]).json()
+        self.relationship = http.decode_json(api.unmute(self.app, self.user, self.account["id"]))
     elif action == "Confirm Block":
-        self.relationship = api.block(self.app, self.user, self.account["id"]).json()
+        self.relationship = http.decode_json(api.block(self.app, self.user, self.account["id"]))
     elif action == "Confirm Unblock":
-        self.relationship = api.unblock(self.app, self.user, self.account["id"]).json()
+        self.relationship = http.decode_json(api.unblock(self.app, self.user, self.account["id"]))
 
     self.last_action = None
     self.setup_listbox()
@@ -1,8 +1,8 @@
 import urwid
 
 from toot import api
+from toot.entities import Poll as PollEntity, from_dict
 from toot.exceptions import ApiError
-from toot.utils.datetime import parse_datetime
 from .widgets import Button, CheckBox, RadioButton, RoundedLineBox
 from .richtext import html_to_widgets
 
@@ -10,11 +10,13 @@ from .richtext import html_to_widgets
 class Poll(urwid.ListBox):
     """View and vote on a poll"""
 
+    signals = ["vote"]
+
     def __init__(self, app, user, status):
         self.status = status
         self.app = app
         self.user = user
-        self.poll = status.original.data.get("poll")
+        self.poll = status.original.entity.poll
         self.button_group = []
         self.api_exception = None
         self.setup_listbox()
@@ -30,7 +32,7 @@ class Poll(urwid.ListBox):
         return RoundedLineBox(contents)
 
     def vote(self, button_widget):
-        poll = self.status.original.data.get("poll")
+        poll = self.poll
         choices = []
         for idx, button in enumerate(self.button_group):
             if button.get_state():
@@ -38,11 +40,11 @@ class Poll(urwid.ListBox):
 
         if len(choices):
             try:
-                response = api.vote(self.app, self.user, poll["id"], choices=choices)
-                self.status.original.data["poll"] = response
+                response = api.vote(self.app, self.user, poll.id, choices=choices)
+                poll_data = {**response, "voted": True, "own_votes": choices}
+                self.poll = from_dict(PollEntity, poll_data)
                 self.api_exception = None
-                self.poll["voted"] = True
-                self.poll["own_votes"] = choices
+                self._emit("vote", self.poll, poll_data)
             except ApiError as exception:
                 self.api_exception = exception
             finally:
@@ -52,33 +54,31 @@ class Poll(urwid.ListBox):
         poll = self.poll
 
         self.button_group = []  # button group
-        for idx, option in enumerate(poll["options"]):
+        for idx, option in enumerate(poll.options):
             voted_for = (
-                poll["voted"] and poll["own_votes"] and idx in poll["own_votes"]
+                poll.voted and poll.own_votes and idx in poll.own_votes
             )
 
-            if poll["voted"] or poll["expired"]:
+            if poll.voted or poll.expired:
                 prefix = " ✓  " if voted_for else "    "
-                yield urwid.Text(("dim", prefix + f'{option["title"]}'))
+                yield urwid.Text(("dim", prefix + f'{option.title}'))
             else:
-                if poll["multiple"]:
-                    checkbox = CheckBox(f'{option["title"]}')
+                if poll.multiple:
+                    checkbox = CheckBox(f'{option.title}')
                     self.button_group.append(checkbox)
                     yield checkbox
                 else:
-                    yield RadioButton(self.button_group, f'{option["title"]}')
+                    yield RadioButton(self.button_group, f'{option.title}')
 
         yield urwid.Divider()
 
-        poll_detail = "Poll · {} votes".format(poll["votes_count"])
+        poll_detail = "Poll · {} votes".format(poll.votes_count)
 
-        if poll["expired"]:
+        if poll.expired:
             poll_detail += " · Closed"
 
-        if poll["expires_at"]:
-            expires_at = parse_datetime(poll["expires_at"]).strftime(
-                "%Y-%m-%d %H:%M"
-            )
+        if poll.expires_at:
+            expires_at = poll.expires_at.strftime("%Y-%m-%d %H:%M")
             poll_detail += " · Closes on {}".format(expires_at)
 
         yield urwid.Text(("dim", poll_detail))
@@ -86,7 +86,7 @@ class Poll(urwid.ListBox):
     def generate_contents(self, status):
         yield urwid.Divider()
 
-        widgetlist = html_to_widgets(status.data["content"])
+        widgetlist = html_to_widgets(status.entity.content)
 
         for line in widgetlist:
             yield (line)
@@ -95,9 +95,9 @@ class Poll(urwid.ListBox):
         yield self.build_linebox(self.generate_poll_detail())
         yield urwid.Divider()
 
-        if self.poll["voted"]:
+        if self.poll.voted:
             yield urwid.Text(("grey", "< Already Voted >"))
-        elif not self.poll["expired"]:
+        elif not self.poll.expired:
             yield Button("Vote", on_press=self.vote)
 
         if self.api_exception:
@@ -2,11 +2,13 @@ import re
 import urwid
 import unicodedata
 
+from bs4 import BeautifulSoup
 from bs4.element import NavigableString, Tag
+from toot.cache import render_cache
 from toot.tui.constants import PALETTE
 from toot.urwidgets import Hyperlink, TextEmbed
 from toot.utils import parse_html, urlencode_url
-from typing import List, Tuple
+from typing import Any, Callable, List, Tuple
 from urwid.util import decompose_tagmarkup
 
 
@@ -16,47 +18,83 @@ STYLE_NAMES = [p[0] for p in PALETTE]
 BLOCK_TAGS = ["p", "pre", "li", "blockquote", "h1", "h2", "h3", "h4", "h5", "h6"]
 
 
-def html_to_widgets(html, recovery_attempt=False) -> List[urwid.Widget]:
-    """Convert html to urwid widgets"""
-    widgets: List[urwid.Widget] = []
+class Block:
+    """
+    A widget which is yet to be built, by calling `build` with the given
+    arguments. Arguments are urwid markup, or other blocks.
+
+    HTML is rendered to blocks rather than widgets so that the result can be
+    cached and shared, while each view gets its own widgets, since widgets
+    hold state such as focus.
+    """
+    __slots__ = ("build", "args")
+
+    def __init__(self, build: Callable[..., urwid.Widget], *args: Any):
+        self.build = build
+        self.args = args
+
+    def to_widget(self) -> urwid.Widget:
+        return self.build(*self.args)
+
+
+def html_to_widgets(html) -> List[urwid.Widget]:
+    """
+    Convert html to urwid widgets. The rendered markup is cached, but new
+    widgets are built from it on each call.
+    """
+    blocks = render_cache.get("rich_html_blocks", html, lambda: _html_to_blocks(html))
+    return [block.to_widget() for block in blocks]
+
+
+def _html_to_blocks(html) -> Tuple[Block, ...]:
+    return _soup_to_blocks(_parse_rich_html(html))
+
+
+def _parse_rich_html(html, recovery_attempt=False) -> BeautifulSoup:
     html = unicodedata.normalize("NFKC", html)
     soup = parse_html(html)
 
-    first_tag = True
+    if not recovery_attempt:
+        first = next(iter(soup.body or soup), None)
+        # if our first "tag" is a navigable string the HTML is out of spec,
+        # doesn't start with a tag, we see this in content from Pixelfed
+        # servers. Likewise if it starts with a tag, but not a block tag.
+        # Attempt a fix by wrapping the HTML with <p></p>
+        if isinstance(first, NavigableString) or (first is not None and first.name not in BLOCK_TAGS):
+            return _parse_rich_html(f"<p>{html}</p>", recovery_attempt=True)
+
+    return soup
+
+
+def _soup_to_blocks(soup: BeautifulSoup) -> Tuple[Block, ...]:
+    blocks: List[Block] = []
+
     for e in soup.body or soup:
         if isinstance(e, NavigableString):
-            if first_tag and not recovery_attempt:
-                # if our first "tag" is a navigable string
-                # the HTML is out of spec, doesn't start with a tag,
-                # we see this in content from Pixelfed servers.
-                # attempt a fix by wrapping the HTML with <p></p>
-                return html_to_widgets(f"<p>{html}</p>", recovery_attempt=True)
-            else:
-                continue
-        else:
-            name = e.name
-            # if our HTML starts with a tag, but not a block tag
-            # the HTML is out of spec. Attempt a fix by wrapping the
-            # HTML with <p></p>
-            if (first_tag and not recovery_attempt and name not in BLOCK_TAGS):
-                return html_to_widgets(f"<p>{html}</p>", recovery_attempt=True)
+            continue
 
-            markup = render(name, e)
-            first_tag = False
+        markup = render(e.name, e)
 
-        if not isinstance(markup, urwid.Widget):
+        if not isinstance(markup, Block):
             # plaintext, so create a padded text widget
-            txt = text_to_widget("", markup)
-            markup = urwid.Padding(
-                txt,
-                align="left",
-                width=("relative", 100),
-                min_width=None,
-            )
-        widgets.append(markup)
+            markup = Block(_padded_text_widget, markup)
+        blocks.append(markup)
         # separate top level widgets with a blank line
-        widgets.append(urwid.Divider(" "))
-    return widgets[:-1]  # but suppress the last blank line
+        blocks.append(Block(urwid.Divider, " "))
+    return tuple(blocks[:-1])  # but suppress the last blank line
+
+
+def _padded_text_widget(markup) -> urwid.Widget:
+    return urwid.Padding(
+        text_to_widget("", markup),
+        align="left",
+        width=("relative", 100),
+        min_width=None,
+    )
+
+
+def _pile_widget(blocks: List[Block]) -> urwid.Widget:
+    return urwid.Pile([block.to_widget() for block in blocks])
 
 
 def url_to_widget(url: str):
@@ -84,7 +122,7 @@ def process_inline_tag_children(tag) -> List:
             markup = render(child.name, child)
             markups.append(markup)
         else:
-            markups.append(child)
+            markups.append(str(child))
     return markups
 
 
@@ -119,9 +157,9 @@ def text_to_widget(attr, markup) -> urwid.Widget:
     return TextEmbed(markup_list)
 
 
-def process_block_tag_children(tag) -> List[urwid.Widget]:
+def process_block_tag_children(tag) -> List[Block]:
     """Recursively retrieve all children
-    and convert to a list of widgets
+    and convert to a list of blocks
     any inline tags containing text will be
     converted to Text widgets"""
 
@@ -135,7 +173,7 @@ def process_block_tag_children(tag) -> List[urwid.Widget]:
             # child is a nested tag; process using custom method
             # or default to inline_tag_to_text
             result = render(child.name, child)
-            if isinstance(result, urwid.Widget):
+            if isinstance(result, Block):
                 found_nested_widget = True
                 child_widgets.append(result)
             else:
@@ -146,19 +184,19 @@ def process_block_tag_children(tag) -> List[urwid.Widget]:
         else:
             # child is text; append to the appropriate markup list
             if not found_nested_widget:
-                pre_widget_markups.append(child)
+                pre_widget_markups.append(str(child))
             else:
-                post_widget_markups.append(child)
+                post_widget_markups.append(str(child))
 
     widget_list = []
     if len(pre_widget_markups):
-        widget_list.append(text_to_widget(tag.name, pre_widget_markups))
+        widget_list.append(Block(text_to_widget, tag.name, pre_widget_markups))
 
     if len(child_widgets):
         widget_list += child_widgets
 
     if len(post_widget_markups):
-        widget_list.append(text_to_widget(tag.name, post_widget_markups))
+        widget_list.append(Block(text_to_widget, tag.name, post_widget_markups))
 
     return widget_list
 
@@ -181,9 +219,9 @@ def get_urwid_attr_name(tag) -> str:
     return tag.name
 
 
-def basic_block_tag_handler(tag) -> urwid.Widget:
+def basic_block_tag_handler(tag) -> Block:
     """default for block tags that need no special treatment"""
-    return urwid.Pile(process_block_tag_children(tag))
+    return Block(_pile_widget, process_block_tag_children(tag))
 
 
 def get_best_anchor_attr(attrib_list) -> str:
@@ -279,11 +317,14 @@ def render_anchor(tag) -> Tuple:
     return (attr, title)
 
 
-def render_blockquote(tag) -> urwid.Widget:
-    widget_list = process_block_tag_children(tag)
+def render_blockquote(tag) -> Block:
+    return Block(_blockquote_widget, process_block_tag_children(tag))
+
+
+def _blockquote_widget(blocks: List[Block]) -> urwid.Widget:
     blockquote_widget = urwid.LineBox(
         urwid.Padding(
-            urwid.Pile(widget_list),
+            _pile_widget(blocks),
             align="left",
             width=("relative", 100),
             min_width=None,
@@ -321,7 +362,7 @@ def render_em(tag) -> Tuple:
     return ("i", markups)
 
 
-def render_ol(tag) -> urwid.Widget:
+def render_ol(tag) -> Block:
     """ordered list tag handler"""
 
     widgets = []
@@ -347,33 +388,39 @@ def render_ol(tag) -> urwid.Widget:
             except ValueError:
                 pass
 
-        if not isinstance(markup, urwid.Widget):
-            txt = text_to_widget("li", [str(list_item_num), ". ", markup])
+        if not isinstance(markup, Block):
+            txt = Block(text_to_widget, "li", [str(list_item_num), ". ", markup])
             # 1. foo, 2. bar, etc.
             widgets.append(txt)
         else:
-            txt = text_to_widget("li", [str(list_item_num), ". "])
-            columns = urwid.Columns(
-                [txt, ("weight", 9999, markup)], dividechars=1, min_width=3
-            )
-            widgets.append(columns)
+            widgets.append(Block(_list_item_widget, [str(list_item_num), ". "], markup))
 
         list_item_num += increment
 
-    return urwid.Pile(widgets)
+    return Block(_pile_widget, widgets)
 
 
-def render_pre(tag) -> urwid.Widget:
+def _list_item_widget(bullet, block: Block) -> urwid.Widget:
+    txt = text_to_widget("li", bullet)
+    return urwid.Columns(
+        [txt, ("weight", 9999, block.to_widget())], dividechars=1, min_width=3
+    )
+
+
+def render_pre(tag) -> Block:
     # <PRE> tag spec says that text should not wrap,
     # but horizontal screen space is at a premium
     # and we have no horizontal scroll bar, so allow
     # wrapping.
 
-    widget_list = [urwid.Divider(" ")]
+    widget_list = [Block(urwid.Divider, " ")]
     widget_list += process_block_tag_children(tag)
+    return Block(_pre_widget, widget_list)
+
 
+def _pre_widget(blocks: List[Block]) -> urwid.Widget:
     pre_widget = urwid.Padding(
-        urwid.Pile(widget_list),
+        _pile_widget(blocks),
         align="left",
         width=("relative", 100),
         min_width=None,
@@ -431,7 +478,7 @@ def render_strong(tag) -> Tuple:
     return ("b", markups)
 
 
-def render_ul(tag) -> urwid.Widget:
+def render_ul(tag) -> Block:
     """unordered list tag handler"""
 
     widgets = []
@@ -439,18 +486,14 @@ def render_ul(tag) -> urwid.Widget:
     for li in tag.find_all("li", recursive=False):
         markup = render("li", li)
 
-        if not isinstance(markup, urwid.Widget):
-            txt = text_to_widget("li", ["\N{bullet} ", markup])
+        if not isinstance(markup, Block):
+            txt = Block(text_to_widget, "li", ["\N{bullet} ", markup])
             # * foo, * bar, etc.
             widgets.append(txt)
         else:
-            txt = text_to_widget("li", ["\N{bullet} "])
-            columns = urwid.Columns(
-                [txt, ("weight", 9999, markup)], dividechars=1, min_width=3
-            )
-            widgets.append(columns)
+            widgets.append(Block(_list_item_widget, ["\N{bullet} "], markup))
 
-    return urwid.Pile(widgets)
+    return Block(_pile_widget, widgets)
 
 
 def flatten(data):
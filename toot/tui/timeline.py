@@ -8,10 +8,11 @@ from typing import List, Optional
 from toot.tui import app
 
 from toot.tui.richtext import html_to_widgets, url_to_widget
-from toot.utils.datetime import parse_datetime, time_ago
+from toot.utils.datetime import time_ago
 from toot.utils.language import language_name
 
-from toot.entities import Status
+from toot.entities import Poll, PreviewCard
+from toot.tui.entities import Status
 from toot.tui.scroll import Scrollable, ScrollBar
 
 from toot.tui.utils import highlight_keys
@@ -32,6 +33,7 @@ class Timeline(urwid.Columns):
         "close",  # Close thread
         "focus",  # Focus changed
         "next",   # Fetch more statuses
+        "previous",  # Fetch newer statuses
         "save",   # Save current timeline
     ]
 
@@ -102,8 +104,8 @@ class Timeline(urwid.Columns):
         if not status:
             return None
 
-        poll = status.original.data.get("poll")
-        show_media = status.original.data["media_attachments"] and self.tui.options.media_viewer
+        poll = status.original.entity.poll
+        show_media = status.original.entity.media_attachments and self.tui.options.media_viewer
 
         options = [
             "[A]ccount" if not status.is_mine else "",
@@ -117,7 +119,7 @@ class Timeline(urwid.Columns):
             "L[i]nks",
             "[M]edia" if show_media else "",
             "[R]eply",
-            "[P]oll" if poll and not poll["expired"] else "",
+            "[P]oll" if poll and not poll.expired else "",
             "So[u]rce",
             "[Z]oom",
             "Tra[n]slate" if self.tui.can_translate else "",
@@ -190,8 +192,13 @@ class Timeline(urwid.Columns):
             if index >= count:
                 self._emit("next")
 
+        # If up is pressed on the first status emit a signal to load newer ones
+        if command in [urwid.CURSOR_UP, urwid.CURSOR_PAGE_UP] \
+                and self.status_list.body.focus == 0:
+            self._emit("previous")
+
         if key in ("a", "A"):
-            account_id = status.original.data["account"]["id"]
+            account_id = status.original.entity.account.id
             self.tui.show_account(account_id)
             return
 
@@ -235,9 +242,9 @@ class Timeline(urwid.Columns):
             return
 
         if key == "p":
-            poll = status.original.data.get("poll")
-            if poll and not poll["expired"]:
-                self.tui.show_poll(status)
+            poll = status.original.entity.poll
+            if poll and not poll.expired:
+                self.tui.show_poll(self, status)
             return
 
         if key == "P":
@@ -294,6 +301,11 @@ class Timeline(urwid.Columns):
         self.statuses.insert(0, status)
         self.status_list.body.insert(0, self.build_list_item(status))
 
+    def prepend_statuses(self, statuses):
+        """Insert statuses at the top, keeping the focused status in focus."""
+        self.statuses[0:0] = statuses
+        self.status_list.body[0:0] = [self.build_list_item(s) for s in statuses]
+
     def append_statuses(self, statuses):
         for status in statuses:
             self.append_status(status)
@@ -419,7 +431,7 @@ class StatusDetails(urwid.Pile):
             return placeholder
 
     def author_header(self, reblogged_by):
-        avatar_url = self.status.original.data["account"]["avatar"]
+        avatar_url = self.status.original.entity.account.avatar
 
         if avatar_url and image_support_enabled():
             aimg = self.image_widget(avatar_url, 2)
@@ -449,65 +461,64 @@ class StatusDetails(urwid.Pile):
         yield self.author_header(reblogged_by)
         yield ("pack", urwid.Divider())
 
-        if status.data["spoiler_text"]:
-            yield ("pack", urwid.Text(status.data["spoiler_text"]))
+        if status.entity.spoiler_text:
+            yield ("pack", urwid.Text(status.entity.spoiler_text))
             yield ("pack", urwid.Divider())
 
         # Show content warning
-        if status.data["spoiler_text"] and not status.show_sensitive and not self.options.always_show_sensitive:
+        if status.entity.spoiler_text and not status.show_sensitive and not self.options.always_show_sensitive:
             yield ("pack", urwid.Text(("content_warning", "Marked as sensitive. Press S to view.")))
         else:
-            if status.data["spoiler_text"]:
+            if status.entity.spoiler_text:
                 yield ("pack", urwid.Text(("content_warning", "Marked as sensitive.")))
 
-            content = status.original.translation if status.original.show_translation else status.data["content"]
+            content = status.original.translation if status.original.show_translation else status.entity.content
             widgetlist = html_to_widgets(content)
 
             for line in widgetlist:
                 yield (line)
 
-            media = status.data["media_attachments"]
+            media = status.entity.media_attachments
             if media:
                 for m in media:
                     yield ("pack", urwid.AttrMap(urwid.Divider("-"), "dim"))
-                    yield ("pack", urwid.Text([("bold", "Media attachment"), " (", m["type"], ")"]))
-                    if m["description"]:
-                        yield ("pack", urwid.Text(m["description"]))
-                    if m["url"]:
-                        if m["url"].lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp')):
+                    yield ("pack", urwid.Text([("bold", "Media attachment"), " (", m.type, ")"]))
+                    if m.description:
+                        yield ("pack", urwid.Text(m.description))
+                    if m.url:
+                        if m.url.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp')):
                             yield urwid.Text("")
                             try:
-                                aspect = float(m["meta"]["original"]["aspect"])
+                                aspect = float(m.meta["original"]["aspect"])
                             except Exception:
                                 aspect = None
                             if image_support_enabled():
-                                yield self.image_widget(m["url"], aspect=aspect)
+                                yield self.image_widget(m.url, aspect=aspect)
                             yield urwid.Divider()
                         # video media may include a preview URL, show that as a fallback
-                        elif m["preview_url"]:
-                            if m["preview_url"].lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp')):
+                        elif m.preview_url:
+                            if m.preview_url.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp')):
                                 yield urwid.Text("")
                                 try:
-                                    aspect = float(m["meta"]["small"]["aspect"])
+                                    aspect = float(m.meta["small"]["aspect"])
                                 except Exception:
                                     aspect = None
                                 if image_support_enabled():
-                                    yield self.image_widget(m["preview_url"], aspect=aspect)
+                                    yield self.image_widget(m.preview_url, aspect=aspect)
                                 yield urwid.Divider()
-                        yield ("pack", url_to_widget(m["url"]))
+                        yield ("pack", url_to_widget(m.url))
 
-            poll = status.original.data.get("poll")
+            poll = status.original.entity.poll
             if poll:
                 yield ("pack", urwid.Divider())
                 yield ("pack", self.build_linebox(self.poll_generator(poll)))
 
-            card = status.data.get("card")
+            card = status.entity.card
             if card:
                 yield ("pack", urwid.Divider())
                 yield ("pack", self.build_linebox(self.card_generator(card)))
 
-        application = status.data.get("application") or {}
-        application = application.get("name")
+        application = status.entity.application.name if status.entity.application else None
 
         yield ("pack", urwid.AttrWrap(urwid.Divider("-"), "dim"))
 
@@ -532,9 +543,9 @@ class StatusDetails(urwid.Pile):
             ("status_detail_timestamp",
              f"(edited {status.edited_at.strftime('%Y-%m-%d %H:%M')}) " if status.edited_at else ""),
             ("status_detail_bookmarked" if status.bookmarked else "dim", "b "),
-            ("dim", f"⤶ {status.data['replies_count']} "),
-            ("highlight" if status.reblogged else "dim", f"♺ {status.data['reblogs_count']} "),
-            ("highlight" if status.favourited else "dim", f"★ {status.data['favourites_count']}"),
+            ("dim", f"⤶ {status.entity.replies_count} "),
+            ("highlight" if status.reblogged else "dim", f"♺ {status.entity.reblogs_count} "),
+            ("highlight" if status.favourited else "dim", f"★ {status.entity.favourites_count}"),
             (visibility_color, f" · {visibility}"),
             ("highlight", f" · Translated from {translated_from} " if translated_from else ""),
             ("dim", f" · {application}" if application else ""),
@@ -548,45 +559,45 @@ class StatusDetails(urwid.Pile):
         contents = urwid.Padding(contents, left=1, right=1)
         return RoundedLineBox(contents)
 
-    def card_generator(self, card):
-        yield urwid.Text(("card_title", card["title"].strip()))
-        if card.get("author_name"):
-            yield urwid.Text(["by ", ("card_author", card["author_name"].strip())])
+    def card_generator(self, card: PreviewCard):
+        yield urwid.Text(("card_title", card.title.strip()))
+        if card.author_name:
+            yield urwid.Text(["by ", ("card_author", card.author_name.strip())])
         yield urwid.Text("")
-        if card["description"]:
-            yield urwid.Text(card["description"].strip())
+        if card.description:
+            yield urwid.Text(card.description.strip())
             yield urwid.Text("")
-        yield url_to_widget(card["url"])
+        yield url_to_widget(card.url)
 
-        if card["image"] and image_support_enabled():
-            if card["image"].lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp')):
+        if card.image and image_support_enabled():
+            if card.image.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp')):
                 yield urwid.Text("")
                 try:
-                    aspect = int(card["width"]) / int(card["height"])
+                    aspect = int(card.width) / int(card.height)
                 except Exception:
                     aspect = None
-                yield self.image_widget(card["image"], aspect=aspect)
+                yield self.image_widget(card.image, aspect=aspect)
 
-    def poll_generator(self, poll):
-        for idx, option in enumerate(poll["options"]):
-            perc = (round(100 * option["votes_count"] / poll["votes_count"])
-                if poll["votes_count"] else 0)
+    def poll_generator(self, poll: Poll):
+        for idx, option in enumerate(poll.options):
+            perc = (round(100 * (option.votes_count or 0) / poll.votes_count)
+                if poll.votes_count else 0)
 
-            if poll["voted"] and poll["own_votes"] and idx in poll["own_votes"]:
+            if poll.voted and poll.own_votes and idx in poll.own_votes:
                 voted_for = " ✓"
             else:
                 voted_for = ""
 
-            yield urwid.Text(option["title"] + voted_for)
+            yield urwid.Text(option.title + voted_for)
             yield urwid.ProgressBar("", "poll_bar", perc)
 
-        status = "Poll · {} votes".format(poll["votes_count"])
+        status = "Poll · {} votes".format(poll.votes_count)
 
-        if poll["expired"]:
+        if poll.expired:
             status += " · Closed"
 
-        if poll["expires_at"]:
-            expires_at = parse_datetime(poll["expires_at"]).strftime("%Y-%m-%d %H:%M")
+        if poll.expires_at:
+            expires_at = poll.expires_at.strftime("%Y-%m-%d %H:%M")
             status += " · Closes on {}".format(expires_at)
 
         yield urwid.Text(("dim", status))
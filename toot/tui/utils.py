@@ -4,9 +4,10 @@ import sys
 import urwid
 from collections import OrderedDict
 from functools import reduce
-from html.parser import HTMLParser
 from typing import List
 
+from toot.utils import parse_content
+
 HASHTAG_PATTERN = re.compile(r'(?<!\w)(#\w+)\b')
 
 
@@ -46,30 +47,11 @@ def highlight_hashtags(line):
     return hline
 
 
-class LinkParser(HTMLParser):
-    def reset(self):
-        super().reset()
-        self.links = []
-
-    def handle_starttag(self, tag, attrs):
-        if tag == "a":
-            href, title = None, None
-            for name, value in attrs:
-                if name == "href":
-                    href = value
-                if name == "title":
-                    title = value
-            if href:
-                self.links.append((href, title))
-
-
 def parse_content_links(content):
     """Parse <a> tags from status's `content` and return them as a list of
     (href, title), where `title` may be None.
     """
-    parser = LinkParser()
-    parser.feed(content)
-    return parser.links[:]
+    return parse_content(content).links
 
 
 def copy_to_clipboard(screen: urwid.display.raw.Screen, text: str):
@@ -1,7 +1,6 @@
 import platform
 import click
 import os
-import re
 import subprocess
 import tempfile
 import unicodedata
@@ -12,9 +11,12 @@ import warnings
 import readline  # noqa
 
 from bs4 import BeautifulSoup
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
 from importlib.metadata import version
 from itertools import islice
-from typing import Any, Dict, Generator, Iterable, List, Optional, TypeVar
+from typing import Any, Dict, Generator, Iterable, List, NamedTuple, Optional, Tuple, TypeVar
 from urllib.parse import urlparse, urlencode, quote, unquote
 
 
@@ -28,6 +30,14 @@ def str_bool_nullable(b: Optional[bool]) -> Optional[str]:
     return None if b is None else str_bool(b)
 
 
+def id_sort_key(id: str) -> Tuple[int, str]:
+    """
+    Sort key for Mastodon IDs. These are strings which sort numerically, newer
+    being larger, but are not guaranteed to fit a number.
+    """
+    return len(id), id
+
+
 def parse_html(html: str) -> BeautifulSoup:
     # Ignore warnings made by BeautifulSoup, if passed something that looks like
     # a file (e.g. a dot which matches current dict), it will warn that the file
@@ -43,17 +53,106 @@ def get_text(html: str) -> str:
     return unicodedata.normalize("NFKC", text)
 
 
+class Content(NamedTuple):
+    """Plain text and references extracted from HTML content, see `parse_content`."""
+    paragraphs: List[List[str]]
+    """List of paragraphs, each being a list of lines"""
+    links: List[Tuple[str, Optional[str]]]
+    """List of (href, title) for each link, where title may be None"""
+    mentions: List[str]
+    """Mentioned accounts as shown in text, e.g. `@foo`"""
+    hashtags: List[str]
+    """Hashtag names without the leading `#`"""
+
+
+class ContentParser(HTMLParser):
+    """
+    Converts HTML content to plain text in a single pass. Text is split into
+    paragraphs on <p> tags and into lines on <br> tags. Links, mentions and
+    hashtags are collected along the way.
+    """
+    def reset(self):
+        super().reset()
+        self.paragraphs: List[List[str]] = []
+        self.links: List[Tuple[str, Optional[str]]] = []
+        self.mentions: List[str] = []
+        self.hashtags: List[str] = []
+
+        self._lines: List[str] = []
+        self._line: List[str] = []
+        # Whether anything other than paragraph tags was found in the current
+        # paragraph, empty paragraphs are dropped
+        self._in_paragraph = False
+        # Classes, rel and text of the <a> tag being parsed
+        self._anchor: Optional[Tuple[List[str], Optional[str], List[str]]] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "p":
+            self._end_paragraph()
+            return
+
+        self._in_paragraph = True
+        if tag == "br":
+            self._end_line()
+        elif tag == "a":
+            attrs = dict(attrs)
+            href = attrs.get("href")
+            if href:
+                self.links.append((href, attrs.get("title")))
+            classes = (attrs.get("class") or "").split()
+            self._anchor = (classes, attrs.get("rel"), [])
+
+    def handle_endtag(self, tag):
+        if tag == "p":
+            self._end_paragraph()
+            return
+
+        self._in_paragraph = True
+        if tag == "a" and self._anchor:
+            classes, rel, text = self._anchor
+            self._anchor = None
+            if "hashtag" in classes or rel == "tag":
+                self.hashtags.append("".join(text).lstrip("#"))
+            elif "mention" in classes:
+                self.mentions.append("".join(text))
+
+    def handle_data(self, data):
+        self._in_paragraph = True
+        self._line.append(data)
+        if self._anchor:
+            self._anchor[2].append(data)
+
+    def close(self):
+        super().close()
+        self._end_paragraph()
+
+    def _end_line(self):
+        self._lines.append(unicodedata.normalize("NFKC", "".join(self._line)))
+        self._line = []
+
+    def _end_paragraph(self):
+        if self._in_paragraph:
+            self._end_line()
+            self.paragraphs.append(self._lines)
+        self._lines = []
+        self._line = []
+        self._in_paragraph = False
+
+
+def parse_content(html: str) -> Content:
+    """Converts html to plain text paragraphs, and extracts links, mentions
+    and hashtags."""
+    parser = ContentParser()
+    parser.feed(html)
+    parser.close()
+    return Content(parser.paragraphs, parser.links, parser.mentions, parser.hashtags)
+
+
 def html_to_paragraphs(html: str) -> List[List[str]]:
     """Attempt to convert html to plain text while keeping line breaks.
     Returns a list of paragraphs, each being a list of lines.
     """
-    paragraphs = re.split("</?p[^>]*>", html)
-
-    # Convert <br>s to line breaks and remove empty paragraphs
-    paragraphs = [re.split("<br */?>", p) for p in paragraphs if p]
-
-    # Convert each line in each paragraph to plain text:
-    return [[get_text(line) for line in p] for p in paragraphs]
+    return parse_content(html).paragraphs
 
 
 def format_content(content: str) -> Generator[str, None, None]:
@@ -186,3 +285,28 @@ def batched(iterable: Iterable[T], n: int) -> Generator[List[T], None, None]:
             yield batch
         else:
             break
+
+
+def prefetch(iterable: Iterable[T], depth: int = 1) -> Generator[T, None, None]:
+    """Iterate over the iterable in a background thread, fetching up to `depth`
+    items ahead of the consumer. Used to load the next page of results while
+    the current one is shown. Pending fetches are cancelled when the generator
+    is closed."""
+    if depth < 1:
+        raise ValueError("depth must be positive")
+
+    iterator = iter(iterable)
+    end = object()
+
+    # A single worker ensures the iterator is advanced by one thread at a time
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="toot-prefetch")
+    try:
+        futures = deque(executor.submit(next, iterator, end) for _ in range(depth))
+        while True:
+            futures.append(executor.submit(next, iterator, end))
+            item = futures.popleft().result()
+            if item is end:
+                return
+            yield item
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -7,7 +7,10 @@ from dateutil.parser import parse
 
 def parse_datetime(value: str) -> datetime:
     """Returns an aware datetime in local timezone"""
-    dttm = parse(value)
+    try:
+        dttm = _parse_iso_datetime(value)
+    except ValueError:
+        dttm = parse(value)
 
     # When running tests return datetime in UTC so that tests don't depend on
     # the local timezone
@@ -17,6 +20,18 @@ def parse_datetime(value: str) -> datetime:
     return dttm.astimezone()
 
 
+def _parse_iso_datetime(value: str) -> datetime:
+    """
+    Fast path for ISO-8601 datetimes as returned by Mastodon, e.g.
+    `2023-07-21T13:27:45.996Z`. Raises ValueError for other formats.
+
+    Python < 3.11 does not support the `Z` suffix in `fromisoformat`.
+    """
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
+
 SECOND = 1
 MINUTE = SECOND * 60
 HOUR = MINUTE * 60
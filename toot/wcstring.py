@@ -2,11 +2,29 @@
 Utilities for dealing with string containing wide characters.
 """
 
-import re
+from functools import lru_cache
 from typing import Generator, List
 
 from wcwidth import wcwidth, wcswidth
 
+# Width of a single character, memoized since lookups are relatively slow
+_char_width = lru_cache(maxsize=None)(wcwidth)
+
+# Width of non-ASCII strings, memoized since the same words tend to repeat
+_wcswidth = lru_cache(maxsize=4096)(wcswidth)
+
+
+def _is_narrow(text: str) -> bool:
+    """Whether all characters in text are printable ASCII, one column wide."""
+    return text.isascii() and text.isprintable()
+
+
+def wc_width(text: str) -> int:
+    """Returns the width of text in terminal columns."""
+    if _is_narrow(text):
+        return len(text)
+    return _wcswidth(text)
+
 
 def _wc_hard_wrap(line: str, length: int) -> Generator[str, None, None]:
     """
@@ -15,10 +33,15 @@ def _wc_hard_wrap(line: str, length: int) -> Generator[str, None, None]:
 
     Used to wrap lines which cannot be wrapped on whitespace.
     """
+    if length > 0 and _is_narrow(line):
+        for start in range(0, len(line), length):
+            yield line[start:start + length]
+        return
+
     chars = []
     chars_len = 0
     for char in line:
-        char_len = wcwidth(char)
+        char_len = _char_width(char)
         if chars_len + char_len > length:
             yield "".join(chars)
             chars: List[str] = []
@@ -39,12 +62,16 @@ def wc_wrap(text: str, length: int) -> Generator[str, None, None]:
     Meant for use on a single line or paragraph. Will destroy spacing between
     words and paragraphs and any indentation.
     """
+    words = text.split()
+    if not words:
+        yield ""
+        return
+
     line_words: List[str] = []
     line_len = 0
 
-    words = re.split(r"\s+", text.strip())
     for word in words:
-        word_len = wcswidth(word)
+        word_len = wc_width(word)
 
         if line_words and line_len + word_len > length:
             line = " ".join(line_words)
@@ -78,11 +105,14 @@ def trunc(text: str, length: int) -> str:
 
     # Remove whitespace first so no unnecessary truncation is done.
     text = text.strip()
-    text_length = wcswidth(text)
+    text_length = wc_width(text)
 
     if text_length <= length:
         return text
 
+    if _is_narrow(text):
+        return text[:length - 1].strip() + '…'
+
     # We cannot just remove n characters from the end since we don't know how
     # wide these characters are and how it will affect text length.
     # Use wcwidth to determine how many characters need to be truncated.
@@ -90,7 +120,7 @@ def trunc(text: str, length: int) -> str:
     trunc_length = 0
     for char in reversed(text):
         chars_to_truncate += 1
-        trunc_length += wcwidth(char)
+        trunc_length += _char_width(char)
         if text_length - trunc_length <= length:
             break
 
@@ -101,7 +131,7 @@ def trunc(text: str, length: int) -> str:
 
 def pad(text: str, length: int) -> str:
     """Pads text to given length, taking into account wide characters."""
-    text_length = wcswidth(text)
+    text_length = wc_width(text)
 
     if text_length < length:
         return text + ' ' * (length - text_length)
@@ -111,7 +141,7 @@ def pad(text: str, length: int) -> str:
 
 def fit_text(text: str, length: int) -> str:
     """Makes text fit the given length by padding or truncating it."""
-    text_length = wcswidth(text)
+    text_length = wc_width(text)
 
     if text_length > length:
         return trunc(text, length)